@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Backend.settings')
 
@@ -10,6 +11,12 @@ app.autodiscover_tasks()
 # Import tasks explicitly to ensure they're registered
 from common import tasks
 
+@worker_process_init.connect
+def warm_email_templates(**kwargs):
+    """Compile email templates once per worker process"""
+    from common.services.email_templates import EmailTemplateRegistry
+    EmailTemplateRegistry.warm()
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
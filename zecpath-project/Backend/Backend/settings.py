@@ -160,6 +160,19 @@ CACHES = {
         }
     }
 }
+# Cache shared by every web and worker process (question plan versions,
+# question generation locks, STT transcripts): 'redis', or 'local' for
+# single-process development
+SHARED_CACHE_BACKEND = os.getenv('SHARED_CACHE_BACKEND', 'redis')
+CACHES['shared'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': os.getenv('SHARED_CACHE_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0')),
+    'KEY_PREFIX': 'zecpath',
+    'OPTIONS': {'socket_timeout': 0.5, 'socket_connect_timeout': 0.5},
+} if SHARED_CACHE_BACKEND == 'redis' else {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'zecpath-shared',
+}
 
 # Performance Settings
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
@@ -220,20 +233,145 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+# Delayed job queue (common.utils.delayed_queue): 'redis' sorted sets shared by all
+# dispatchers, or 'local' for an in-process stand-in
+DELAYED_QUEUE_BACKEND = os.getenv('DELAYED_QUEUE_BACKEND', 'redis')
+DELAYED_QUEUE_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# Per-call hot state and write-behind answer buffers for Twilio webhooks
+# (common.utils.hot_store): 'redis' shared by all web workers, or in-process 'local'
+HOT_STORE_BACKEND = os.getenv('HOT_STORE_BACKEND', 'redis')
+HOT_STORE_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# Seconds between bulk applications of buffered Twilio status callbacks
+CALL_STATUS_FLUSH_INTERVAL = float(os.getenv('CALL_STATUS_FLUSH_INTERVAL', '10'))
+# Task modules that import models at load time are imported once Django is set up
+CELERY_IMPORTS = (
+    'common.tasks_notifications',
+    'common.tasks_reminders',
+    'common.tasks_ai_calls',
+)
 
 # Celery Beat Schedule (Periodic Tasks)
 from celery.schedules import crontab
 CELERY_BEAT_SCHEDULE = {
-    'scan-reminders-every-5-minutes': {
+    'reconcile-reminders-every-30-minutes': {
         'task': 'scan_and_send_reminders',
-        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+        'schedule': crontab(minute='*/30'),  # Safety net; reminders fire from the delayed queue
+    },
+    'dispatch-ai-calls-every-minute': {
+        'task': 'process_pending_ai_calls',
+        'schedule': crontab(),
+    },
+    'flush-webhook-answers-every-minute': {
+        'task': 'flush_webhook_answers',
+        'schedule': crontab(),  # Safety net; finished calls flush immediately
+    },
+    'flush-call-status-events': {
+        'task': 'flush_call_status_events',
+        'schedule': CALL_STATUS_FLUSH_INTERVAL,
+    },
+    'dispatch-notification-outbox-every-minute': {
+        'task': 'dispatch_notification_outbox',
+        'schedule': crontab(),  # Safety net for dispatches missed after commit
+    },
+    'send-hourly-employer-digests': {
+        'task': 'send_employer_digests',
+        'schedule': crontab(minute=0),
+        'args': ('hourly',),
+    },
+    'send-daily-employer-digests': {
+        'task': 'send_employer_digests',
+        'schedule': crontab(hour=8, minute=0),
+        'args': ('daily',),
+    },
+    'cleanup-old-logs-daily': {
+        'task': 'cleanup_old_logs',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'maintain-log-partitions-daily': {
+        'task': 'maintain_log_partitions',
+        'schedule': crontab(hour=2, minute=30),
     },
 }
 
+# Log Retention (common.services.retention_service)
+LOG_RETENTION = {
+    'core.EmailLog': {'days': 30, 'field': 'created_at'},
+    'core.AuditLog': {'days': 365, 'field': 'timestamp', 'archive': True},
+    'core.ApplicationStatusHistory': {'days': 365, 'field': 'changed_at', 'archive': True},
+    'core.AIConversationTurn': {'days': 90, 'field': 'timestamp', 'clear_fields': {'ai_annotations': {}}},
+}
+LOG_RETENTION_CHUNK_SIZE = int(os.getenv('LOG_RETENTION_CHUNK_SIZE', '5000'))
+LOG_RETENTION_CHUNK_SLEEP = float(os.getenv('LOG_RETENTION_CHUNK_SLEEP', '0.1'))  # seconds
+LOG_RETENTION_ARCHIVE_DIR = BASE_DIR / 'logs' / 'archive'
+
+# Monthly log partitions (common.services.partition_service, PostgreSQL only).
+# Partitioned tables are expired here instead of by LOG_RETENTION row deletes;
+# 'detach' keeps the old month as a standalone table for archiving.
+LOG_PARTITIONS = {
+    'core.EmailLog': {'months_ahead': 3, 'retain_months': 1, 'expired_action': 'drop'},
+    'core.AuditLog': {'months_ahead': 3, 'retain_months': 12, 'expired_action': 'detach'},
+}
+
 # AI/Voice API Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
 
+# Shared LLM/STT/TTS client (common.utils.provider_client): 'openai' or offline 'fake'.
+# One keep-alive connection pool per process; max_concurrent requests per endpoint,
+# callers wait up to AI_PROVIDER_QUEUE_TIMEOUT seconds for a free slot
+AI_PROVIDER_BACKEND = os.getenv('AI_PROVIDER_BACKEND', 'openai')
+AI_PROVIDER_CONNECT_TIMEOUT = float(os.getenv('AI_PROVIDER_CONNECT_TIMEOUT', '3'))
+AI_PROVIDER_QUEUE_TIMEOUT = float(os.getenv('AI_PROVIDER_QUEUE_TIMEOUT', '5'))
+AI_PROVIDER_ENDPOINTS = {
+    'chat': {'read_timeout': 20, 'max_concurrent': int(os.getenv('AI_PROVIDER_CHAT_CONCURRENCY', '8'))},
+    'transcribe': {'read_timeout': 60, 'max_concurrent': int(os.getenv('AI_PROVIDER_STT_CONCURRENCY', '4'))},
+    'speech': {'read_timeout': 30, 'max_concurrent': int(os.getenv('AI_PROVIDER_TTS_CONCURRENCY', '4'))},
+}
+# Idempotent LLM calls (question generation) are hedged after the chat latency
+# quantile, or AI_PROVIDER_HEDGE_DELAY seconds until enough calls were observed
+AI_PROVIDER_HEDGE_QUANTILE = float(os.getenv('AI_PROVIDER_HEDGE_QUANTILE', '0.95'))
+AI_PROVIDER_HEDGE_DELAY = float(os.getenv('AI_PROVIDER_HEDGE_DELAY', '2'))
+# Hedge budget: hedges in flight stay under this share of hedgeable chat requests in flight
+# (at least one), and none is sent while every chat slot is taken
+AI_PROVIDER_HEDGE_BUDGET = float(os.getenv('AI_PROVIDER_HEDGE_BUDGET', '0.1'))
+
+# Provider circuit breakers (common.utils.circuit_breaker), shared by all workers
+# through 'redis' ('local' is per process). Names: '<provider>.<endpoint>', e.g.
+# 'openai.chat', 'openai.transcribe', 'openai.speech', 'twilio.calls'
+CIRCUIT_BREAKER_BACKEND = os.getenv('CIRCUIT_BREAKER_BACKEND', 'redis')
+CIRCUIT_BREAKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+CIRCUIT_BREAKER_DEFAULTS = {
+    'failure_threshold': int(os.getenv('CIRCUIT_BREAKER_FAILURES', '5')),  # within window seconds
+    'window': 60,
+    'reset_timeout': int(os.getenv('CIRCUIT_BREAKER_RESET_TIMEOUT', '30')),  # seconds open before a probe
+}
+CIRCUIT_BREAKERS = {}  # name -> overrides of CIRCUIT_BREAKER_DEFAULTS
+
+# Async interview runner (common.services.ai_call_runner): the async provider
+# client gets its own, larger per-process limits
+AI_PROVIDER_ASYNC_ENDPOINTS = {
+    'chat': {'max_concurrent': int(os.getenv('AI_PROVIDER_ASYNC_CHAT_CONCURRENCY', '64'))},
+    'transcribe': {'max_concurrent': int(os.getenv('AI_PROVIDER_ASYNC_STT_CONCURRENCY', '32'))},
+    'speech': {'max_concurrent': int(os.getenv('AI_PROVIDER_ASYNC_TTS_CONCURRENCY', '32'))},
+}
+
+# Synthesized question audio (common.services.tts_cache), served from MEDIA_URL/tts/
+TTS_CACHE_DIR = MEDIA_ROOT / 'tts'
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+# Candidate recordings for STT: size cap and (connect, read, total) download timeouts in seconds
+STT_MAX_AUDIO_BYTES = int(os.getenv('STT_MAX_AUDIO_BYTES', str(25 * 1024 * 1024)))
+STT_DOWNLOAD_TIMEOUTS = (3, 15, 60)
+# Batched LLM answer analysis: prompt+output tokens per request, sessions analyzed in parallel
+AI_ANALYSIS_TOKEN_BUDGET = int(os.getenv('AI_ANALYSIS_TOKEN_BUDGET', '3000'))
+AI_ANALYSIS_MAX_WORKERS = int(os.getenv('AI_ANALYSIS_MAX_WORKERS', '4'))
+# Generated interview questions are reused for this long (common.services.question_cache)
+INTERVIEW_QUESTION_CACHE_TTL = timedelta(days=int(os.getenv('INTERVIEW_QUESTION_CACHE_DAYS', '7')))
+
+# Provider API roots; point both at a local stand-in for load tests
+# (`manage.py run_provider_stub`, common.utils.provider_stub). '' = the real APIs
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', '')  # e.g. http://127.0.0.1:8900/v1
+TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL', '')  # e.g. http://127.0.0.1:8900
+
 TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID', '')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN', '')
 TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER', '')
@@ -242,4 +380,38 @@ BASE_URL = os.getenv('BASE_URL', 'http://localhost:8000')
 
 # API Rate Limits
 AI_API_RATE_LIMIT = int(os.getenv('AI_API_RATE_LIMIT', '60'))  # requests per minute
-VOICE_API_RATE_LIMIT = int(os.getenv('VOICE_API_RATE_LIMIT', '10'))  # calls per minute
\ No newline at end of file
+VOICE_API_RATE_LIMIT = int(os.getenv('VOICE_API_RATE_LIMIT', '10'))  # calls per minute
+
+# AI call execution: 'prefork' queues one execute_ai_call task per call; 'async'
+# queues each claimed batch to one execute_ai_calls_async task that runs its calls
+# concurrently on an event loop. `manage.py run_ai_call_runner` is the standalone
+# async service (no Celery). Either way a dialed call only occupies the task until
+# Twilio accepts it (its interview runs in the webhooks), so the event loop pays
+# off for dial bursts and for simulated interviews of candidates without a phone
+# number, not for live interview time.
+AI_CALL_EXECUTION_MODE = os.getenv('AI_CALL_EXECUTION_MODE', 'prefork')
+AI_ASYNC_MAX_INTERVIEWS = int(os.getenv('AI_ASYNC_MAX_INTERVIEWS', '200'))  # concurrent calls per runner
+AI_ASYNC_DB_THREADS = int(os.getenv('AI_ASYNC_DB_THREADS', '8'))  # database threads (connections) per runner
+
+# AI call dispatch limits (common.services.ai_call_limiter): requests per minute,
+# charged cost_per_call per call start, and concurrent live calls per provider
+AI_CALL_LIMITS = {
+    'global': {
+        'rate_per_minute': VOICE_API_RATE_LIMIT,
+        'max_concurrent': int(os.getenv('AI_CALL_MAX_CONCURRENT', '10')),
+    },
+    'twilio': {
+        'rate_per_minute': VOICE_API_RATE_LIMIT,
+        'max_concurrent': int(os.getenv('TWILIO_MAX_CONCURRENT', '10')),
+        'cost_per_call': 1,
+    },
+    'openai': {
+        'rate_per_minute': AI_API_RATE_LIMIT,
+        'max_concurrent': int(os.getenv('OPENAI_MAX_CONCURRENT_CALLS', '10')),
+        'cost_per_call': int(os.getenv('AI_CALL_OPENAI_REQUESTS', '6')),  # LLM/STT/TTS requests per call
+    },
+}
+AI_CALL_SLOTS_PER_MINUTE = int(os.getenv('AI_CALL_SLOTS_PER_MINUTE', str(VOICE_API_RATE_LIMIT)))  # call start slots
+AI_CALL_EMPLOYER_WEIGHTS = {}  # employer_id -> round-robin weight (default 1)
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'redis')  # 'redis' or in-process 'local'
+RATE_LIMIT_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
\ No newline at end of file
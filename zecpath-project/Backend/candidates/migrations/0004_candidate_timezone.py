@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-02-10 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0003_candidate_is_available_for_call'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='timezone',
+            field=models.CharField(default='UTC', max_length=50),
+        ),
+    ]
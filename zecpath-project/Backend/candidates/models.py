@@ -25,6 +25,7 @@ class Candidate(models.Model):
     expected_salary = models.IntegerField(null=True, blank=True, db_index=True)
     experience_years = models.IntegerField(default=0, db_index=True)
     is_available_for_call = models.BooleanField(default=True, db_index=True)
+    timezone = models.CharField(max_length=50, default='UTC')  # IANA name, used for call windows
     resume = models.FileField(
         upload_to=resume_upload_path,
         validators=[FileValidator()],
@@ -1,10 +1,22 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from rest_framework import serializers
 from .models import Candidate
 
+
+def validate_timezone_name(value):
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise serializers.ValidationError("Unknown time zone")
+    return value
+
 class CandidateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Candidate
-        fields = ['skills', 'education', 'experience', 'expected_salary', 'experience_years', 'resume']
+        fields = ['skills', 'education', 'experience', 'expected_salary', 'experience_years', 'timezone', 'resume']
+    
+    def validate_timezone(self, value):
+        return validate_timezone_name(value)
 
 class ResumeUploadSerializer(serializers.ModelSerializer):
     class Meta:
@@ -22,7 +34,10 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Candidate
-        fields = ['skills', 'education', 'experience', 'expected_salary', 'experience_years', 'resume', 'resume_url', 'user_info']
+        fields = ['skills', 'education', 'experience', 'expected_salary', 'experience_years', 'timezone', 'resume', 'resume_url', 'user_info']
+    
+    def validate_timezone(self, value):
+        return validate_timezone_name(value)
     
     def get_user_info(self, obj):
         return {
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
@@ -13,8 +14,14 @@ class RateLimitMiddleware(MiddlewareMixin):
         'default': (100, 60),   # 100 requests per minute
     }
     
+    EXEMPT_PREFIXES = ('/admin/',)
+    # Twilio webhooks arrive from a few shared IPs at call volume; only signed ones skip the limit
+    TWILIO_PREFIX = '/api/ai-calls/twilio-'
+    
     def process_request(self, request):
-        if request.path.startswith('/admin/'):
+        if request.path.startswith(self.EXEMPT_PREFIXES):
+            return None
+        if request.path.startswith(self.TWILIO_PREFIX) and self.is_signed_by_twilio(request):
             return None
         
         # Get client IP
@@ -45,6 +52,17 @@ class RateLimitMiddleware(MiddlewareMixin):
         cache.set(key, current + 1, window)
         return None
     
+    def is_signed_by_twilio(self, request):
+        """Check X-Twilio-Signature against the URL Twilio was given (BASE_URL) and the POST params"""
+        from twilio.request_validator import RequestValidator
+        
+        signature = request.META.get('HTTP_X_TWILIO_SIGNATURE')
+        if not signature or not settings.TWILIO_AUTH_TOKEN:
+            return False
+        return RequestValidator(settings.TWILIO_AUTH_TOKEN).validate(
+            f"{settings.BASE_URL}{request.get_full_path()}", request.POST, signature
+        )
+    
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -1,10 +1,22 @@
 """
 AI Bridge Service - Central integration point for LLM, STT, TTS
+
+All requests go through the process-wide pooled client from
+common.utils.provider_client (AI_PROVIDER_BACKEND='fake' for offline use),
+whose per-endpoint circuit breakers make every path below fail fast to its
+fallback while the provider is down.
 """
 import os
+import hashlib
+import json
 import logging
+import random
+import tempfile
 import time
+from urllib.parse import urlparse
 from django.conf import settings
+from common.utils.circuit_breaker import CircuitOpenError
+from common.utils.provider_client import ProviderBusyError, get_provider_client, get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -14,29 +26,31 @@ class LLMService:
     
     MAX_RETRIES = 3
     RETRY_DELAY = 2
+    ANALYSIS_TOKENS_PER_TURN = 60  # Output budget per answer in batch analysis
     
     @staticmethod
     def generate_interview_questions(job_title, skills, num_questions=3):
         """Generate interview questions using LLM"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            
             prompt = f"""Generate {num_questions} interview questions for a {job_title} position.
 Required skills: {', '.join(skills) if isinstance(skills, list) else skills}
 
 Return only the questions, numbered 1-{num_questions}."""
 
-            response = client.chat.completions.create(
-                model=os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                messages=[{"role": "user", "content": prompt}],
+            # Idempotent prompt: a slow request is hedged with a second one
+            content = get_provider_client().chat(
+                [{"role": "user", "content": prompt}],
                 max_tokens=300,
-                temperature=0.7
+                temperature=0.7,
+                hedge=True
             )
             
-            questions = response.choices[0].message.content.strip().split('\n')
+            questions = content.split('\n')
             return [q.strip() for q in questions if q.strip()], None
             
+        except (CircuitOpenError, ProviderBusyError) as e:
+            logger.warning(f"LLM unavailable, using fallback questions: {str(e)}")
+            return LLMService._fallback_questions(job_title), str(e)
         except ImportError:
             logger.warning("OpenAI not installed, using fallback questions")
             return LLMService._fallback_questions(job_title), None
@@ -57,81 +71,186 @@ Return only the questions, numbered 1-{num_questions}."""
     def analyze_response(question, answer):
         """Analyze candidate response (optional)"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            
             prompt = f"Question: {question}\nAnswer: {answer}\n\nRate this answer 1-10 and explain briefly."
             
-            response = client.chat.completions.create(
-                model=os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo'),
-                messages=[{"role": "user", "content": prompt}],
+            analysis = get_provider_client().chat(
+                [{"role": "user", "content": prompt}],
                 max_tokens=100
             )
             
-            return response.choices[0].message.content.strip(), None
+            return analysis, None
         except Exception as e:
             return None, str(e)
+    
+    @staticmethod
+    def analyze_responses(turns, token_budget=None):
+        """
+        Rate many (turn_id, question, answer) triples with one request per
+        token-budgeted chunk instead of one per answer. Returns
+        ({turn_id: {'rating': int, 'explanation': str}}, errors); turns the
+        model skipped or a failed chunk are simply absent.
+        """
+        token_budget = token_budget or getattr(settings, 'AI_ANALYSIS_TOKEN_BUDGET', 3000)
+        results, errors = {}, []
+        
+        for chunk in LLMService._chunk_turns(turns, token_budget):
+            # Turns are numbered within the chunk; database ids stay out of the prompt
+            listing = "\n\n".join(f"Turn {number}:\nQuestion: {q}\nAnswer: {a}" for number, (_, q, a) in enumerate(chunk, 1))
+            prompt = (
+                f"Rate each candidate answer below 1-10 and explain briefly.\n\n{listing}\n\n"
+                'Respond with only a JSON array: [{"turn": <turn number>, "rating": <1-10>, "explanation": "<one sentence>"}]'
+            )
+            try:
+                content = get_provider_client().chat(
+                    [{"role": "user", "content": prompt}],
+                    max_tokens=LLMService.ANALYSIS_TOKENS_PER_TURN * len(chunk)
+                )
+                ratings = LLMService._parse_ratings(content, set(range(1, len(chunk) + 1)))
+                results.update({chunk[number - 1][0]: rating for number, rating in ratings.items()})
+            except Exception as e:
+                logger.error(f"Batch analysis error: {str(e)}")
+                errors.append(str(e))
+        
+        return results, errors
+    
+    @staticmethod
+    def _chunk_turns(turns, token_budget):
+        """Split turns into chunks whose prompt plus expected output fit the budget (~4 chars per token)"""
+        chunk, used = [], 0
+        for turn in turns:
+            cost = (len(turn[1]) + len(turn[2])) // 4 + 20 + LLMService.ANALYSIS_TOKENS_PER_TURN
+            if chunk and used + cost > token_budget:
+                yield chunk
+                chunk, used = [], 0
+            chunk.append(turn)
+            used += cost
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _parse_ratings(content, expected_ids):
+        """Per-turn ratings from the model's JSON (tolerates surrounding prose or code fences)"""
+        start, end = content.find('['), content.rfind(']')
+        if start < 0 or end < start:
+            raise ValueError("No JSON array in analysis response")
+        ratings = {}
+        for item in json.loads(content[start:end + 1]):
+            try:
+                turn_id = int(item['turn'])
+                rating = max(1, min(10, int(item['rating'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if turn_id in expected_ids:
+                ratings[turn_id] = {'rating': rating, 'explanation': str(item.get('explanation', ''))[:500]}
+        return ratings
+
+
+class AudioTooLargeError(Exception):
+    """Recording exceeds STT_MAX_AUDIO_BYTES"""
 
 
 class STTService:
     """Speech-to-Text service"""
     
+    AUDIO_SUFFIXES = ('.mp3', '.wav', '.m4a', '.ogg', '.webm')
+    CHUNK_SIZE = 64 * 1024
+    TRANSCRIPT_TTL = 7 * 24 * 60 * 60
+    
     @staticmethod
     def transcribe_audio(audio_url, language='en'):
-        """Convert speech to text"""
+        """
+        Convert speech to text. The recording is streamed to a private temp
+        file (size-capped, with timeouts) and transcripts are cached by URL
+        and by content hash in the 'shared' cache, so retries on any worker
+        never pay for STT twice.
+        """
+        url_key = f"stt:url:{language}:{hashlib.sha256(audio_url.encode()).hexdigest()}"
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            
-            # Download audio file
-            import requests
-            audio_data = requests.get(audio_url).content
-            
-            # Save temporarily
-            temp_path = f"/tmp/audio_{int(time.time())}.mp3"
-            with open(temp_path, 'wb') as f:
-                f.write(audio_data)
+            transcript = STTService._cached(url_key)
+            if transcript is not None:
+                return transcript, None
             
-            # Transcribe
-            with open(temp_path, 'rb') as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language
-                )
+            suffix = os.path.splitext(urlparse(audio_url).path)[1].lower()
+            with tempfile.NamedTemporaryFile(suffix=suffix if suffix in STTService.AUDIO_SUFFIXES else '.mp3') as audio_file:
+                digest = STTService._download(audio_url, audio_file)
+                content_key = f"stt:sha256:{language}:{digest}"
+                
+                transcript = STTService._cached(content_key)
+                if transcript is None:
+                    audio_file.seek(0)
+                    transcript = get_provider_client().transcribe(audio_file, language)
             
-            os.remove(temp_path)
-            return transcript.text, None
+            STTService._remember({url_key: transcript, content_key: transcript})
+            return transcript, None
             
         except Exception as e:
             logger.error(f"STT error: {str(e)}")
             return None, str(e)
+    
+    @staticmethod
+    def _cached(key):
+        """Cached transcript, or None (also when the shared cache is unreachable)"""
+        from django.core.cache import caches
+        try:
+            return caches['shared'].get(key)
+        except Exception as e:
+            logger.warning(f"Transcript cache unavailable: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _remember(transcripts):
+        from django.core.cache import caches
+        try:
+            caches['shared'].set_many(transcripts, STTService.TRANSCRIPT_TTL)
+        except Exception as e:
+            logger.warning(f"Could not cache transcript: {str(e)}")
+    
+    @staticmethod
+    def _download(audio_url, audio_file):
+        """Stream the recording into audio_file in chunks; returns its SHA-256"""
+        max_bytes = getattr(settings, 'STT_MAX_AUDIO_BYTES', 25 * 1024 * 1024)
+        connect_timeout, read_timeout, total_timeout = getattr(settings, 'STT_DOWNLOAD_TIMEOUTS', (3, 15, 60))
+        deadline = time.monotonic() + total_timeout
+        digest, size = hashlib.sha256(), 0
+        
+        with get_http_session().get(audio_url, stream=True, timeout=(connect_timeout, read_timeout)) as response:
+            response.raise_for_status()
+            if int(response.headers.get('Content-Length') or 0) > max_bytes:
+                raise AudioTooLargeError(f"Recording is {response.headers['Content-Length']} bytes (max {max_bytes})")
+            
+            for chunk in response.iter_content(chunk_size=STTService.CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise AudioTooLargeError(f"Recording exceeds {max_bytes} bytes")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Recording download took longer than {total_timeout}s")
+                digest.update(chunk)
+                audio_file.write(chunk)
+        
+        audio_file.flush()
+        return digest.hexdigest()
 
 
 class TTSService:
     """Text-to-Speech service"""
     
+    MODEL = 'tts-1'
     VOICES = {
         'en': {'male': 'alloy', 'female': 'nova'},
         'es': {'male': 'onyx', 'female': 'shimmer'},
     }
     
+    @staticmethod
+    def voice_for(language, gender):
+        return TTSService.VOICES.get(language, TTSService.VOICES['en']).get(gender, 'nova')
+    
     @staticmethod
     def synthesize_speech(text, language='en', gender='female'):
-        """Convert text to speech"""
+        """Convert text to speech (uncached; see TTSCacheService for playback)"""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            voice = TTSService.voice_for(language, gender)
             
-            voice = TTSService.VOICES.get(language, TTSService.VOICES['en']).get(gender, 'nova')
-            
-            response = client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=text
-            )
-            
-            return response.content, None
+            return get_provider_client().speech(text, voice, model=TTSService.MODEL), None
             
         except Exception as e:
             logger.error(f"TTS error: {str(e)}")
@@ -144,15 +263,15 @@ class AIBridgeService:
     @staticmethod
     def conduct_interview(job_title, skills, language='en'):
         """Full interview flow"""
-        # Generate questions
-        questions, error = LLMService.generate_interview_questions(job_title, skills)
-        if error:
-            logger.error(f"Question generation failed: {error}")
+        from common.services.question_cache import QuestionCacheService
+        
+        # Questions are precomputed per job; a miss is generated in the background
+        questions, cache_status = QuestionCacheService.get_or_schedule(job_title, skills)
         
         return {
             'questions': questions,
             'language': language,
-            'status': 'ready' if not error else 'fallback'
+            'status': 'ready' if cache_status == 'cached' else 'fallback'
         }
     
     @staticmethod
@@ -167,14 +286,23 @@ class AIBridgeService:
             'confidence': 0.95  # Placeholder
         }, None
     
+    RETRY_BASE_DELAY = 0.5  # seconds
+    RETRY_MAX_DELAY = 4
+    
     @staticmethod
     def with_retry(func, *args, max_retries=3, **kwargs):
-        """Retry wrapper for API calls"""
+        """
+        Retry wrapper for API calls: short jittered backoff, and no retries
+        at all while the provider's circuit is open or its slots are full
+        """
         for attempt in range(max_retries):
             try:
                 return func(*args, **kwargs)
+            except (CircuitOpenError, ProviderBusyError):
+                raise
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
                 logger.warning(f"Retry {attempt + 1}/{max_retries}: {str(e)}")
-                time.sleep(2 ** attempt)
+                delay = min(AIBridgeService.RETRY_MAX_DELAY, AIBridgeService.RETRY_BASE_DELAY * 2 ** attempt)
+                time.sleep(random.uniform(delay / 2, delay))
@@ -0,0 +1,251 @@
+"""
+AI Call Dispatcher - claim due calls and hand each to exactly one worker
+"""
+from collections import OrderedDict, deque
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, CharField, Count, DurationField, ExpressionWrapper, F, Min, Q, Value, Window
+from django.db.models.functions import Cast, Concat, RowNumber
+from django.utils import timezone
+from core.ai_call_models import AICallQueue
+from common.services.ai_call_eligibility import AICallEligibility
+from common.services.ai_call_limiter import AICallLimiter
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AICallDispatcher:
+    """
+    Due calls move queued -> dispatching in one UPDATE under
+    FOR UPDATE SKIP LOCKED, each with a fresh dispatch key. The worker only
+    starts a call whose key still matches, so duplicate deliveries and
+    stale tasks are dropped no matter how many beat/worker replicas run.
+    Calls only start while AICallLimiter has rate budget and free live-call
+    slots, and employers take turns (weighted round-robin) for that capacity.
+    """
+
+    BATCH_SIZE = 25
+    STALE_AFTER = timedelta(minutes=15)  # Dispatched but never started (lost task)
+    RETRY_BASE_SECONDS = 60
+    FAIRNESS_WINDOW = 4  # Due rows considered per claimed row when interleaving employers
+
+    @staticmethod
+    def claim_batch(batch_size=BATCH_SIZE):
+        """
+        Claim due calls; returns [(call_id, dispatch_key)]. Candidates are
+        each employer's oldest `batch_size` due calls, taken round by round
+        (every employer's first call, then every second call...), so one
+        employer's mass shortlist cannot crowd the others out of the window.
+        """
+        now = timezone.now()
+        batch_token = uuid.uuid4().hex
+        due = Q(status='queued', scheduled_at__lte=now) | \
+            Q(status='dispatching', claimed_at__lt=now - AICallDispatcher.STALE_AFTER)
+
+        # Window functions cannot be combined with FOR UPDATE, so rows are picked first and locked after
+        candidates = list(
+            AICallQueue.objects.filter(due).annotate(
+                employer_rank=Window(
+                    RowNumber(),
+                    partition_by=F('application__job__employer_id'),
+                    order_by=[F('scheduled_at').asc(), F('id').asc()]
+                )
+            ).filter(employer_rank__lte=batch_size).order_by('employer_rank', 'scheduled_at', 'id').values_list(
+                'id', 'application__job__employer_id'
+            )[:batch_size * AICallDispatcher.FAIRNESS_WINDOW]
+        )
+        if not candidates:
+            return []
+
+        with transaction.atomic():
+            locked = set(
+                AICallQueue.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    due, id__in=[call_id for call_id, _ in candidates]
+                ).values_list('id', flat=True)
+            )
+            rows = [(call_id, employer_id) for call_id, employer_id in candidates if call_id in locked]
+            ids = AICallDispatcher.weighted_round_robin(rows)[:batch_size]
+            if not ids:
+                return []
+
+            AICallQueue.objects.filter(id__in=ids).update(
+                status='dispatching',
+                claimed_at=now,
+                dispatch_key=Concat(Value(f'{batch_token}:'), Cast('id', CharField()))
+            )
+
+        return [(call_id, f'{batch_token}:{call_id}') for call_id in ids]
+
+    @staticmethod
+    def weighted_round_robin(rows):
+        """
+        Order (call_id, employer_id) rows so each employer gets `weight`
+        calls per round (settings.AI_CALL_EMPLOYER_WEIGHTS, default 1);
+        employers and their calls keep oldest-first order.
+        """
+        weights = getattr(settings, 'AI_CALL_EMPLOYER_WEIGHTS', {})
+        queues = OrderedDict()
+        for call_id, employer_id in rows:
+            queues.setdefault(employer_id, deque()).append(call_id)
+
+        ordered = []
+        while queues:
+            for employer_id in list(queues):
+                calls = queues[employer_id]
+                for _ in range(max(1, weights.get(employer_id, 1))):
+                    if not calls:
+                        break
+                    ordered.append(calls.popleft())
+                if not calls:
+                    del queues[employer_id]
+        return ordered
+
+    @staticmethod
+    def claim_startable(limit=BATCH_SIZE, results=None):
+        """
+        Claim up to `limit` due calls and take their rate and concurrency
+        budget; returns [(call_id, dispatch_key)] ready to start. Calls over
+        budget go back to the queue. Nothing is claimed while the Twilio
+        circuit is open or its probe is in flight, so calls stay queued
+        instead of failing into retries; a half-open circuit gets one call
+        as its probe (results['held'] tells the caller to stop claiming).
+        """
+        from common.utils.circuit_breaker import CircuitBreaker
+
+        results = results if results is not None else {'claimed': 0, 'throttled': 0}
+        circuit = CircuitBreaker('twilio.calls').state
+        if circuit in ('open', 'probing'):
+            logger.warning(f"Twilio circuit is {circuit}; AI call dispatch held")
+            results['held'] = True
+            return []
+        if circuit == 'half_open':
+            logger.info("Twilio circuit is half-open; dispatching one probe call")
+            results['held'] = True
+            limit = 1
+
+        capacity = AICallLimiter.capacity()
+        if capacity <= 0:
+            return []
+
+        claimed = AICallDispatcher.claim_batch(min(limit, AICallDispatcher.BATCH_SIZE, capacity))
+        results['claimed'] += len(claimed)
+
+        startable = []
+        for call_id, dispatch_key in claimed:
+            if not AICallLimiter.acquire(call_id):
+                # Out of budget; the call waits for the next run
+                AICallDispatcher.release(call_id, dispatch_key)
+                results['throttled'] += 1
+                continue
+            startable.append((call_id, dispatch_key))
+        return startable
+
+    @staticmethod
+    def dispatch(max_batches=10):
+        """
+        Claim due calls in batches, within rate and concurrency limits, and
+        queue one task per call, or one task per batch when
+        AI_CALL_EXECUTION_MODE is 'async' (the batch runs on an event loop)
+        """
+        from common.tasks_ai_calls import execute_ai_call_task, execute_ai_calls_async_task
+
+        results = {'claimed': 0, 'dispatched': 0, 'failed': 0, 'throttled': 0}
+        async_mode = getattr(settings, 'AI_CALL_EXECUTION_MODE', 'prefork') == 'async'
+
+        for _ in range(max_batches):
+            startable = AICallDispatcher.claim_startable(AICallDispatcher.BATCH_SIZE, results)
+            last_batch = results.pop('held', False)  # Twilio circuit not closed: at most one probe batch
+            if not startable:
+                break
+
+            if async_mode:
+                try:
+                    execute_ai_calls_async_task.apply_async(args=[startable])
+                    results['dispatched'] += len(startable)
+                except Exception as e:
+                    logger.error(f"Failed to dispatch {len(startable)} calls: {str(e)}")
+                    for call_id, dispatch_key in startable:
+                        AICallLimiter.release(call_id)
+                        AICallDispatcher.release(call_id, dispatch_key)
+                    results['failed'] += len(startable)
+                if last_batch:
+                    break
+                continue
+
+            for call_id, dispatch_key in startable:
+                try:
+                    # The dispatch key doubles as the Celery task id
+                    execute_ai_call_task.apply_async(args=[call_id, dispatch_key], task_id=dispatch_key)
+                    results['dispatched'] += 1
+                except Exception as e:
+                    logger.error(f"Failed to dispatch call {call_id}: {str(e)}")
+                    AICallLimiter.release(call_id)
+                    AICallDispatcher.release(call_id, dispatch_key)
+                    results['failed'] += 1
+            if last_batch:
+                break
+
+        if results['claimed']:
+            logger.info(f"AI call dispatch complete: {results}")
+        return results
+
+    @staticmethod
+    def release(call_id, dispatch_key):
+        """Put a claimed call back in the queue"""
+        AICallQueue.objects.filter(id=call_id, status='dispatching', dispatch_key=dispatch_key).update(
+            status='queued', dispatch_key=None, claimed_at=None
+        )
+
+    @staticmethod
+    def begin(call_id, dispatch_key=None):
+        """
+        Atomically move a call to in_progress; False means another worker
+        already has it or the key is stale. Calls queued before the dispatcher
+        existed carry no key and are started straight from 'queued'.
+        """
+        if dispatch_key:
+            calls = AICallQueue.objects.filter(id=call_id, status='dispatching', dispatch_key=dispatch_key)
+        else:
+            calls = AICallQueue.objects.filter(id=call_id, status='queued')
+        return calls.update(status='in_progress', started_at=timezone.now()) == 1
+
+    @staticmethod
+    def fail(call_queue, error):
+        """Record a failed attempt and requeue with backoff while retries remain"""
+        call_queue.retry_count += 1
+        call_queue.error_message = error
+        call_queue.dispatch_key = None
+
+        if AICallEligibility.should_retry(call_queue):
+            call_queue.status = 'queued'
+            call_queue.scheduled_at = timezone.now() + timedelta(
+                seconds=AICallDispatcher.RETRY_BASE_SECONDS * (2 ** call_queue.retry_count)
+            )
+        else:
+            call_queue.status = 'failed'
+
+        call_queue.save(update_fields=['retry_count', 'error_message', 'dispatch_key', 'status', 'scheduled_at'])
+        return call_queue.status == 'queued'
+
+    @staticmethod
+    def stats():
+        """Queue depth, waiting times and limiter state"""
+        now = timezone.now()
+        due = AICallQueue.objects.filter(status='queued', scheduled_at__lte=now).aggregate(
+            depth=Count('id'), oldest=Min('scheduled_at')
+        )
+        recent = AICallQueue.objects.filter(started_at__gte=now - timedelta(hours=1)).aggregate(
+            avg_wait=Avg(ExpressionWrapper(F('started_at') - F('scheduled_at'), output_field=DurationField()))
+        )
+
+        return {
+            'queued': AICallQueue.objects.filter(status='queued').count(),
+            'due': due['depth'],
+            'oldest_wait_seconds': round((now - due['oldest']).total_seconds(), 1) if due['oldest'] else 0,
+            'avg_wait_seconds_last_hour': round(recent['avg_wait'].total_seconds(), 1) if recent['avg_wait'] else 0,
+            'dispatching': AICallQueue.objects.filter(status='dispatching').count(),
+            'limits': AICallLimiter.snapshot(),
+        }
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta
 from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AICallEligibility:
     """Eligibility engine for AI call triggers"""
@@ -43,7 +46,7 @@ class AICallEligibility:
         from core.ai_call_models import AICallQueue
         return not AICallQueue.objects.filter(
             application=application,
-            status__in=['queued', 'in_progress']
+            status__in=['queued', 'dispatching', 'in_progress']
         ).exists()
     
     @staticmethod
@@ -52,8 +55,17 @@ class AICallEligibility:
         return application.status in ['shortlisted', 'interview_scheduled']
     
     @staticmethod
-    def get_next_call_slot():
-        """Calculate next available call slot within business hours"""
+    def get_next_call_slot(candidate=None):
+        """Calculate next available call slot within the candidate's business hours"""
+        from common.services.call_slot_allocator import CallSlotAllocator
+        
+        try:
+            slot = CallSlotAllocator.allocate(getattr(candidate, 'timezone', 'UTC'))
+            if slot:
+                return slot
+        except Exception as e:
+            logger.warning(f"Slot allocation failed, using default slot: {str(e)}")
+        
         now = timezone.now()
         
         # If within call window, schedule in 5 minutes
@@ -0,0 +1,85 @@
+"""
+AI Call Limiter - provider rate budgets and live-call concurrency caps
+"""
+from django.conf import settings
+from common.utils.rate_limit import get_rate_limiter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AICallLimiter:
+    """
+    Gate call starts on settings.AI_CALL_LIMITS: every provider (and
+    'global') has a token bucket of requests per minute, charged
+    cost_per_call per call start, and a semaphore of concurrent live calls.
+    """
+
+    SLOT_TTL = 45 * 60  # A crashed worker's slot frees itself after this
+
+    @staticmethod
+    def _key(name):
+        return f"ai_calls:{name}"
+
+    @staticmethod
+    def capacity():
+        """How many calls could start right now across every limit"""
+        limiter = get_rate_limiter()
+        free = []
+        for name, policy in settings.AI_CALL_LIMITS.items():
+            key = AICallLimiter._key(name)
+            free.append(policy['max_concurrent'] - limiter.slots_in_use(key))
+            free.append(int(limiter.available(key, policy['rate_per_minute']) // policy.get('cost_per_call', 1)))
+        return max(0, min(free)) if free else 0
+
+    @staticmethod
+    def acquire(call_id):
+        """Take every slot and token a call start needs, or nothing"""
+        limiter = get_rate_limiter()
+        limits = settings.AI_CALL_LIMITS
+
+        # Check the buckets first so a refusal does not burn tokens elsewhere
+        for name, policy in limits.items():
+            if limiter.available(AICallLimiter._key(name), policy['rate_per_minute']) < policy.get('cost_per_call', 1):
+                return False
+
+        held = []
+        for name, policy in limits.items():
+            if not limiter.acquire_slot(AICallLimiter._key(name), policy['max_concurrent'], call_id, AICallLimiter.SLOT_TTL):
+                for key in held:
+                    limiter.release_slot(key, call_id)
+                return False
+            held.append(AICallLimiter._key(name))
+
+        # Another dispatcher may have spent the tokens since the check
+        for name, policy in limits.items():
+            allowed, _ = limiter.take(AICallLimiter._key(name), policy['rate_per_minute'], tokens=policy.get('cost_per_call', 1))
+            if not allowed:
+                for key in held:
+                    limiter.release_slot(key, call_id)
+                return False
+        return True
+
+    @staticmethod
+    def release(call_id):
+        """Free the call's concurrency slots once it ends"""
+        limiter = get_rate_limiter()
+        for name in settings.AI_CALL_LIMITS:
+            try:
+                limiter.release_slot(AICallLimiter._key(name), call_id)
+            except Exception as e:
+                logger.warning(f"Could not release {name} slot for call {call_id}: {str(e)}")
+
+    @staticmethod
+    def snapshot():
+        """Live calls and remaining tokens per limit"""
+        limiter = get_rate_limiter()
+        return {
+            name: {
+                'live_calls': limiter.slots_in_use(AICallLimiter._key(name)),
+                'max_concurrent': policy['max_concurrent'],
+                'tokens_available': round(limiter.available(AICallLimiter._key(name), policy['rate_per_minute']), 2),
+                'rate_per_minute': policy['rate_per_minute'],
+            }
+            for name, policy in settings.AI_CALL_LIMITS.items()
+        }
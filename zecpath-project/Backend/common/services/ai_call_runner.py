@@ -0,0 +1,316 @@
+"""
+AI Call Runner - one interview call end to end, in a prefork worker or many per event loop
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from core.ai_call_models import AICallQueue, AIInterviewSession
+from common.services.ai_call_dispatcher import AICallDispatcher
+from common.services.ai_call_limiter import AICallLimiter
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CallDialError(Exception):
+    """Twilio did not place the call; the runner records it as a failed attempt (requeued with backoff)"""
+
+
+class AICallRunner:
+    """
+    The steps of an interview call. run() executes them blocking in a
+    Celery task (execute_ai_call_task): a dialed call returns as soon as
+    Twilio accepts it, a candidate without a phone number gets the
+    simulated interview. AsyncAICallRunner runs the same steps for many
+    calls at once on one event loop.
+    """
+
+    @staticmethod
+    def open(call_queue_id):
+        """Load the call and open its interview buffer"""
+        from common.services.interview_buffer import InterviewBuffer
+
+        call_queue = AICallQueue.objects.select_related(
+            'application__candidate', 'application__job'
+        ).get(id=call_queue_id)
+
+        # Session and question state live in memory and are flushed at
+        # checkpoints; a retried call resumes from the last one
+        return call_queue, InterviewBuffer.open(call_queue, call_queue.application.job)
+
+    @staticmethod
+    def dial(call_queue, buffer):
+        """
+        Place the voice call; True once a real call is live, whose interview
+        is then driven by the Twilio webhooks and closed by finish_dialed().
+        False only for candidates without a phone number (simulated
+        interview); raises CallDialError when Twilio does not place the call.
+        """
+        from common.services.voice_call_service import VoiceCallService
+        from common.services.webhook_interview import WebhookInterviewService
+
+        candidate, job = call_queue.application.candidate, call_queue.application.job
+        if not getattr(candidate, 'phone', None):
+            return False
+
+        call_result, call_error = VoiceCallService.start_interview_call(
+            candidate=candidate,
+            job=job,
+            language='en',
+            voice_gender='female'
+        )
+
+        if call_error:
+            raise CallDialError(f"Voice call failed: {call_error}")
+
+        logger.info(f"Voice call initiated: {call_result['call_sid']}")
+        call_queue.call_sid = call_result['call_sid']
+        call_queue.save(update_fields=['call_sid'])
+        # First webhook is served from the hot store
+        WebhookInterviewService.register_call(
+            call_queue.call_sid, call_queue.id, buffer.session.pk, job.id, buffer.state_values()
+        )
+        return True
+
+    @staticmethod
+    def dialed(call_queue):
+        """Result for a call handed over to Twilio; it keeps its live-call slots until finish_dialed()"""
+        logger.info(f"AI call {call_queue.id} is live as {call_queue.call_sid}; webhooks drive the interview")
+        return {'status': 'dialed', 'call_id': call_queue.id, 'call_sid': call_queue.call_sid}
+
+    @staticmethod
+    async def capture_answer(prepared):
+        # Simulate answer (replace with real Twilio response in production)
+        return f"Simulated answer for {prepared.category} question", 15
+
+    @staticmethod
+    def complete(call_queue, buffer, stage_timings):
+        """Final flush (remaining turns, transcript, score, timings) and close the call"""
+        from common.services.ai_conversation_service import AIConversationService
+
+        score_result = buffer.finish(confidence=0.95, stage_timings=stage_timings)
+        logger.info(f"Interview score: {round(score_result['overall_score'], 2)}, stages: {stage_timings}")
+
+        AIConversationService.finalize_session(
+            call_queue,
+            outcome='interested',
+            summary='Dynamic AI interview completed successfully',
+            sentiment=0.8
+        )
+
+        call_queue.status = 'completed'
+        call_queue.completed_at = timezone.now()
+        call_queue.call_duration = buffer.next_turn_number * 20
+        call_queue.save()
+
+        logger.info(f"AI call completed: {call_queue.id}")
+        return {'status': 'completed', 'call_id': call_queue.id, 'session_id': buffer.session.session_id}
+
+    @staticmethod
+    def finish_dialed(call_queue_id):
+        """
+        Close a dialed call once the webhooks recorded its last answer: score
+        the turns, close the queue entry and free its live-call slots. The
+        row lock orders this against CallStatusService.flush, which sets the
+        real call duration, and against a second finisher (the final flush
+        task and flush_pending), which finds the session already scored.
+        """
+        from common.services.ai_conversation_service import AIConversationService
+        from common.services.interview_buffer import InterviewBuffer
+
+        with transaction.atomic():
+            call_queue = AICallQueue.objects.select_for_update(of=('self',)).select_related(
+                'application__job'
+            ).get(id=call_queue_id)
+            if AIInterviewSession.objects.filter(call_queue=call_queue, overall_score__isnull=False).exists():
+                logger.info(f"AI call {call_queue_id} already finished")
+                return {'status': 'completed', 'call_id': call_queue_id}
+            buffer = InterviewBuffer.open(call_queue, call_queue.application.job)
+            score_result = buffer.finish(confidence=0.95)
+            logger.info(f"Interview score: {round(score_result['overall_score'], 2)} (call {call_queue.call_sid})")
+
+            if call_queue.status not in ('completed', 'failed'):
+                call_queue.status = 'completed'
+                call_queue.completed_at = timezone.now()
+            AIConversationService.finalize_session(
+                call_queue,
+                outcome='interested',
+                summary='Dynamic AI interview completed successfully',
+                sentiment=0.8
+            )
+
+        AICallLimiter.release(call_queue_id)
+        return {'status': 'completed', 'call_id': call_queue_id, 'session_id': buffer.session.session_id}
+
+    @staticmethod
+    def fail(call_queue_id, error):
+        """Record the failure; requeued with backoff while retries remain"""
+        logger.error(f"AI call failed: {error}")
+
+        call_queue = AICallQueue.objects.get(id=call_queue_id)
+        if AICallDispatcher.fail(call_queue, error):
+            # The dispatcher picks it up again when due
+            logger.info(f"Retrying at {call_queue.scheduled_at} (attempt {call_queue.retry_count})")
+            return {'status': 'retrying', 'message': error}
+        return {'status': 'failed', 'message': error}
+
+    @staticmethod
+    def run(call_queue_id, dispatch_key=None):
+        """Blocking run of one call (prefork Celery worker)"""
+        from asgiref.sync import async_to_sync
+        from common.services.question_plan import QuestionPlanCache
+        from common.services.voice_turn_pipeline import VoiceTurnPipeline
+
+        # Claim the call; duplicate or stale deliveries stop here
+        if not AICallDispatcher.begin(call_queue_id, dispatch_key):
+            logger.info(f"AI call {call_queue_id} already started or dispatch key stale, skipping")
+            return {'status': 'skipped', 'call_id': call_queue_id}
+
+        live = False
+        try:
+            call_queue, buffer = AICallRunner.open(call_queue_id)
+            live = AICallRunner.dial(call_queue, buffer)
+            if live:
+                return AICallRunner.dialed(call_queue)
+
+            # Dynamic question flow, compiled once per job and cached per process.
+            # The pipeline prepares the next question's audio while an answer is
+            # captured; turns are evaluated and checkpointed in the background.
+            pipeline = VoiceTurnPipeline(buffer, QuestionPlanCache.get(call_queue.application.job_id))
+            stage_timings = async_to_sync(pipeline.run)(AICallRunner.capture_answer)
+
+            return AICallRunner.complete(call_queue, buffer, stage_timings)
+
+        except AICallQueue.DoesNotExist:
+            logger.error(f"Call queue {call_queue_id} not found")
+            return {'status': 'error', 'message': 'Call queue not found'}
+
+        except Exception as e:
+            return AICallRunner.fail(call_queue_id, str(e))
+
+        finally:
+            # Free the live-call slots taken by the dispatcher (a live call keeps them)
+            if not live:
+                AICallLimiter.release(call_queue_id)
+
+
+class AsyncAICallRunner:
+    """
+    Many calls per process: each call is a coroutine, provider requests go
+    through an async client (no thread per request), and database work
+    runs on a pool of AI_ASYNC_DB_THREADS threads, which also caps the
+    process's database connections. Up to AI_ASYNC_MAX_INTERVIEWS calls
+    run at once. A dialed call is done here once Twilio accepts it (the
+    webhooks run its interview), so what runs concurrently for long is
+    the simulated interview of candidates without a phone number; for
+    live calls this mode only overlaps the dial requests.
+    """
+
+    def __init__(self, max_concurrent=None, db_threads=None):
+        self.max_concurrent = max_concurrent or getattr(settings, 'AI_ASYNC_MAX_INTERVIEWS', 200)
+        self._db_pool = ThreadPoolExecutor(
+            max_workers=db_threads or getattr(settings, 'AI_ASYNC_DB_THREADS', 8),
+            thread_name_prefix='interview-db'
+        )
+        self.provider = None
+        self._slots = None
+
+    @staticmethod
+    def _in_db_thread(func, *args, **kwargs):
+        close_old_connections()
+        return func(*args, **kwargs)
+
+    def db(self, func):
+        """Coroutine function running func on the database pool"""
+        async def run(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._db_pool, partial(self._in_db_thread, func, *args, **kwargs))
+        return run
+
+    async def run_call(self, call_queue_id, dispatch_key=None):
+        from common.services.question_plan import QuestionPlanCache
+        from common.services.voice_turn_pipeline import VoiceTurnPipeline
+
+        async with self._slots:
+            if not await self.db(AICallDispatcher.begin)(call_queue_id, dispatch_key):
+                logger.info(f"AI call {call_queue_id} already started or dispatch key stale, skipping")
+                return {'status': 'skipped', 'call_id': call_queue_id}
+
+            live = False
+            try:
+                call_queue, buffer = await self.db(AICallRunner.open)(call_queue_id)
+                live = await self.db(AICallRunner.dial)(call_queue, buffer)
+                if live:
+                    return AICallRunner.dialed(call_queue)
+
+                plan = await self.db(QuestionPlanCache.get)(call_queue.application.job_id)
+                pipeline = VoiceTurnPipeline(buffer, plan, provider=self.provider, db=self.db)
+                stage_timings = await pipeline.run(AICallRunner.capture_answer)
+
+                return await self.db(AICallRunner.complete)(call_queue, buffer, stage_timings)
+
+            except AICallQueue.DoesNotExist:
+                logger.error(f"Call queue {call_queue_id} not found")
+                return {'status': 'error', 'message': 'Call queue not found'}
+
+            except Exception as e:
+                return await self.db(AICallRunner.fail)(call_queue_id, str(e))
+
+            finally:
+                if not live:
+                    await self.db(AICallLimiter.release)(call_queue_id)
+
+    async def _start(self):
+        from common.utils.provider_client import create_async_provider_client
+
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.provider = create_async_provider_client()
+
+    async def _stop(self):
+        await self.provider.aclose()
+        self._db_pool.shutdown(wait=True)
+
+    async def run_many(self, calls):
+        """Run [(call_id, dispatch_key)] concurrently; returns their results in order"""
+        await self._start()
+        try:
+            results = await asyncio.gather(
+                *(self.run_call(call_id, dispatch_key) for call_id, dispatch_key in calls),
+                return_exceptions=True
+            )
+        finally:
+            await self._stop()
+        return [
+            {'status': 'error', 'message': str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    async def serve(self, poll_interval=5, stop=None):
+        """
+        Standalone service: claim due calls while there is room (same
+        limits as the dispatcher) and run them, until stop is set
+        """
+        await self._start()
+        stop = stop or asyncio.Event()
+        running = set()
+        try:
+            while not stop.is_set():
+                room = self.max_concurrent - len(running)
+                claimed = await self.db(AICallDispatcher.claim_startable)(room) if room > 0 else []
+                for call_id, dispatch_key in claimed:
+                    running.add(asyncio.create_task(self.run_call(call_id, dispatch_key)))
+
+                if running:
+                    _, running = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    try:
+                        await asyncio.wait_for(stop.wait(), poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+            if running:
+                await asyncio.wait(running)
+        finally:
+            await self._stop()
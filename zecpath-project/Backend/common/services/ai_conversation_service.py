@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 from core.ai_call_models import AIInterviewSession, AIConversationTurn, AICallTranscript, AICallQueue
 import uuid
 import logging
@@ -19,24 +21,7 @@ class AIConversationService:
     @staticmethod
     def add_conversation_turn(session, turn_number, question, answer="", duration=None, category="", follow_up=False):
         """Add Q&A turn to session with optional scoring"""
-        from common.services.answer_evaluator import AnswerEvaluator
-        
-        # Evaluate answer if provided
-        scores = {}
-        if answer and answer.strip():
-            evaluation = AnswerEvaluator.evaluate_answer(
-                question=question,
-                answer=answer,
-                category=category
-            )
-            scores = {
-                'answer_score': evaluation['answer_score'],
-                'relevance_score': evaluation['relevance_score'],
-                'completeness_score': evaluation['completeness_score'],
-                'keyword_matches': evaluation['keyword_matches'],
-                'confidence_score': evaluation['confidence_score'],
-                'ai_annotations': evaluation['ai_annotations']
-            }
+        scores = AIConversationService.score_answer(question, answer, category)
         
         turn = AIConversationTurn.objects.create(
             session=session,
@@ -54,6 +39,28 @@ class AIConversationService:
         session.save()
         return turn
     
+    @staticmethod
+    def score_answer(question, answer, category=""):
+        """Turn score fields for an answer (empty for unanswered questions)"""
+        from common.services.answer_evaluator import AnswerEvaluator
+        
+        if not answer or not answer.strip():
+            return {}
+        
+        evaluation = AnswerEvaluator.evaluate_answer(
+            question=question,
+            answer=answer,
+            category=category
+        )
+        return {
+            'answer_score': evaluation['answer_score'],
+            'relevance_score': evaluation['relevance_score'],
+            'completeness_score': evaluation['completeness_score'],
+            'keyword_matches': evaluation['keyword_matches'],
+            'confidence_score': evaluation['confidence_score'],
+            'ai_annotations': evaluation['ai_annotations']
+        }
+    
     @staticmethod
     def save_transcript(session, transcript_text, transcript_json, audio_url="", confidence=None):
         """Save full transcript"""
@@ -81,3 +88,43 @@ class AIConversationService:
         call_queue.save()
         
         logger.info(f"Session finalized: {call_queue.id} - Outcome: {outcome}")
+    
+    @staticmethod
+    def analyze_sessions(session_pks, max_workers=None):
+        """
+        LLM-rate every answered turn of the given sessions (AIInterviewSession
+        primary keys, not the public session_id strings): one batched
+        request per session (per chunk for long ones), sessions in parallel
+        on a bounded pool. Database work stays on the calling thread.
+        Ratings land in turn.ai_annotations['llm_rating'/'llm_explanation'].
+        """
+        from common.services.ai_bridge_service import LLMService
+        
+        turns_by_session = {}
+        for turn in AIConversationTurn.objects.filter(session_id__in=session_pks).exclude(answer_text='').order_by('turn_number'):
+            turns_by_session.setdefault(turn.session_id, []).append(turn)
+        if not turns_by_session:
+            return {'sessions': 0, 'rated': 0, 'errors': 0}
+        
+        max_workers = max_workers or getattr(settings, 'AI_ANALYSIS_MAX_WORKERS', 4)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(turns_by_session))) as pool:
+            outcomes = list(pool.map(
+                lambda turns: LLMService.analyze_responses([(t.id, t.question_text, t.answer_text) for t in turns]),
+                turns_by_session.values()
+            ))
+        
+        rated, errors = [], 0
+        for turns, (ratings, chunk_errors) in zip(turns_by_session.values(), outcomes):
+            errors += len(chunk_errors)
+            for turn in turns:
+                if turn.id in ratings:
+                    turn.ai_annotations = {
+                        **(turn.ai_annotations or {}),
+                        'llm_rating': ratings[turn.id]['rating'],
+                        'llm_explanation': ratings[turn.id]['explanation'],
+                    }
+                    rated.append(turn)
+        
+        AIConversationTurn.objects.bulk_update(rated, ['ai_annotations'], batch_size=500)
+        logger.info(f"Analyzed {len(turns_by_session)} sessions, rated {len(rated)} answers")
+        return {'sessions': len(turns_by_session), 'rated': len(rated), 'errors': errors}
@@ -0,0 +1,68 @@
+"""
+Call Slot Allocator - spread AI calls over the candidate's local call window
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.conf import settings
+from django.utils import timezone
+from common.services.ai_call_eligibility import AICallEligibility
+from common.utils.slot_bitmap import get_slot_bitmap
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CallSlotAllocator:
+    """
+    Each UTC day is a bitmap of start slots AI_CALL_SLOTS_PER_MINUTE per
+    minute wide. A call takes the earliest clear bit inside the candidate's
+    local call window, so deferred calls fill the window at the configured
+    rate instead of all landing on 9:00:00.
+    """
+
+    LEAD_TIME = timedelta(minutes=5)
+    SEARCH_DAYS = 7
+    BITMAP_RETAIN = timedelta(days=1)  # Kept past the end of its UTC day
+
+    @staticmethod
+    def zone(tz_name):
+        try:
+            return ZoneInfo(tz_name or 'UTC')
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"Unknown time zone {tz_name!r}, using UTC")
+            return dt_timezone.utc
+
+    @staticmethod
+    def allocate(tz_name='UTC', earliest=None):
+        """Claim the earliest free slot at or after `earliest`; returns an aware datetime or None"""
+        per_minute = max(1, settings.AI_CALL_SLOTS_PER_MINUTE)
+        step = 60.0 / per_minute
+        tz = CallSlotAllocator.zone(tz_name)
+        earliest = earliest or timezone.now() + CallSlotAllocator.LEAD_TIME
+        bitmap = get_slot_bitmap()
+
+        first_day = earliest.astimezone(tz).date()
+        for offset in range(CallSlotAllocator.SEARCH_DAYS):
+            day = first_day + timedelta(days=offset)
+            window_start = datetime.combine(day, time(AICallEligibility.CALL_WINDOW_START), tzinfo=tz)
+            window_end = datetime.combine(day, time(AICallEligibility.CALL_WINDOW_END), tzinfo=tz)
+            start = max(window_start, earliest)
+
+            # A local window can straddle UTC midnight; bitmaps are per UTC day
+            while start < window_end:
+                utc_start = start.astimezone(dt_timezone.utc)
+                midnight = datetime.combine(utc_start.date(), time.min, tzinfo=dt_timezone.utc)
+                segment_end = min(window_end.astimezone(dt_timezone.utc), midnight + timedelta(days=1))
+
+                index = bitmap.claim(
+                    f"ai_calls:{utc_start:%Y%m%d}:{per_minute}",
+                    math.ceil((utc_start - midnight).total_seconds() / step),
+                    math.ceil((segment_end - midnight).total_seconds() / step),
+                    midnight + timedelta(days=1) + CallSlotAllocator.BITMAP_RETAIN
+                )
+                if index is not None:
+                    return midnight + timedelta(seconds=index * step)
+                start = segment_end
+
+        return None
@@ -0,0 +1,144 @@
+"""
+Call Status Service - buffered Twilio status callbacks, applied in bulk
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from core.ai_call_models import AICallQueue, AICallEvent
+from common.utils.hot_store import get_hot_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CallStatusService:
+    """
+    Twilio sends four or more status callbacks per call. The webhook only
+    appends the event to the hot store; flush() writes every buffered event
+    to AICallEvent with one bulk_create and applies the latest status of
+    each call to AICallQueue with one bulk_update (last state wins, by
+    SequenceNumber, and a late non-final event never reopens a finished call).
+    """
+
+    DIRTY_SET = 'call_status'
+    FINAL_STATUSES = ('completed', 'busy', 'no-answer', 'failed', 'canceled')
+    FINAL_QUEUE_STATUSES = ('completed', 'failed')
+
+    @staticmethod
+    def _events_key(call_sid):
+        return f"status:{call_sid}"
+
+    @staticmethod
+    def record(params):
+        """Buffer one status callback (request.POST); returns False when it has no CallSid"""
+        call_sid, status = params.get('CallSid'), params.get('CallStatus')
+        if not call_sid or not status:
+            return False
+
+        sequence = params.get('SequenceNumber')
+        duration = params.get('CallDuration')
+        get_hot_store().append(CallStatusService._events_key(call_sid), {
+            'status': status,
+            'sequence': int(sequence) if sequence and sequence.isdigit() else None,
+            'duration': int(duration) if duration and duration.isdigit() else None,
+            'received_at': timezone.now().isoformat(),
+            'payload': dict(params.items()),
+        }, CallStatusService.DIRTY_SET)
+        return True
+
+    @staticmethod
+    def collapse(events):
+        """Latest event of a call: highest SequenceNumber, then arrival order"""
+        return max(
+            enumerate(events), key=lambda indexed: (indexed[1]['sequence'] or 0, indexed[0])
+        )[1]
+
+    @staticmethod
+    def apply(call_queue, event):
+        """Set queue fields from the call's latest event; returns the changed field names"""
+        status = event['status']
+        received_at = parse_datetime(event['received_at'])
+        if status not in CallStatusService.FINAL_STATUSES and \
+                call_queue.status in CallStatusService.FINAL_QUEUE_STATUSES:
+            return []
+
+        changed = []
+        if status == 'in-progress':
+            call_queue.status = 'in_progress'
+            call_queue.started_at = call_queue.started_at or received_at
+            changed = ['status', 'started_at']
+        elif status == 'completed':
+            call_queue.status = 'completed'
+            call_queue.completed_at = call_queue.completed_at or received_at
+            changed = ['status', 'completed_at']
+            if event['duration'] is not None:
+                call_queue.call_duration = event['duration']
+                changed.append('call_duration')
+        elif status in CallStatusService.FINAL_STATUSES:
+            call_queue.status = 'failed'
+            call_queue.completed_at = call_queue.completed_at or received_at
+            call_queue.error_message = f"Twilio call {status}"
+            changed = ['status', 'completed_at', 'error_message']
+            if status in ('busy', 'no-answer'):
+                call_queue.call_outcome = 'no_response'
+                changed.append('call_outcome')
+        return changed
+
+    @staticmethod
+    def flush(limit=500):
+        """Write buffered events of up to `limit` calls; returns how many events were written"""
+        store = get_hot_store()
+        drained = {}
+        for key in store.pop_dirty(CallStatusService.DIRTY_SET, limit):
+            events = store.drain(key)
+            if events:
+                drained[key.split(':', 1)[1]] = events
+        if not drained:
+            return 0
+
+        try:
+            with transaction.atomic():
+                queues = {
+                    call_queue.call_sid: call_queue
+                    for call_queue in AICallQueue.objects.select_for_update().filter(call_sid__in=list(drained))
+                }
+
+                rows, updated, fields = [], [], set()
+                for call_sid, events in drained.items():
+                    call_queue = queues.get(call_sid)
+                    rows.extend(
+                        AICallEvent(
+                            call_queue=call_queue,
+                            call_sid=call_sid,
+                            status=event['status'],
+                            sequence_number=event['sequence'],
+                            call_duration=event['duration'],
+                            payload=event['payload'],
+                            received_at=parse_datetime(event['received_at']),
+                        )
+                        for event in events
+                    )
+                    if call_queue is None:
+                        logger.warning(f"Status events for unknown call {call_sid}")
+                        continue
+                    changed = CallStatusService.apply(call_queue, CallStatusService.collapse(events))
+                    if changed:
+                        updated.append(call_queue)
+                        fields.update(changed)
+
+                AICallEvent.objects.bulk_create(rows)
+                if updated:
+                    AICallQueue.objects.bulk_update(updated, sorted(fields))
+        except Exception:
+            for call_sid, events in drained.items():
+                store.requeue(CallStatusService._events_key(call_sid), events, CallStatusService.DIRTY_SET)
+            raise
+
+        # Dialed calls hold their live-call slots until Twilio reports the end
+        from common.services.ai_call_limiter import AICallLimiter
+        for call_queue in updated:
+            if call_queue.status in CallStatusService.FINAL_QUEUE_STATUSES:
+                AICallLimiter.release(call_queue.id)
+
+        logger.info(f"Applied {len(rows)} status events to {len(updated)} calls")
+        return len(rows)
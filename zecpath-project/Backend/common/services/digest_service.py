@@ -0,0 +1,112 @@
+"""
+Employer Digest Service - roll up new-application notifications per employer
+"""
+from collections import defaultdict
+from django.db.models import Count, F, Max
+from django.db.models.functions import RowNumber
+from django.db.models.expressions import Window
+from core.notification_models import EmployerDigestEvent
+from employers.models import Employer
+from common.services.email_service import EmailService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EmployerDigestService:
+    """Accumulate new-application events and send one email per employer per window"""
+
+    TOP_CANDIDATES = 3  # per job
+
+    @staticmethod
+    def modes_for(mode):
+        """
+        Employer modes whose pending events go out in this run: the hourly
+        run also flushes events left behind by employers who switched to
+        'immediate' (hourly <-> daily switches are picked up by the new mode)
+        """
+        return [mode, 'immediate'] if mode == 'hourly' else [mode]
+
+    @staticmethod
+    def record(rows):
+        """Store pending digest events from EmailService application rows"""
+        EmployerDigestEvent.objects.bulk_create([
+            EmployerDigestEvent(
+                employer_id=row['employer_id'],
+                job_id=row['job_id'],
+                application_id=row['application_id'],
+                match_score=row['match_score']
+            )
+            for row in rows
+        ])
+
+    @staticmethod
+    def send_digests(mode):
+        """Send pending digests for employers in the given mode (hourly/daily)"""
+        pending = EmployerDigestEvent.objects.filter(
+            employer__notification_mode__in=EmployerDigestService.modes_for(mode)
+        )
+        max_id = pending.aggregate(max_id=Max('id'))['max_id']
+        if max_id is None:
+            return {'employers': 0, 'events': 0}
+
+        # Events arriving while we send wait for the next window
+        events = pending.filter(id__lte=max_id)
+
+        job_counts = events.values('employer_id', 'job_id', 'job__title').annotate(
+            count=Count('id')
+        ).order_by('employer_id', '-count')
+
+        top_candidates = events.annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=[F('job_id')],
+                order_by=[F('match_score').desc(), F('id').asc()]
+            )
+        ).filter(rank__lte=EmployerDigestService.TOP_CANDIDATES).values(
+            'job_id', 'match_score', 'application__candidate__user__email',
+            'application__candidate__user__first_name', 'application__candidate__user__last_name'
+        ).order_by('job_id', 'rank')
+
+        candidates_by_job = defaultdict(list)
+        for row in top_candidates:
+            name = f"{row['application__candidate__user__first_name']} {row['application__candidate__user__last_name']}".strip()
+            candidates_by_job[row['job_id']].append({
+                'name': name or row['application__candidate__user__email'],
+                'match_score': row['match_score'],
+            })
+
+        jobs_by_employer = defaultdict(list)
+        for row in job_counts:
+            jobs_by_employer[row['employer_id']].append({
+                'job_title': row['job__title'],
+                'count': row['count'],
+                'top_candidates': candidates_by_job[row['job_id']],
+            })
+
+        employers = Employer.objects.filter(id__in=jobs_by_employer.keys()).values(
+            'id', 'company_name', 'user__email', 'user__first_name', 'user__last_name'
+        )
+        messages, employer_ids = [], []
+        for employer in employers:
+            employer_row = {
+                'employer_email': employer['user__email'],
+                'employer_name': f"{employer['user__first_name']} {employer['user__last_name']}".strip() or 'Employer',
+                'company_name': employer['company_name'] or 'Company',
+            }
+            messages.append(EmailService.build_employer_digest(employer_row, jobs_by_employer[employer['id']], mode))
+            employer_ids.append(employer['id'])
+
+        # Events of a failed digest stay pending and roll into the next window
+        # (no EmailService retry, or the employer would get the rollup twice)
+        results = EmailService.send_batch(messages, retry=False)
+        sent_to = [employer_id for employer_id, (success, _) in zip(employer_ids, results) if success]
+        deleted, _ = EmployerDigestEvent.objects.filter(id__lte=max_id, employer_id__in=sent_to).delete()
+
+        summary = {
+            'employers': len(messages),
+            'events': deleted,
+            'sent': len(sent_to),
+        }
+        logger.info(f"{mode} employer digests: {summary}")
+        return summary
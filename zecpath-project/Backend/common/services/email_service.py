@@ -1,8 +1,10 @@
-from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
 from django.utils import timezone
-from core.models import EmailLog
+from collections import defaultdict
+from core.models import EmailLog, Application
+from core.interview_models import InterviewSchedule
+from common.services.email_templates import EmailTemplateRegistry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +13,7 @@ class EmailService:
     """Email sending service with template support and logging"""
     
     MAX_RETRIES = 3
+    RETRY_BASE_SECONDS = 60
     
     @staticmethod
     def send_email(recipient, subject, template_name, context, retry_count=0):
@@ -18,162 +21,378 @@ class EmailService:
         Send email with HTML template
         Returns: (success, error_message)
         """
-        # Create email log
-        email_log = EmailLog.objects.create(
-            recipient=recipient,
-            subject=subject,
-            template_name=template_name,
-            context_data=context,
-            retry_count=retry_count
-        )
+        return EmailService.send_batch([{
+            'recipient': recipient,
+            'subject': subject,
+            'template_name': template_name,
+            'context': context,
+            'retry_count': retry_count,
+        }])[0]
+    
+    @staticmethod
+    def send_batch(messages, retry=True):
+        """
+        Send many emails over one SMTP connection
+        messages: dicts with recipient, subject, template_name, context
+        Returns: list of (success, error_message) in input order
+        """
+        if not messages:
+            return []
         
+        logs = EmailLog.objects.bulk_create([
+            EmailLog(
+                recipient=message['recipient'],
+                subject=message['subject'],
+                template_name=message['template_name'],
+                context_data=message['context'],
+                retry_count=message.get('retry_count', 0)
+            )
+            for message in messages
+        ])
+        
+        return EmailService.send_logged(logs, retry=retry)
+    
+    @staticmethod
+    def send_logged(logs, retry=True):
+        """Render and send existing EmailLog rows, then persist their outcome in bulk"""
+        results = []
+        
+        try:
+            with get_connection(fail_silently=False) as connection:
+                for email_log in logs:
+                    results.append(EmailService._send_log(connection, email_log))
+        except Exception as e:
+            # Connection could not be opened; everything not attempted fails
+            error_msg = str(e)
+            logger.error(f"SMTP connection failed: {error_msg}")
+            for email_log in logs[len(results):]:
+                email_log.status = 'failed'
+                email_log.error_message = error_msg
+                results.append((False, error_msg))
+        
+        EmailLog.objects.bulk_update(logs, ['status', 'sent_at', 'error_message', 'retry_count'])
+        
+        if retry:
+            EmailService._schedule_retries([log for log in logs if log.status == 'failed'])
+        
+        return results
+    
+    @staticmethod
+    def _send_log(connection, email_log):
+        """Send one logged email on an open connection"""
         try:
             # Render HTML template
-            html_content = render_to_string(f'emails/{template_name}.html', context)
+            html_content = EmailTemplateRegistry.render(email_log.template_name, email_log.context_data)
             
             # Create email message
             email = EmailMultiAlternatives(
-                subject=subject,
+                subject=email_log.subject,
                 body=html_content,  # Fallback plain text
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[recipient]
+                to=[email_log.recipient],
+                connection=connection
             )
             email.attach_alternative(html_content, "text/html")
+            connection.send_messages([email])
             
-            # Send email
-            email.send(fail_silently=False)
-            
-            # Update log
             email_log.status = 'sent'
             email_log.sent_at = timezone.now()
-            email_log.save()
+            email_log.error_message = ''
             
-            logger.info(f"Email sent to {recipient}: {subject}")
+            logger.info(f"Email sent to {email_log.recipient}: {email_log.subject}")
             return True, None
             
         except Exception as e:
             error_msg = str(e)
             email_log.status = 'failed'
             email_log.error_message = error_msg
-            email_log.save()
-            
-            logger.error(f"Email failed to {recipient}: {error_msg}")
-            
-            # Retry logic
-            if retry_count < EmailService.MAX_RETRIES:
-                logger.info(f"Retrying email to {recipient} (attempt {retry_count + 1})")
-                return EmailService.send_email(recipient, subject, template_name, context, retry_count + 1)
             
+            logger.error(f"Email failed to {email_log.recipient}: {error_msg}")
             return False, error_msg
     
     @staticmethod
-    def send_application_submitted(application):
-        """Send email when candidate submits application"""
-        context = {
-            'candidate_name': application.candidate.user.get_full_name() or application.candidate.user.email,
+    def _schedule_retries(failed_logs):
+        """Queue delayed retries instead of retrying inline"""
+        retry_groups = defaultdict(list)
+        for email_log in failed_logs:
+            if email_log.retry_count < EmailService.MAX_RETRIES:
+                retry_groups[email_log.retry_count].append(email_log.id)
+        
+        if not retry_groups:
+            return
+        
+        from common.tasks import retry_emails_task
+        for retry_count, log_ids in retry_groups.items():
+            countdown = EmailService.RETRY_BASE_SECONDS * (2 ** retry_count)
+            try:
+                retry_emails_task.apply_async(args=[log_ids], countdown=countdown)
+                logger.info(f"Retrying {len(log_ids)} emails in {countdown}s (attempt {retry_count + 1})")
+            except Exception as e:
+                logger.warning(f"Could not queue email retry: {str(e)}")
+    
+    @staticmethod
+    def _full_name(first_name, last_name):
+        return f"{first_name} {last_name}".strip()
+    
+    @staticmethod
+    def application_row(application):
+        """Email row from a loaded Application (select_related candidate__user, job__employer__user)"""
+        candidate_user = application.candidate.user
+        employer = application.job.employer
+        return {
+            'application_id': application.id,
+            'job_id': application.job_id,
+            'employer_id': employer.id,
+            'notification_mode': employer.notification_mode,
+            'candidate_email': candidate_user.email,
+            'candidate_name': candidate_user.get_full_name() or candidate_user.email,
+            'employer_email': employer.user.email,
+            'employer_name': employer.user.get_full_name() or 'Employer',
+            'company_name': employer.company_name or 'Company',
             'job_title': application.job.title,
-            'company_name': application.job.employer.company_name or 'Company',
-            'applied_date': application.applied_at.strftime('%B %d, %Y'),
+            'match_score': application.match_score,
+            'applied_at': application.applied_at,
         }
-        
-        return EmailService.send_email(
-            recipient=application.candidate.user.email,
-            subject=f'Application Submitted - {application.job.title}',
-            template_name='application_submitted',
-            context=context
+    
+    @staticmethod
+    def application_rows(application_ids):
+        """Email rows for many applications in one query: {application_id: row}"""
+        rows = Application.objects.filter(id__in=application_ids).values(
+            'id', 'job_id', 'match_score', 'applied_at', 'job__title', 'job__employer_id',
+            'job__employer__company_name', 'job__employer__notification_mode',
+            'candidate__user__email', 'candidate__user__first_name', 'candidate__user__last_name',
+            'job__employer__user__email', 'job__employer__user__first_name', 'job__employer__user__last_name',
         )
+        return {
+            row['id']: {
+                'application_id': row['id'],
+                'job_id': row['job_id'],
+                'employer_id': row['job__employer_id'],
+                'notification_mode': row['job__employer__notification_mode'],
+                'candidate_email': row['candidate__user__email'],
+                'candidate_name': EmailService._full_name(
+                    row['candidate__user__first_name'], row['candidate__user__last_name']
+                ) or row['candidate__user__email'],
+                'employer_email': row['job__employer__user__email'],
+                'employer_name': EmailService._full_name(
+                    row['job__employer__user__first_name'], row['job__employer__user__last_name']
+                ) or 'Employer',
+                'company_name': row['job__employer__company_name'] or 'Company',
+                'job_title': row['job__title'],
+                'match_score': row['match_score'],
+                'applied_at': row['applied_at'],
+            }
+            for row in rows
+        }
     
     @staticmethod
-    def send_application_shortlisted(application):
-        """Send email when candidate is shortlisted"""
+    def schedule_row(schedule):
+        """Email row from a loaded InterviewSchedule (select_related the application chain)"""
+        row = EmailService.application_row(schedule.application)
+        row.update({
+            'schedule_id': schedule.id,
+            'interview_date': schedule.interview_date,
+            'duration_minutes': schedule.duration_minutes,
+            'meeting_link': schedule.meeting_link,
+            'meeting_location': schedule.meeting_location,
+        })
+        return row
+    
+    @staticmethod
+    def schedule_rows(schedule_ids):
+        """Email rows for many interview schedules in two queries: {schedule_id: row}"""
+        schedules = list(InterviewSchedule.objects.filter(id__in=schedule_ids).values(
+            'id', 'application_id', 'interview_date', 'duration_minutes', 'meeting_link', 'meeting_location'
+        ))
+        application_rows = EmailService.application_rows({s['application_id'] for s in schedules})
+        
+        rows = {}
+        for schedule in schedules:
+            row = dict(application_rows[schedule['application_id']])
+            row.update({
+                'schedule_id': schedule['id'],
+                'interview_date': schedule['interview_date'],
+                'duration_minutes': schedule['duration_minutes'],
+                'meeting_link': schedule['meeting_link'],
+                'meeting_location': schedule['meeting_location'],
+            })
+            rows[schedule['id']] = row
+        return rows
+    
+    @staticmethod
+    def build_application_submitted(row):
+        """Message for candidate after submitting an application"""
         context = {
-            'candidate_name': application.candidate.user.get_full_name() or application.candidate.user.email,
-            'job_title': application.job.title,
-            'company_name': application.job.employer.company_name or 'Company',
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'company_name': row['company_name'],
+            'applied_date': row['applied_at'].strftime('%B %d, %Y'),
         }
         
-        return EmailService.send_email(
-            recipient=application.candidate.user.email,
-            subject=f'Congratulations! You\'ve been shortlisted - {application.job.title}',
-            template_name='application_shortlisted',
-            context=context
-        )
+        return {
+            'recipient': row['candidate_email'],
+            'subject': f"Application Submitted - {row['job_title']}",
+            'template_name': 'application_submitted',
+            'context': context,
+        }
     
     @staticmethod
-    def send_application_rejected(application):
-        """Send email when application is rejected"""
+    def build_application_shortlisted(row):
+        """Message for candidate after being shortlisted"""
         context = {
-            'candidate_name': application.candidate.user.get_full_name() or application.candidate.user.email,
-            'job_title': application.job.title,
-            'company_name': application.job.employer.company_name or 'Company',
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'company_name': row['company_name'],
         }
         
-        return EmailService.send_email(
-            recipient=application.candidate.user.email,
-            subject=f'Application Update - {application.job.title}',
-            template_name='application_rejected',
-            context=context
-        )
+        return {
+            'recipient': row['candidate_email'],
+            'subject': f"Congratulations! You've been shortlisted - {row['job_title']}",
+            'template_name': 'application_shortlisted',
+            'context': context,
+        }
     
     @staticmethod
-    def send_new_application_to_employer(application):
-        """Notify employer of new application"""
+    def build_application_rejected(row):
+        """Message for candidate after rejection"""
         context = {
-            'employer_name': application.job.employer.user.get_full_name() or 'Employer',
-            'candidate_name': application.candidate.user.get_full_name() or application.candidate.user.email,
-            'job_title': application.job.title,
-            'match_score': application.match_score,
-            'applied_date': application.applied_at.strftime('%B %d, %Y'),
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'company_name': row['company_name'],
         }
         
-        return EmailService.send_email(
-            recipient=application.job.employer.user.email,
-            subject=f'New Application Received - {application.job.title}',
-            template_name='employer_new_application',
-            context=context
-        )
+        return {
+            'recipient': row['candidate_email'],
+            'subject': f"Application Update - {row['job_title']}",
+            'template_name': 'application_rejected',
+            'context': context,
+        }
+    
+    @staticmethod
+    def build_new_application_to_employer(row):
+        """Message for employer about a new application"""
+        context = {
+            'employer_name': row['employer_name'],
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'match_score': row['match_score'],
+            'applied_date': row['applied_at'].strftime('%B %d, %Y'),
+        }
+        
+        return {
+            'recipient': row['employer_email'],
+            'subject': f"New Application Received - {row['job_title']}",
+            'template_name': 'employer_new_application',
+            'context': context,
+        }
+    
+    @staticmethod
+    def build_employer_digest(employer_row, jobs, mode):
+        """Digest message rolling up new applications across an employer's jobs"""
+        total = sum(job['count'] for job in jobs)
+        context = {
+            'employer_name': employer_row['employer_name'],
+            'company_name': employer_row['company_name'],
+            'digest_period': 'hour' if mode == 'hourly' else 'day',
+            'total_applications': total,
+            'jobs': jobs,
+        }
+        
+        return {
+            'recipient': employer_row['employer_email'],
+            'subject': f"{mode.capitalize()} Digest - {total} New Application{'s' if total != 1 else ''}",
+            'template_name': 'employer_digest',
+            'context': context,
+        }
+    
+    @staticmethod
+    def build_interview_reminder(row, reminder_type, recipient):
+        """Interview reminder message for one recipient"""
+        reminder_labels = {
+            '24h': '24 hours',
+            '2h': '2 hours',
+            '30min': '30 minutes'
+        }
+        
+        context = {
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'company_name': row['company_name'],
+            'interview_date': row['interview_date'].strftime('%B %d, %Y at %I:%M %p'),
+            'reminder_time': reminder_labels.get(reminder_type, reminder_type),
+            'meeting_link': row['meeting_link'],
+            'meeting_location': row['meeting_location'],
+        }
+        
+        return {
+            'recipient': recipient,
+            'subject': f"Interview Reminder - {row['job_title']}",
+            'template_name': f'interview_reminder_{reminder_type}',
+            'context': context,
+        }
+    
+    @staticmethod
+    def send_application_submitted(application):
+        """Send email when candidate submits application"""
+        row = EmailService.application_row(application)
+        return EmailService.send_batch([EmailService.build_application_submitted(row)])[0]
+    
+    @staticmethod
+    def send_application_shortlisted(application):
+        """Send email when candidate is shortlisted"""
+        row = EmailService.application_row(application)
+        return EmailService.send_batch([EmailService.build_application_shortlisted(row)])[0]
+    
+    @staticmethod
+    def send_application_rejected(application):
+        """Send email when application is rejected"""
+        row = EmailService.application_row(application)
+        return EmailService.send_batch([EmailService.build_application_rejected(row)])[0]
+    
+    @staticmethod
+    def send_new_application_to_employer(application):
+        """Notify employer of new application"""
+        row = EmailService.application_row(application)
+        return EmailService.send_batch([EmailService.build_new_application_to_employer(row)])[0]
     
     @staticmethod
     def send_interview_scheduled(schedule):
         """Send email when interview is scheduled"""
+        row = EmailService.schedule_row(schedule)
         context = {
-            'candidate_name': schedule.application.candidate.user.get_full_name() or schedule.application.candidate.user.email,
-            'employer_name': schedule.application.job.employer.user.get_full_name() or 'Employer',
-            'job_title': schedule.application.job.title,
-            'interview_date': schedule.interview_date.strftime('%B %d, %Y at %I:%M %p'),
-            'duration': schedule.duration_minutes,
-            'meeting_link': schedule.meeting_link,
-            'meeting_location': schedule.meeting_location,
+            'candidate_name': row['candidate_name'],
+            'employer_name': row['employer_name'],
+            'job_title': row['job_title'],
+            'interview_date': row['interview_date'].strftime('%B %d, %Y at %I:%M %p'),
+            'duration': row['duration_minutes'],
+            'meeting_link': row['meeting_link'],
+            'meeting_location': row['meeting_location'],
         }
         
-        # Send to candidate
-        EmailService.send_email(
-            recipient=schedule.application.candidate.user.email,
-            subject=f'Interview Scheduled - {schedule.application.job.title}',
-            template_name='interview_scheduled',
-            context=context
-        )
-        
-        # Send to employer
-        EmailService.send_email(
-            recipient=schedule.application.job.employer.user.email,
-            subject=f'Interview Scheduled - {schedule.application.job.title}',
-            template_name='interview_scheduled',
-            context=context
-        )
+        # Send to candidate and employer over one connection
+        EmailService.send_batch([
+            {
+                'recipient': recipient,
+                'subject': f"Interview Scheduled - {row['job_title']}",
+                'template_name': 'interview_scheduled',
+                'context': context,
+            }
+            for recipient in (row['candidate_email'], row['employer_email'])
+        ])
     
     @staticmethod
     def send_interview_confirmed(schedule):
         """Send email when interview is confirmed by both parties"""
+        row = EmailService.schedule_row(schedule)
         context = {
-            'candidate_name': schedule.application.candidate.user.get_full_name() or schedule.application.candidate.user.email,
-            'job_title': schedule.application.job.title,
-            'interview_date': schedule.interview_date.strftime('%B %d, %Y at %I:%M %p'),
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'interview_date': row['interview_date'].strftime('%B %d, %Y at %I:%M %p'),
         }
         
         EmailService.send_email(
-            recipient=schedule.application.candidate.user.email,
-            subject=f'Interview Confirmed - {schedule.application.job.title}',
+            recipient=row['candidate_email'],
+            subject=f"Interview Confirmed - {row['job_title']}",
             template_name='interview_confirmed',
             context=context
         )
@@ -181,53 +400,29 @@ class EmailService:
     @staticmethod
     def send_interview_rescheduled(schedule):
         """Send email when interview is rescheduled"""
+        row = EmailService.schedule_row(schedule)
         context = {
-            'candidate_name': schedule.application.candidate.user.get_full_name() or schedule.application.candidate.user.email,
-            'job_title': schedule.application.job.title,
-            'new_date': schedule.interview_date.strftime('%B %d, %Y at %I:%M %p'),
+            'candidate_name': row['candidate_name'],
+            'job_title': row['job_title'],
+            'new_date': row['interview_date'].strftime('%B %d, %Y at %I:%M %p'),
         }
         
-        # Send to candidate
-        EmailService.send_email(
-            recipient=schedule.application.candidate.user.email,
-            subject=f'Interview Rescheduled - {schedule.application.job.title}',
-            template_name='interview_rescheduled',
-            context=context
-        )
-        
-        # Send to employer
-        EmailService.send_email(
-            recipient=schedule.application.job.employer.user.email,
-            subject=f'Interview Rescheduled - {schedule.application.job.title}',
-            template_name='interview_rescheduled',
-            context=context
-        )
+        # Send to candidate and employer over one connection
+        EmailService.send_batch([
+            {
+                'recipient': recipient,
+                'subject': f"Interview Rescheduled - {row['job_title']}",
+                'template_name': 'interview_rescheduled',
+                'context': context,
+            }
+            for recipient in (row['candidate_email'], row['employer_email'])
+        ])
     
     @staticmethod
     def send_interview_reminder(schedule, reminder_type, recipient):
         """Send interview reminder email"""
-        reminder_labels = {
-            '24h': '24 hours',
-            '2h': '2 hours',
-            '30min': '30 minutes'
-        }
-        
-        context = {
-            'candidate_name': schedule.application.candidate.user.get_full_name() or schedule.application.candidate.user.email,
-            'job_title': schedule.application.job.title,
-            'company_name': schedule.application.job.employer.company_name or 'Company',
-            'interview_date': schedule.interview_date.strftime('%B %d, %Y at %I:%M %p'),
-            'reminder_time': reminder_labels.get(reminder_type, reminder_type),
-            'meeting_link': schedule.meeting_link,
-            'meeting_location': schedule.meeting_location,
-        }
-        
-        return EmailService.send_email(
-            recipient=recipient,
-            subject=f'Interview Reminder - {schedule.application.job.title}',
-            template_name=f'interview_reminder_{reminder_type}',
-            context=context
-        )
+        row = EmailService.schedule_row(schedule)
+        return EmailService.send_batch([EmailService.build_interview_reminder(row, reminder_type, recipient)])[0]
     
     @staticmethod
     def get_email_logs(recipient=None, status=None, limit=100):
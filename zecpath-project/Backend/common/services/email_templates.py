@@ -0,0 +1,84 @@
+"""
+Email Template Registry - compiled template cache with render metrics
+"""
+from pathlib import Path
+from django.conf import settings
+from django.template.loader import get_template
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTemplateRegistry:
+    """Process-wide cache of compiled email templates"""
+
+    TEMPLATE_DIR = 'emails'
+
+    _templates = {}
+    _metrics = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, template_name):
+        """Compiled template for emails/<template_name>.html"""
+        template = cls._templates.get(template_name)
+        if template is None:
+            template = get_template(f'{cls.TEMPLATE_DIR}/{template_name}.html')
+            cls._templates[template_name] = template
+        return template
+
+    @classmethod
+    def warm(cls):
+        """Compile every email template up front; called at worker start"""
+        names = set()
+        for engine in settings.TEMPLATES:
+            for directory in engine.get('DIRS', []):
+                names.update(path.stem for path in (Path(directory) / cls.TEMPLATE_DIR).glob('*.html'))
+
+        for name in sorted(names):
+            try:
+                cls.get(name)
+            except Exception as e:
+                logger.error(f"Email template {name} failed to compile: {str(e)}")
+
+        logger.info(f"Warmed {len(cls._templates)} email templates")
+        return sorted(cls._templates)
+
+    @classmethod
+    def render(cls, template_name, context):
+        """Render a cached template and record its render time"""
+        template = cls.get(template_name)
+
+        start = time.perf_counter()
+        html = template.render(context)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with cls._lock:
+            stats = cls._metrics.setdefault(template_name, {'renders': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            stats['renders'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+        return html
+
+    @classmethod
+    def metrics(cls):
+        """Per-template render counts and timings for this process"""
+        with cls._lock:
+            return {
+                name: {
+                    'renders': stats['renders'],
+                    'avg_ms': round(stats['total_ms'] / stats['renders'], 3),
+                    'max_ms': round(stats['max_ms'], 3),
+                }
+                for name, stats in cls._metrics.items()
+            }
+
+    @classmethod
+    def clear(cls):
+        """Drop compiled templates and metrics (e.g. after editing templates)"""
+        with cls._lock:
+            cls._templates.clear()
+            cls._metrics.clear()
@@ -0,0 +1,174 @@
+"""
+Interview Buffer - in-memory interview state flushed to the database at checkpoints
+"""
+from django.db import transaction
+from core.ai_call_models import AIInterviewSession, AIConversationTurn, AICallTranscript
+from core.question_models import InterviewState
+import copy
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InterviewBuffer:
+    """
+    Holds the session, question state, pending turns and counters for one
+    running interview. The question loop only touches memory; checkpoint()
+    writes buffered turns in one bulk_create plus one UPDATE each for the
+    session and state, so a retried call resumes from the last checkpoint.
+    """
+
+    CHECKPOINT_EVERY = 5  # turns
+
+    def __init__(self, session, state, last_turn_number=0):
+        self.session = session
+        self.state = state
+        self.turns = []          # Turns already in the database (loaded on resume)
+        self.pending_turns = []  # Turns not yet flushed
+        self.last_turn_number = last_turn_number
+
+    @classmethod
+    def open(cls, call_queue, job):
+        """Start a new interview or resume the one a previous attempt checkpointed"""
+        session = AIInterviewSession.objects.filter(call_queue=call_queue).select_related('state').first()
+
+        if session is None:
+            with transaction.atomic():
+                session = AIInterviewSession.objects.create(
+                    call_queue=call_queue,
+                    session_id=f"AI-{call_queue.id}-{uuid.uuid4().hex[:8]}"
+                )
+                state = InterviewState.objects.create(
+                    session=session,
+                    current_question_index=0,
+                    context={'job_id': job.id, 'answers': {}}
+                )
+            return cls(session, state)
+
+        session.call_queue = call_queue
+        state = getattr(session, 'state', None) or InterviewState.objects.create(
+            session=session, current_question_index=0, context={'job_id': job.id, 'answers': {}}
+        )
+        buffer = cls(session, state)
+        buffer.turns = list(session.turns.order_by('turn_number'))
+        buffer.last_turn_number = buffer.turns[-1].turn_number if buffer.turns else 0
+        logger.info(f"Resuming session {session.session_id} after turn {buffer.last_turn_number}")
+        return buffer
+
+    @property
+    def next_turn_number(self):
+        return self.last_turn_number + 1
+
+    @property
+    def last_answer(self):
+        """Answer to the last recorded turn, for resuming the question flow"""
+        all_turns = self.turns + self.pending_turns
+        return all_turns[-1].answer_text if all_turns else None
+
+    def add_turn(self, question, answer="", duration=None, category="", follow_up=False, scores=None,
+                 auto_checkpoint=True):
+        """
+        Score and buffer a turn; flushes every CHECKPOINT_EVERY turns, so
+        advance the question state before adding the turn that answers it.
+        Pass precomputed scores to keep evaluation off the caller's thread.
+        """
+        from common.services.ai_conversation_service import AIConversationService
+
+        if scores is None:
+            scores = AIConversationService.score_answer(question, answer, category)
+        turn = AIConversationTurn(
+            session=self.session,
+            turn_number=self.next_turn_number,
+            question_text=question,
+            answer_text=answer,
+            duration_seconds=duration,
+            category=category,
+            follow_up_triggered=follow_up,
+            **scores
+        )
+        self.pending_turns.append(turn)
+        self.last_turn_number = turn.turn_number
+
+        self.session.total_questions += 1
+        if answer:
+            self.session.total_answers += 1
+
+        if auto_checkpoint and self.checkpoint_due:
+            self.checkpoint()
+        return turn
+
+    @property
+    def checkpoint_due(self):
+        return len(self.pending_turns) >= self.CHECKPOINT_EVERY
+
+    def state_values(self):
+        """Copy of the persisted InterviewState fields as they are now"""
+        return {
+            'current_question_index': self.state.current_question_index,
+            'context': copy.deepcopy(self.state.context),
+            'completed_categories': list(self.state.completed_categories),
+        }
+
+    def snapshot(self, state_values=None):
+        """
+        Detach the pending turns together with the counters and state they
+        belong to; flush() can then write them from another thread while
+        the interview moves on.
+        """
+        turns, self.pending_turns = self.pending_turns, []
+        return {
+            'turns': turns,
+            'total_questions': self.session.total_questions,
+            'total_answers': self.session.total_answers,
+            'state': state_values or self.state_values(),
+        }
+
+    def flush(self, snapshot, **session_fields):
+        """Write a snapshot: one bulk_create of turns plus one UPDATE each for session and state"""
+        with transaction.atomic():
+            if snapshot['turns']:
+                AIConversationTurn.objects.bulk_create(snapshot['turns'])
+            AIInterviewSession.objects.filter(pk=self.session.pk).update(
+                total_questions=snapshot['total_questions'],
+                total_answers=snapshot['total_answers'],
+                **session_fields
+            )
+            InterviewState.objects.filter(pk=self.state.pk).update(**snapshot['state'])
+
+        self.turns.extend(snapshot['turns'])
+
+    def checkpoint(self, **session_fields):
+        """Write pending turns, session counters and question state"""
+        for field, value in session_fields.items():
+            setattr(self.session, field, value)
+        self.flush(self.snapshot(), **session_fields)
+
+    def finish(self, confidence=None, audio_url="", **session_fields):
+        """Final flush: transcript and scores go out with the last turns"""
+        from common.services.interview_scorer import InterviewScorer
+
+        all_turns = self.turns + self.pending_turns
+        transcript_text = "\n".join([f"Q: {t.question_text}\nA: {t.answer_text}" for t in all_turns])
+        transcript_json = {
+            "turns": [{"q": t.question_text, "a": t.answer_text, "category": t.category} for t in all_turns]
+        }
+        overall_score, category_scores = InterviewScorer.score_turns(all_turns)
+
+        self.checkpoint(
+            full_transcript_text=transcript_text,
+            transcript_json=transcript_json,
+            overall_score=overall_score,
+            category_scores=category_scores,
+            **session_fields
+        )
+        AICallTranscript.objects.update_or_create(
+            session=self.session,
+            defaults={
+                'raw_audio_url': audio_url,
+                'transcript_text': transcript_text,
+                'transcript_json': transcript_json,
+                'confidence_score': confidence,
+            }
+        )
+        return {'overall_score': overall_score, 'category_scores': category_scores, 'turns': len(all_turns)}
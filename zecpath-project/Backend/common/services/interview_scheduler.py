@@ -117,6 +117,7 @@ class InterviewScheduler:
     def schedule_interview(application, interview_date=None, auto_schedule=True):
         """Schedule interview automatically or manually"""
         from core.interview_models import InterviewSchedule
+        from common.services.reminder_service import ReminderService
         
         if auto_schedule and not interview_date:
             # Find first available slot
@@ -144,12 +145,15 @@ class InterviewScheduler:
         application.status = 'interview_scheduled'
         application.save()
         
+        ReminderService.create_reminders_for_schedules([schedule])
+        
         return schedule, None
     
     @staticmethod
     def reschedule_interview(schedule, new_date):
         """Reschedule existing interview"""
         from core.interview_models import InterviewSchedule
+        from common.services.reminder_service import ReminderService
         
         if not schedule.can_reschedule():
             return None, "Maximum reschedule limit reached"
@@ -178,6 +182,10 @@ class InterviewScheduler:
         schedule.status = 'rescheduled'
         schedule.save()
         
+        # Move reminders from the old schedule to the new one
+        ReminderService.cancel_reminders_for_schedules([schedule.id], reason='Interview rescheduled')
+        ReminderService.create_reminders_for_schedules([new_schedule])
+        
         return new_schedule, None
     
     @staticmethod
@@ -198,6 +206,9 @@ class InterviewScheduler:
     @staticmethod
     def decline_interview(schedule, user_role):
         """Decline interview"""
+        from common.services.reminder_service import ReminderService
+        
         schedule.status = 'declined'
         schedule.save()
+        ReminderService.cancel_reminders_for_schedules([schedule.id], reason='Interview declined')
         return schedule
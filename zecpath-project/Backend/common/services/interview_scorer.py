@@ -29,11 +29,7 @@ class InterviewScorer:
         if not turns.exists():
             return None, 'No answers found'
         
-        # Aggregate by category
-        category_scores = InterviewScorer._aggregate_category_scores(turns)
-        
-        # Calculate weighted final score
-        overall_score = InterviewScorer._apply_weights(category_scores)
+        overall_score, category_scores = InterviewScorer.score_turns(turns)
         
         # Update session
         session.overall_score = overall_score
@@ -48,6 +44,12 @@ class InterviewScorer:
             'answered_questions': turns.filter(answer_text__isnull=False).exclude(answer_text='').count()
         }, None
     
+    @staticmethod
+    def score_turns(turns):
+        """Overall and per-category scores for any iterable of turns (saved or not)"""
+        category_scores = InterviewScorer._aggregate_category_scores(turns)
+        return InterviewScorer._apply_weights(category_scores), category_scores
+    
     @staticmethod
     def _aggregate_category_scores(turns):
         """Aggregate scores by category"""
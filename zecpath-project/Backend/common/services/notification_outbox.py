@@ -0,0 +1,134 @@
+"""
+Notification Outbox Service - transactional outbox for application emails
+"""
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.notification_models import NotificationOutbox
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationOutboxService:
+    """Write application email events with the change, deliver them after commit"""
+
+    BATCH_SIZE = 100
+    STALE_AFTER = timedelta(minutes=10)  # Reclaim rows from crashed workers
+    RETRY_BASE_SECONDS = 60
+
+    # Outbox event -> EmailService message builder
+    EVENT_MESSAGES = {
+        'application_submitted': 'build_application_submitted',
+        'employer_new_application': 'build_new_application_to_employer',
+        'application_shortlisted': 'build_application_shortlisted',
+        'application_rejected': 'build_application_rejected',
+    }
+
+    @staticmethod
+    def enqueue(application, events):
+        """Record events for an application; duplicates of (application, event) are ignored"""
+        NotificationOutbox.objects.bulk_create(
+            [NotificationOutbox(application=application, event=event) for event in events],
+            ignore_conflicts=True
+        )
+        transaction.on_commit(NotificationOutboxService._schedule_dispatch)
+
+    @staticmethod
+    def _schedule_dispatch():
+        """Kick the dispatcher once the outbox rows are committed"""
+        from common.tasks_notifications import dispatch_notification_outbox
+        try:
+            dispatch_notification_outbox.delay()
+        except Exception as e:
+            # The periodic sweep picks the rows up if the broker is unavailable
+            logger.warning(f"Could not queue outbox dispatch: {str(e)}")
+
+    @staticmethod
+    def claim_batch(batch_size=BATCH_SIZE):
+        """Claim due outbox rows for this worker; returns claimed ids"""
+        now = timezone.now()
+
+        with transaction.atomic():
+            ids = list(
+                NotificationOutbox.objects.select_for_update(skip_locked=True).filter(
+                    Q(status='pending', available_at__lte=now) |
+                    Q(status='processing', claimed_at__lt=now - NotificationOutboxService.STALE_AFTER)
+                ).order_by('available_at').values_list('id', flat=True)[:batch_size]
+            )
+            if ids:
+                NotificationOutbox.objects.filter(id__in=ids).update(
+                    status='processing',
+                    claimed_at=now,
+                    attempts=F('attempts') + 1
+                )
+
+        return ids
+
+    @staticmethod
+    def deliver(entry_ids):
+        """Send emails for claimed rows in one batch and record the outcome in bulk"""
+        from common.services.email_service import EmailService
+
+        entries = list(NotificationOutbox.objects.filter(id__in=entry_ids, status='processing'))
+        rows = EmailService.application_rows({entry.application_id for entry in entries})
+
+        results = {'sent': 0, 'failed': 0, 'retrying': 0, 'digested': 0}
+        now = timezone.now()
+
+        # Employers on hourly/daily digests get a rollup instead of one email per application
+        digested = [
+            entry for entry in entries
+            if entry.event == 'employer_new_application'
+            and entry.application_id in rows
+            and rows[entry.application_id]['notification_mode'] != 'immediate'
+        ]
+        if digested:
+            from common.services.digest_service import EmployerDigestService
+            EmployerDigestService.record([rows[entry.application_id] for entry in digested])
+            for entry in digested:
+                entry.status = 'digested'
+                entry.processed_at = now
+            results['digested'] = len(digested)
+            entries = [entry for entry in entries if entry.status != 'digested']
+
+        # Build every message first so the batch goes out over one SMTP connection;
+        # the outbox owns retries, so EmailService must not queue its own
+        messages, outcomes = [], {}
+        for entry in entries:
+            builder = getattr(EmailService, NotificationOutboxService.EVENT_MESSAGES[entry.event])
+            try:
+                messages.append((entry.id, builder(rows[entry.application_id])))
+            except Exception as e:
+                outcomes[entry.id] = (False, str(e))
+
+        send_results = EmailService.send_batch([message for _, message in messages], retry=False)
+        outcomes.update(zip([entry_id for entry_id, _ in messages], send_results))
+
+        for entry in entries:
+            success, error = outcomes[entry.id]
+
+            if success:
+                entry.status = 'sent'
+                entry.processed_at = now
+                entry.error_message = ''
+                results['sent'] += 1
+            elif entry.attempts < entry.max_attempts:
+                entry.status = 'pending'
+                entry.error_message = error or ''
+                entry.available_at = now + timedelta(
+                    seconds=NotificationOutboxService.RETRY_BASE_SECONDS * (2 ** entry.attempts)
+                )
+                results['retrying'] += 1
+            else:
+                entry.status = 'failed'
+                entry.processed_at = now
+                entry.error_message = error or ''
+                results['failed'] += 1
+                logger.error(f"Outbox delivery failed: {entry} - {error}")
+
+        NotificationOutbox.objects.bulk_update(
+            entries + digested, ['status', 'processed_at', 'error_message', 'available_at']
+        )
+        return results
@@ -0,0 +1,134 @@
+"""
+Log Partition Service - PostgreSQL monthly range partitions for log tables
+"""
+from datetime import date
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionService:
+    """
+    Keeps append-only log tables partitioned by month so recent-range
+    queries only scan hot partitions and retention is a DETACH/DROP of
+    whole months instead of row DELETEs.
+    """
+
+    DEFAULT_MONTHS_AHEAD = 3
+    PARTITION_RE = r'^{table}_p(\d{{4}})_(\d{{2}})$'
+
+    @staticmethod
+    def partition_name(table, month):
+        return f"{table}_p{month.year}_{month.month:02d}"
+
+    @staticmethod
+    def month_start(value):
+        return date(value.year, value.month, 1)
+
+    @staticmethod
+    def add_months(month, count):
+        index = month.year * 12 + month.month - 1 + count
+        return date(index // 12, index % 12 + 1, 1)
+
+    @staticmethod
+    def is_partitioned(table, using=None):
+        """True if the table is a PostgreSQL partitioned (parent) table"""
+        conn = using or connection
+        if conn.vendor != 'postgresql':
+            return False
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+                [table]
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def list_partitions(table, using=None):
+        """Attached monthly partitions as {month_start: partition_name}"""
+        conn = using or connection
+        pattern = re.compile(PartitionService.PARTITION_RE.format(table=re.escape(table)))
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+                [table]
+            )
+            partitions = {}
+            for (name,) in cursor.fetchall():
+                match = pattern.match(name)
+                if match:
+                    partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+            return partitions
+
+    @staticmethod
+    def create_partition(table, month, using=None):
+        """Create the partition covering [month, next month) if it is missing"""
+        conn = using or connection
+        qn = conn.ops.quote_name
+        name = PartitionService.partition_name(table, month)
+        upper = PartitionService.add_months(month, 1)
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        return name
+
+    @staticmethod
+    def ensure_partitions(table, months_ahead=DEFAULT_MONTHS_AHEAD, using=None):
+        """Pre-create partitions from the current month through months_ahead"""
+        current = PartitionService.month_start(timezone.now())
+        existing = PartitionService.list_partitions(table, using)
+        created = []
+        for offset in range(months_ahead + 1):
+            month = PartitionService.add_months(current, offset)
+            if month not in existing:
+                created.append(PartitionService.create_partition(table, month, using))
+        return created
+
+    @staticmethod
+    def expire_partitions(table, retain_months, action='drop', using=None):
+        """Detach (and optionally drop) partitions entirely older than the retention window"""
+        conn = using or connection
+        qn = conn.ops.quote_name
+        cutoff = PartitionService.add_months(PartitionService.month_start(timezone.now()), -retain_months)
+        expired = []
+        for month, name in sorted(PartitionService.list_partitions(table, using).items()):
+            if PartitionService.add_months(month, 1) > cutoff:
+                continue
+            with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                if action == 'drop':
+                    cursor.execute(f"DROP TABLE {qn(name)}")
+            expired.append(name)
+        return expired
+
+    @staticmethod
+    def maintain():
+        """Apply settings.LOG_PARTITIONS: create upcoming months, expire old ones"""
+        results = {}
+        for label, policy in getattr(settings, 'LOG_PARTITIONS', {}).items():
+            table = apps.get_model(label)._meta.db_table
+            if not PartitionService.is_partitioned(table):
+                continue
+            try:
+                created = PartitionService.ensure_partitions(
+                    table, policy.get('months_ahead', PartitionService.DEFAULT_MONTHS_AHEAD)
+                )
+                expired = PartitionService.expire_partitions(
+                    table, policy['retain_months'], policy.get('expired_action', 'drop')
+                )
+                results[label] = {'created': created, 'expired': expired}
+            except Exception as e:
+                logger.error(f"Partition maintenance failed for {label}: {str(e)}")
+                results[label] = {'error': str(e)}
+        return results
@@ -0,0 +1,148 @@
+"""
+Interview Question Cache - generated questions reused across candidates and precomputed per job
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from core.question_models import GeneratedQuestionSet
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionCacheService:
+    """
+    The question prompt depends only on (job title, skills, count), so one
+    completion serves every candidate for the job. Misses are filled in the
+    background and the caller gets the fallback questions meanwhile; a lock
+    in the 'shared' cache (Redis) lets only one worker generate a given prompt.
+    """
+
+    DEFAULT_TTL = timedelta(days=7)
+    LOCK_TIMEOUT = 120  # seconds; longer than the LLM read timeout
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, 'INTERVIEW_QUESTION_CACHE_TTL', QuestionCacheService.DEFAULT_TTL)
+
+    @staticmethod
+    def _claim(key):
+        """Take a shared marker; without the shared cache every caller goes ahead"""
+        try:
+            return caches['shared'].add(key, 1, QuestionCacheService.LOCK_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable, no single-flight for {key}: {str(e)}")
+            return True
+
+    @staticmethod
+    def _release(*keys):
+        try:
+            caches['shared'].delete_many(keys)
+        except Exception as e:
+            logger.warning(f"Could not release {keys}: {str(e)}")
+
+    @staticmethod
+    def normalize(job_title, skills):
+        """Case/whitespace-insensitive title and a sorted, de-duplicated skill list"""
+        if isinstance(skills, str):
+            skills = skills.split(',')
+        title = ' '.join(str(job_title or '').lower().split())
+        return title, sorted({' '.join(str(s).lower().split()) for s in skills or [] if str(s).strip()})
+
+    @staticmethod
+    def prompt_key(job_title, skills, num_questions=3, model=None):
+        title, skills = QuestionCacheService.normalize(job_title, skills)
+        payload = json.dumps([title, skills, num_questions, model or settings.OPENAI_MODEL])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def get(job_title, skills, num_questions=3):
+        """Cached questions, or None on a miss or expired entry"""
+        row = GeneratedQuestionSet.objects.filter(
+            prompt_key=QuestionCacheService.prompt_key(job_title, skills, num_questions),
+            expires_at__gt=timezone.now()
+        ).values_list('questions', flat=True).first()
+        return row
+
+    @staticmethod
+    def get_or_schedule(job_title, skills, num_questions=3):
+        """Return (questions, status) without waiting on the LLM; status is 'cached' or 'pending'"""
+        from common.services.ai_bridge_service import LLMService
+
+        questions = QuestionCacheService.get(job_title, skills, num_questions)
+        if questions:
+            return questions, 'cached'
+
+        QuestionCacheService.schedule(job_title, skills, num_questions)
+        return LLMService._fallback_questions(job_title), 'pending'
+
+    @staticmethod
+    def schedule(job_title, skills, num_questions=3):
+        """Queue background generation once per prompt, however many callers miss at the same time"""
+        from common.tasks_ai_calls import generate_interview_questions_task
+
+        key = QuestionCacheService.prompt_key(job_title, skills, num_questions)
+        scheduled_key = f'question_cache:scheduled:{key}'
+        if not QuestionCacheService._claim(scheduled_key):
+            return False
+        title, skills = QuestionCacheService.normalize(job_title, skills)
+        try:
+            generate_interview_questions_task.delay(title, skills, num_questions)
+        except Exception as e:
+            # Broker down: callers keep getting the fallback; the next miss tries again
+            logger.error(f"Could not queue question generation for '{title}': {str(e)}")
+            QuestionCacheService._release(scheduled_key)
+            return False
+        return True
+
+    @staticmethod
+    def generate(job_title, skills, num_questions=3, force=False):
+        """
+        Generate and store questions under a single-flight lock; returns the
+        questions, or None if another worker holds the lock or the LLM failed.
+        """
+        from common.services.ai_bridge_service import LLMService
+
+        model = settings.OPENAI_MODEL
+        key = QuestionCacheService.prompt_key(job_title, skills, num_questions, model)
+        lock_key = f'question_cache:lock:{key}'
+        if not QuestionCacheService._claim(lock_key):
+            return None
+
+        try:
+            if not force:
+                questions = QuestionCacheService.get(job_title, skills, num_questions)
+                if questions:
+                    return questions
+
+            questions, error = LLMService.generate_interview_questions(job_title, skills, num_questions)
+            if error:
+                # Fallback questions are not cached
+                logger.warning(f"Question generation failed for '{job_title}': {error}")
+                return None
+
+            title, normalized_skills = QuestionCacheService.normalize(job_title, skills)
+            GeneratedQuestionSet.objects.update_or_create(
+                prompt_key=key,
+                defaults={
+                    'model': model,
+                    'job_title': title,
+                    'skills': normalized_skills,
+                    'num_questions': num_questions,
+                    'questions': questions,
+                    'expires_at': timezone.now() + QuestionCacheService.ttl(),
+                }
+            )
+            return questions
+        finally:
+            QuestionCacheService._release(lock_key, f'question_cache:scheduled:{key}')
+
+    @staticmethod
+    def warm_job(job):
+        """Precompute questions for a published job (no-op when already cached)"""
+        if job.status != 'published':
+            return False
+        return QuestionCacheService.schedule(job.title, job.skills)
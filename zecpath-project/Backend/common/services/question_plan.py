@@ -0,0 +1,189 @@
+"""
+Question Plan - compiled, cached per-job interview question sequence
+"""
+from collections import namedtuple
+from django.core.cache import caches
+from django.db import transaction
+import re
+import threading
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\s*(?:years?|yrs?)')
+
+PlannedQuestion = namedtuple('PlannedQuestion', [
+    'template_id', 'text', 'category', 'min_experience', 'required_skill', 'follow_up_keywords'
+])
+
+
+class QuestionPlan:
+    """
+    Immutable ordered questions for one job with conditions and follow-up
+    triggers pre-parsed. next_question() is a pure in-memory step over an
+    InterviewState; the caller persists the state.
+    """
+
+    def __init__(self, job_id, questions, version):
+        self.job_id = job_id
+        self.questions = tuple(questions)
+        self.version = version
+
+    def __len__(self):
+        return len(self.questions)
+
+    @classmethod
+    def compile(cls, job_id, version=None):
+        """Build a plan from the job's QuestionFlow, or the default templates if it has none"""
+        from core.question_models import QuestionFlow
+        from employers.models import Job
+        from common.services.question_engine_service import QuestionEngineService
+
+        templates = [
+            flow.template for flow in
+            QuestionFlow.objects.filter(job_id=job_id).select_related('template').order_by('order')
+        ]
+        if not templates:
+            job = Job.objects.only('id', 'title').get(id=job_id)
+            templates = QuestionEngineService._default_templates(job)
+
+        return cls(job_id, [cls._compile_template(t) for t in templates], version)
+
+    @staticmethod
+    def _compile_template(template):
+        condition = template.condition or {}
+        trigger = template.follow_up_trigger or {}
+        skill = condition.get('requires_skill')
+        return PlannedQuestion(
+            template_id=template.id,
+            text=template.question_text,
+            category=template.category,
+            min_experience=condition.get('min_experience'),
+            required_skill=skill.lower() if skill else None,
+            # (lowercased for matching, as written for the prompt), in trigger order
+            follow_up_keywords=tuple((kw.lower(), kw) for kw in trigger.get('keywords', []))
+        )
+
+    def next_question(self, state, previous_answer=None):
+        """Same contract as QuestionEngineService.get_next_question: (text, category) or (None, 'completed')"""
+        if previous_answer:
+            state.context['answers'][state.current_question_index] = previous_answer
+
+        while state.current_question_index < len(self.questions):
+            question = self.questions[state.current_question_index]
+
+            if not self._conditions_met(question, state.context.get('answers', {})):
+                # Skipped questions don't carry the answer on to follow-up matching
+                state.current_question_index += 1
+                previous_answer = None
+                continue
+
+            follow_up = self._follow_up(question, previous_answer)
+            if follow_up:
+                return follow_up, question.category
+
+            if question.category not in state.completed_categories:
+                state.completed_categories.append(question.category)
+            return question.text, question.category
+
+        return None, 'completed'
+
+    @staticmethod
+    def _conditions_met(question, answers):
+        if question.min_experience is not None:
+            if QuestionPlan.extract_experience(answers) < question.min_experience:
+                return False
+        if question.required_skill:
+            if not any(question.required_skill in str(ans).lower() for ans in answers.values()):
+                return False
+        return True
+
+    @staticmethod
+    def _follow_up(question, answer):
+        if not question.follow_up_keywords or not answer:
+            return None
+        answer_lower = answer.lower()
+        for keyword_lower, keyword in question.follow_up_keywords:
+            if keyword_lower in answer_lower:
+                return f"You mentioned {keyword}. Can you tell me more about your experience with it?"
+        return None
+
+    @staticmethod
+    def extract_experience(answers):
+        """Years of experience from the first answer that states them"""
+        for answer in answers.values():
+            match = EXPERIENCE_PATTERN.search(str(answer).lower())
+            if match:
+                return int(match.group(1))
+        return 0
+
+
+class QuestionPlanCache:
+    """
+    Per-process plans, validated against version tokens in the 'shared'
+    cache (Redis, seen by web and worker processes alike). Editing a job's
+    flow replaces that job's token and editing any template replaces the
+    template token, so every process recompiles on next use. Tokens are
+    random (not counters) so an evicted key can never match a stale plan;
+    if the shared cache is unreachable every get() recompiles.
+    """
+
+    TEMPLATES_KEY = 'question_plan:version:templates'
+
+    _plans = {}  # job_id -> QuestionPlan
+    _lock = threading.Lock()
+
+    @staticmethod
+    def job_key(job_id):
+        return f'question_plan:version:job:{job_id}'
+
+    @staticmethod
+    def version(job_id):
+        keys = [QuestionPlanCache.TEMPLATES_KEY, QuestionPlanCache.job_key(job_id)]
+        try:
+            shared = caches['shared']
+            tokens = shared.get_many(keys)
+            for key in keys:
+                if key not in tokens:
+                    shared.add(key, uuid.uuid4().hex, None)
+                    tokens[key] = shared.get(key)
+        except Exception as e:
+            # A version nothing else can have: never serve a possibly stale plan
+            logger.warning(f"Shared cache unavailable, recompiling question plan: {str(e)}")
+            return (uuid.uuid4().hex,)
+        return tuple(tokens[key] for key in keys)
+
+    @staticmethod
+    def get(job_id):
+        """Compiled plan for the job, recompiled only when its version changed"""
+        version = QuestionPlanCache.version(job_id)
+        plan = QuestionPlanCache._plans.get(job_id)
+        if plan is not None and plan.version == version:
+            return plan
+
+        plan = QuestionPlan.compile(job_id, version)
+        with QuestionPlanCache._lock:
+            QuestionPlanCache._plans[job_id] = plan
+        logger.info(f"Compiled question plan for job {job_id} ({len(plan)} questions)")
+        return plan
+
+    @staticmethod
+    def invalidate(job_id=None):
+        """Replace the job's token (or the template token when job_id is None) after commit"""
+        key = QuestionPlanCache.job_key(job_id) if job_id is not None else QuestionPlanCache.TEMPLATES_KEY
+        # After commit, so no process can recompile from the old rows under the new token
+        transaction.on_commit(lambda: QuestionPlanCache._replace_token(key))
+
+    @staticmethod
+    def _replace_token(key):
+        try:
+            caches['shared'].set(key, uuid.uuid4().hex, None)
+        except Exception as e:
+            logger.error(f"Could not invalidate question plans ({key}): {str(e)}")
+
+    @staticmethod
+    def clear():
+        """Drop this process's compiled plans (tests)"""
+        with QuestionPlanCache._lock:
+            QuestionPlanCache._plans.clear()
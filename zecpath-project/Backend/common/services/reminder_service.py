@@ -1,10 +1,12 @@
 """
 Interview Reminder Service
 """
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
-from core.interview_models import InterviewSchedule
 from core.reminder_models import InterviewReminder
+from common.utils.delayed_queue import get_delayed_queue
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,25 +21,105 @@ class ReminderService:
         '30min': timedelta(minutes=30),
     }
     
+    BATCH_SIZE = 50
+    STALE_AFTER = timedelta(minutes=10)  # Reclaim reminders from crashed workers
+    RETRY_BASE_SECONDS = 60
+    ACTIVE_SCHEDULE_STATUSES = ['pending', 'confirmed']
+    
+    QUEUE_NAME = 'interview_reminders'
+    QUEUE_HORIZON = timedelta(hours=1)  # Sweep re-adds reminders due within this window
+    
     @staticmethod
     def create_reminders_for_interview(schedule):
         """Create all reminder stages for an interview"""
-        reminders_created = []
-        
-        for reminder_type, time_delta in ReminderService.REMINDER_STAGES.items():
-            scheduled_at = schedule.interview_date - time_delta
-            
+        return ReminderService.create_reminders_for_schedules([schedule]).get(schedule.id, [])
+    
+    @staticmethod
+    def create_reminders_for_schedules(schedules):
+        """
+        Create every future reminder stage for many interviews in one INSERT;
+        existing (schedule, reminder_type) rows are left alone.
+        Returns {schedule_id: [pending reminder types]}
+        """
+        now = timezone.now()
+        reminders = [
+            InterviewReminder(
+                schedule_id=schedule.id,
+                reminder_type=reminder_type,
+                scheduled_at=schedule.interview_date - time_delta
+            )
+            for schedule in schedules
+            for reminder_type, time_delta in ReminderService.REMINDER_STAGES.items()
             # Only create if scheduled time is in future
-            if scheduled_at > timezone.now():
-                reminder, created = InterviewReminder.objects.get_or_create(
-                    schedule=schedule,
-                    reminder_type=reminder_type,
-                    defaults={'scheduled_at': scheduled_at}
-                )
-                if created:
-                    reminders_created.append(reminder_type)
+            if schedule.interview_date - time_delta > now
+        ]
+        if not reminders:
+            return {}
         
-        return reminders_created
+        InterviewReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+        
+        # ignore_conflicts leaves pks unset, so read back what is pending
+        pending = list(InterviewReminder.objects.filter(
+            schedule_id__in={schedule.id for schedule in schedules},
+            status='pending'
+        ).only('id', 'schedule_id', 'reminder_type', 'scheduled_at'))
+        
+        # Fire at scheduled_at via the delayed queue once the rows are committed
+        transaction.on_commit(lambda: ReminderService.enqueue_reminders(pending))
+        
+        reminder_types = {}
+        for reminder in pending:
+            reminder_types.setdefault(reminder.schedule_id, []).append(reminder.reminder_type)
+        return reminder_types
+    
+    @staticmethod
+    def cancel_reminders_for_schedules(schedule_ids, reason='Interview cancelled'):
+        """Cancel pending reminders for many interviews in one UPDATE; returns the count"""
+        reminder_ids = list(InterviewReminder.objects.filter(
+            schedule_id__in=schedule_ids, status='pending'
+        ).values_list('id', flat=True))
+        if not reminder_ids:
+            return 0
+        
+        cancelled = InterviewReminder.objects.filter(id__in=reminder_ids, status='pending').update(
+            status='failed', error_message=reason
+        )
+        ReminderService.dequeue_reminders(reminder_ids)
+        return cancelled
+    
+    @staticmethod
+    def queue():
+        return get_delayed_queue(ReminderService.QUEUE_NAME)
+    
+    @staticmethod
+    def enqueue_reminders(reminders):
+        """Add reminders to the delayed queue; the reconciliation sweep covers failures"""
+        try:
+            queue = ReminderService.queue()
+            for reminder in reminders:
+                queue.add(reminder.id, reminder.scheduled_at)
+        except Exception as e:
+            logger.warning(f"Could not queue reminders: {str(e)}")
+    
+    @staticmethod
+    def dequeue_reminders(reminder_ids):
+        """Drop reminders from the delayed queue (cancel/re-time)"""
+        try:
+            ReminderService.queue().remove(reminder_ids)
+        except Exception as e:
+            # Popped reminders are re-checked when claimed, so a stale entry is harmless
+            logger.warning(f"Could not dequeue reminders: {str(e)}")
+    
+    @staticmethod
+    def enqueue_upcoming(horizon=QUEUE_HORIZON):
+        """Re-add pending reminders due soon; repairs a flushed or missed queue"""
+        upcoming = list(InterviewReminder.objects.filter(
+            status='pending',
+            scheduled_at__lte=timezone.now() + horizon,
+            schedule__status__in=ReminderService.ACTIVE_SCHEDULE_STATUSES
+        ).only('id', 'scheduled_at'))
+        ReminderService.enqueue_reminders(upcoming)
+        return len(upcoming)
     
     @staticmethod
     def get_pending_reminders():
@@ -47,9 +129,126 @@ class ReminderService:
         return InterviewReminder.objects.filter(
             status='pending',
             scheduled_at__lte=now,
-            schedule__status__in=['pending', 'confirmed']
+            schedule__status__in=ReminderService.ACTIVE_SCHEDULE_STATUSES
         ).select_related('schedule__application__candidate__user', 'schedule__application__job')
     
+    @staticmethod
+    def claim_due_reminders(batch_size=BATCH_SIZE):
+        """Atomically move due reminders to 'sending' for this worker; returns claimed ids"""
+        now = timezone.now()
+        
+        with transaction.atomic():
+            ids = list(
+                InterviewReminder.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    Q(status='pending', scheduled_at__lte=now) |
+                    Q(status='sending', claimed_at__lt=now - ReminderService.STALE_AFTER),
+                    schedule__status__in=ReminderService.ACTIVE_SCHEDULE_STATUSES
+                ).order_by('scheduled_at').values_list('id', flat=True)[:batch_size]
+            )
+            if ids:
+                InterviewReminder.objects.filter(id__in=ids).update(status='sending', claimed_at=now)
+        
+        return ids
+    
+    @staticmethod
+    def claim_queued(limit=BATCH_SIZE):
+        """Pop due reminders from the delayed queue and claim the ones still pending and due"""
+        reminder_ids = ReminderService.queue().pop_due(limit=limit)
+        if not reminder_ids:
+            return []
+        
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                InterviewReminder.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    id__in=reminder_ids,
+                    status='pending',
+                    scheduled_at__lte=now,
+                    schedule__status__in=ReminderService.ACTIVE_SCHEDULE_STATUSES
+                ).values_list('id', flat=True)
+            )
+            if ids:
+                InterviewReminder.objects.filter(id__in=ids).update(status='sending', claimed_at=now)
+        
+        # A stale entry for a re-timed reminder: put it back at its current time
+        ReminderService.enqueue_reminders(InterviewReminder.objects.filter(
+            id__in=set(reminder_ids) - set(ids), status='pending', scheduled_at__gt=now
+        ).only('id', 'scheduled_at'))
+        
+        return ids
+    
+    @staticmethod
+    def claim_reminder(reminder_id):
+        """Claim a single pending reminder; False if another worker already has it"""
+        return InterviewReminder.objects.filter(id=reminder_id, status='pending').update(
+            status='sending', claimed_at=timezone.now()
+        ) == 1
+    
+    @staticmethod
+    def release_claims(reminder_ids):
+        """Return claimed reminders to the queue (e.g. the batch could not be queued)"""
+        InterviewReminder.objects.filter(id__in=reminder_ids, status='sending').update(
+            status='pending', claimed_at=None
+        )
+        ReminderService.enqueue_reminders(
+            InterviewReminder.objects.filter(id__in=reminder_ids, status='pending').only('id', 'scheduled_at')
+        )
+    
+    @staticmethod
+    def send_claimed(reminder_ids):
+        """
+        Send candidate and employer emails for claimed reminders over one SMTP
+        connection and record the outcome in bulk. Individual email failures
+        are retried by EmailService, so the reminder itself is not resent.
+        """
+        from common.services.email_service import EmailService
+        
+        reminders = list(InterviewReminder.objects.filter(id__in=reminder_ids, status='sending'))
+        rows = EmailService.schedule_rows({reminder.schedule_id for reminder in reminders})
+        
+        messages, owners, errors = [], [], {}
+        for reminder in reminders:
+            try:
+                row = rows[reminder.schedule_id]
+                for recipient in (row['candidate_email'], row['employer_email']):
+                    messages.append(EmailService.build_interview_reminder(row, reminder.reminder_type, recipient))
+                    owners.append(reminder.id)
+            except Exception as e:
+                errors[reminder.id] = str(e)
+        
+        undelivered = {}
+        for owner, (success, error) in zip(owners, EmailService.send_batch(messages)):
+            if not success:
+                undelivered.setdefault(owner, []).append(error or 'Unknown error')
+        
+        results = {'sent': 0, 'failed': 0, 'retrying': 0}
+        now = timezone.now()
+        for reminder in reminders:
+            if reminder.id in errors:
+                reminder.retry_count += 1
+                reminder.error_message = errors[reminder.id]
+                if ReminderService.should_retry(reminder):
+                    reminder.status = 'pending'
+                    reminder.scheduled_at = now + timedelta(
+                        seconds=ReminderService.RETRY_BASE_SECONDS * (2 ** reminder.retry_count)
+                    )
+                    results['retrying'] += 1
+                else:
+                    reminder.status = 'failed'
+                    results['failed'] += 1
+                    logger.error(f"Reminder failed: {reminder.id} - {reminder.error_message}")
+            else:
+                reminder.status = 'sent'
+                reminder.sent_at = now
+                reminder.error_message = '; '.join(undelivered.get(reminder.id, []))
+                results['sent'] += 1
+        
+        InterviewReminder.objects.bulk_update(
+            reminders, ['status', 'sent_at', 'error_message', 'retry_count', 'scheduled_at']
+        )
+        ReminderService.enqueue_reminders([reminder for reminder in reminders if reminder.status == 'pending'])
+        return results
+    
     @staticmethod
     def mark_sent(reminder):
         """Mark reminder as sent"""
@@ -73,7 +272,4 @@ class ReminderService:
     @staticmethod
     def cancel_reminders(schedule):
         """Cancel all pending reminders for a schedule"""
-        InterviewReminder.objects.filter(
-            schedule=schedule,
-            status='pending'
-        ).update(status='failed', error_message='Interview cancelled')
+        return ReminderService.cancel_reminders_for_schedules([schedule.id])
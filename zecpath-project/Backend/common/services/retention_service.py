@@ -0,0 +1,120 @@
+"""
+Log Retention Service - chunked purge/archive of append-only log tables
+"""
+from datetime import timedelta
+from pathlib import Path
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+import gzip
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    """
+    Walks a table in bounded primary-key ranges and deletes (or clears
+    fields on) rows older than the policy cutoff, one short statement per
+    chunk, so no single DELETE locks the table or loads rows into memory.
+    """
+
+    DEFAULT_CHUNK_SIZE = 5000
+    DEFAULT_CHUNK_SLEEP = 0.1  # seconds between chunks
+    CURSOR_TIMEOUT = 60 * 60 * 24 * 30
+
+    @staticmethod
+    def run_all():
+        """Apply every policy in settings.LOG_RETENTION"""
+        from common.services.partition_service import PartitionService
+
+        results = {}
+        for label, policy in getattr(settings, 'LOG_RETENTION', {}).items():
+            # Partitioned tables expire whole months via settings.LOG_PARTITIONS
+            if label in getattr(settings, 'LOG_PARTITIONS', {}) and \
+                    PartitionService.is_partitioned(apps.get_model(label)._meta.db_table):
+                results[label] = {'skipped': 'partitioned'}
+                continue
+            try:
+                results[label] = RetentionService.apply_policy(label, policy)
+            except Exception as e:
+                logger.error(f"Retention failed for {label}: {str(e)}")
+                results[label] = {'error': str(e)}
+        return results
+
+    @staticmethod
+    def apply_policy(label, policy):
+        """
+        policy: {'days': int, 'field': datetime field, 'archive': bool,
+                 'clear_fields': {field: value}} - clear_fields updates rows instead of deleting
+        """
+        model = apps.get_model(label)
+        field = policy['field']
+        clear_fields = policy.get('clear_fields')
+        archive = policy.get('archive', False)
+        chunk_size = getattr(settings, 'LOG_RETENTION_CHUNK_SIZE', RetentionService.DEFAULT_CHUNK_SIZE)
+        chunk_sleep = getattr(settings, 'LOG_RETENTION_CHUNK_SLEEP', RetentionService.DEFAULT_CHUNK_SLEEP)
+        cutoff = timezone.now() - timedelta(days=policy['days'])
+
+        base = model._base_manager.all()
+        cursor_key = f"retention:{label}:cursor"
+
+        # Cleared rows stay in the table, so remember where the last run stopped
+        start = cache.get(cursor_key) if clear_fields else None
+        lower = RetentionService._next_pk(base, start or 0)
+
+        archive_file = RetentionService._open_archive(label) if archive else None
+        processed = 0
+        chunks = 0
+
+        try:
+            while lower is not None:
+                upper = lower + chunk_size
+                chunk = base.filter(pk__gte=lower, pk__lt=upper)
+                expired = chunk.filter(**{f'{field}__lt': cutoff})
+
+                if clear_fields:
+                    expired = expired.exclude(**clear_fields)
+                    count = expired.update(**clear_fields)
+                else:
+                    if archive_file:
+                        for row in expired.values().iterator():
+                            archive_file.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                    count = expired._raw_delete(expired.db)
+
+                processed += count
+                chunks += 1
+
+                # Primary keys grow with time; once a chunk holds newer rows we are done
+                if chunk.filter(**{f'{field}__gte': cutoff}).exists():
+                    break
+
+                lower = RetentionService._next_pk(base, upper)
+                if clear_fields and lower is not None:
+                    cache.set(cursor_key, lower, RetentionService.CURSOR_TIMEOUT)
+
+                if chunk_sleep:
+                    time.sleep(chunk_sleep)
+        finally:
+            if archive_file:
+                archive_file.close()
+
+        logger.info(f"Retention {label}: {processed} rows in {chunks} chunks (cutoff {cutoff:%Y-%m-%d})")
+        return {'processed': processed, 'chunks': chunks, 'action': 'clear' if clear_fields else 'delete'}
+
+    @staticmethod
+    def _next_pk(queryset, lower):
+        """Smallest primary key >= lower (index-only lookup), or None"""
+        return queryset.filter(pk__gte=lower).order_by('pk').values_list('pk', flat=True).first()
+
+    @staticmethod
+    def _open_archive(label):
+        """Gzipped JSONL file for rows about to be deleted"""
+        archive_dir = Path(getattr(settings, 'LOG_RETENTION_ARCHIVE_DIR', settings.BASE_DIR / 'logs' / 'archive'))
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{label.replace('.', '_').lower()}-{timezone.now():%Y%m%d%H%M%S}.jsonl.gz"
+        return gzip.open(archive_dir / filename, 'wt', encoding='utf-8')
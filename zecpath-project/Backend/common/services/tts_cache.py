@@ -0,0 +1,156 @@
+"""
+TTS Audio Cache - content-addressed synthesized speech on disk, served to Twilio by URL
+"""
+from django.conf import settings
+import hashlib
+import json
+import os
+import tempfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCacheService:
+    """
+    Files are named by a hash of (text, voice, language, model), so the
+    same question is synthesized once and then played from a static file.
+    The directory is kept under TTS_CACHE_MAX_BYTES by evicting the least
+    recently used files (hits and handed-out URLs refresh the file's mtime).
+    Files used within a call's lifetime (WebhookInterviewService.CALL_TTL)
+    are never evicted, since Twilio may still fetch them.
+    """
+
+    @staticmethod
+    def directory():
+        return str(getattr(settings, 'TTS_CACHE_DIR', os.path.join(settings.MEDIA_ROOT, 'tts')))
+
+    @staticmethod
+    def key(text, voice, language, model):
+        payload = json.dumps([' '.join(text.split()), voice, language, model])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _relative_path(text, language, gender):
+        from common.services.ai_bridge_service import TTSService
+
+        key = TTSCacheService.key(text, TTSService.voice_for(language, gender), language, TTSService.MODEL)
+        return os.path.join(key[:2], f"{key}.mp3")
+
+    @staticmethod
+    def _touch(path):
+        """LRU: mark the file as recently used; False if it is missing (never cached or just evicted)"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def get_or_synthesize(text, language='en', gender='female'):
+        """Path of the cached audio, synthesizing it on a miss; None if synthesis failed"""
+        from common.services.ai_bridge_service import TTSService
+
+        path = os.path.join(TTSCacheService.directory(), TTSCacheService._relative_path(text, language, gender))
+        if TTSCacheService._touch(path):
+            return path
+
+        audio, error = TTSService.synthesize_speech(text, language, gender)
+        if error or not audio:
+            return None
+        return TTSCacheService._store(path, audio)
+
+    @staticmethod
+    def _store(path, audio):
+        # Write to a temp file and rename, so readers never see partial audio
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        os.replace(temp_path, path)
+
+        TTSCacheService.evict()
+        return path
+
+    @staticmethod
+    def url_for(text, language='en', gender='female', synthesize=False):
+        """Absolute URL of the cached audio for Twilio <Play>, or None when not cached yet"""
+        relative = TTSCacheService._relative_path(text, language, gender)
+        path = os.path.join(TTSCacheService.directory(), relative)
+        # Touching the file keeps it out of eviction while Twilio may fetch it
+        if not TTSCacheService._touch(path) and \
+                not (synthesize and TTSCacheService.get_or_synthesize(text, language, gender)):
+            return None
+        prefix = getattr(settings, 'TTS_CACHE_URL', f"{settings.MEDIA_URL}tts/")
+        return f"{settings.BASE_URL}{prefix}{relative.replace(os.sep, '/')}"
+
+    @staticmethod
+    async def aurl_for(text, client, language='en', gender='female'):
+        """url_for(synthesize=True) for the async runner: synthesis through an async provider client"""
+        import asyncio
+        from common.services.ai_bridge_service import TTSService
+
+        relative = TTSCacheService._relative_path(text, language, gender)
+        path = os.path.join(TTSCacheService.directory(), relative)
+        if not os.path.exists(path):
+            try:
+                audio = await client.speech(text, TTSService.voice_for(language, gender), model=TTSService.MODEL)
+            except Exception as e:
+                logger.error(f"TTS error: {str(e)}")
+                return None
+            # File write and eviction scan stay off the event loop
+            await asyncio.to_thread(TTSCacheService._store, path, audio)
+        return TTSCacheService.url_for(text, language, gender)
+
+    @staticmethod
+    def schedule_prewarm(texts):
+        """Queue prewarm() for texts (after commit); a missing file is synthesized on first play anyway"""
+        from common.tasks_ai_calls import prewarm_tts_audio_task
+        try:
+            prewarm_tts_audio_task.delay(texts)
+        except Exception as e:
+            logger.warning(f"Could not queue TTS prewarm: {str(e)}")
+
+    @staticmethod
+    def prewarm(texts, language='en', gender='female'):
+        """Synthesize any texts not cached yet; returns how many distinct files are now cached"""
+        # De-duplicate on the file, which ignores whitespace differences
+        unique = {TTSCacheService._relative_path(text, language, gender): text for text in texts if text}
+        return sum(1 for text in unique.values() if TTSCacheService.get_or_synthesize(text, language, gender))
+
+    @staticmethod
+    def evict(max_bytes=None):
+        """Delete least recently used files until the cache fits max_bytes, sparing files in use by live calls"""
+        import time
+        from common.services.webhook_interview import WebhookInterviewService
+
+        max_bytes = max_bytes or getattr(settings, 'TTS_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+        in_use_since = time.time() - WebhookInterviewService.CALL_TTL
+        files, total = [], 0
+        for root, _, names in os.walk(TTSCacheService.directory()):
+            for name in names:
+                if not name.endswith('.mp3'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for mtime, size, path in sorted(files):
+            if total <= max_bytes or mtime >= in_use_since:
+                break
+            try:
+                if os.stat(path).st_mtime >= in_use_since:
+                    continue  # Handed out to a call since the scan
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"TTS cache evicted {removed} files")
+        return removed
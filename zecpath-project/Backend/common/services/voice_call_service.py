@@ -11,12 +11,30 @@ logger = logging.getLogger(__name__)
 class TwilioCallService:
     """Twilio voice call integration"""
     
+    @staticmethod
+    def _client(account_sid, auth_token):
+        from twilio.rest import Client
+        
+        client = Client(account_sid, auth_token)
+        base_url = getattr(settings, 'TWILIO_API_BASE_URL', '')
+        if base_url:
+            # e.g. the provider stub (common.utils.provider_stub)
+            client.api.base_url = base_url
+        return client
+    
     @staticmethod
     def initiate_call(to_phone, callback_url, language='en'):
-        """Start outbound call"""
+        """Start outbound call (fails fast while the Twilio circuit is open)"""
+        from common.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, is_provider_failure
+        
+        breaker = CircuitBreaker('twilio.calls')
+        try:
+            probe = breaker.check()
+        except CircuitOpenError as e:
+            logger.warning(str(e))
+            return None, str(e)
+        
         try:
-            from twilio.rest import Client
-            
             account_sid = os.getenv('TWILIO_ACCOUNT_SID')
             auth_token = os.getenv('TWILIO_AUTH_TOKEN')
             from_phone = os.getenv('TWILIO_PHONE_NUMBER')
@@ -24,16 +42,18 @@ class TwilioCallService:
             if not all([account_sid, auth_token, from_phone]):
                 return None, "Twilio credentials not configured"
             
-            client = Client(account_sid, auth_token)
+            client = TwilioCallService._client(account_sid, auth_token)
             
             call = client.calls.create(
                 to=to_phone,
                 from_=from_phone,
                 url=callback_url,
                 method='POST',
-                status_callback=callback_url + '/status',
+                status_callback=f"{settings.BASE_URL}/api/ai-calls/twilio-status/",
                 status_callback_event=['initiated', 'ringing', 'answered', 'completed']
             )
+            if probe:
+                breaker.record_success()
             
             return {
                 'call_sid': call.sid,
@@ -46,15 +66,15 @@ class TwilioCallService:
             return None, "Twilio library not installed"
         except Exception as e:
             logger.error(f"Twilio call failed: {str(e)}")
+            if is_provider_failure(e):
+                breaker.record_failure()
             return None, str(e)
     
     @staticmethod
     def get_call_status(call_sid):
         """Check call status"""
         try:
-            from twilio.rest import Client
-            
-            client = Client(
+            client = TwilioCallService._client(
                 os.getenv('TWILIO_ACCOUNT_SID'),
                 os.getenv('TWILIO_AUTH_TOKEN')
             )
@@ -73,6 +93,7 @@ class TwilioCallService:
     def generate_twiml_response(text, language='en', voice='female'):
         """Generate TwiML for voice response"""
         from twilio.twiml.voice_response import VoiceResponse, Gather
+        from common.services.tts_cache import TTSCacheService
         
         response = VoiceResponse()
         
@@ -92,7 +113,11 @@ class TwilioCallService:
             language=language,
             speech_timeout='auto'
         )
-        gather.say(text, voice=selected_voice, language=language)
+        audio_url = TTSCacheService.url_for(text, language, voice)
+        if audio_url:
+            gather.play(audio_url)
+        else:
+            gather.say(text, voice=selected_voice, language=language)
         response.append(gather)
         
         # Fallback
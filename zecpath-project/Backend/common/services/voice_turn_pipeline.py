@@ -0,0 +1,165 @@
+"""
+Voice Turn Pipeline - prepare the next question while the candidate is still answering
+"""
+from collections import namedtuple
+from asgiref.sync import sync_to_async
+from common.services.question_engine_service import QuestionEngineService
+import asyncio
+import copy
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+PreparedQuestion = namedtuple('PreparedQuestion', ['text', 'category', 'audio_url'])
+
+
+class VoiceTurnPipeline:
+    """
+    Runs a simulated interview (candidates without a phone number; live
+    calls are driven by the Twilio webhooks, see WebhookInterviewService,
+    which speculates on audio the same way) as overlapping stages instead
+    of strictly in turn:
+
+    - while an answer is captured, the likely next question (the plan's
+      next step if the answer adds no follow-up or skip) is synthesized;
+    - answer evaluation and checkpoint writes run in the background, in
+      capture order, while the next question plays.
+
+    Only choosing the next question and waiting for its audio (on a wrong
+    guess) stay between answer and question. Per-stage timings are kept
+    and summarized for AIInterviewSession.stage_timings.
+
+    Start it with async_to_sync so checkpoint writes run on the caller's
+    thread and database connection. The async runner passes an async
+    provider client (audio is synthesized without a thread) and its own
+    db(func) wrapper for checkpoint writes instead.
+    """
+
+    def __init__(self, buffer, plan, language='en', gender='female', provider=None, db=None):
+        self.buffer = buffer
+        self.plan = plan
+        self.language = language
+        self.gender = gender
+        self.provider = provider
+        self.db = db or sync_to_async
+        self.timings = {}  # stage -> [seconds]
+        self.speculation = {'hits': 0, 'misses': 0}
+        self._recording = None  # Latest background record task; each waits for the previous one
+
+    def _observe(self, stage, started):
+        self.timings.setdefault(stage, []).append(time.monotonic() - started)
+
+    def prepare(self, text, category):
+        """Cached audio URL for a question (blocking)"""
+        from common.services.tts_cache import TTSCacheService
+
+        audio_url = TTSCacheService.url_for(text, self.language, self.gender, synthesize=True)
+        return PreparedQuestion(text, category, audio_url)
+
+    async def _prepare(self, text, category):
+        if self.provider is None:
+            return await asyncio.to_thread(self.prepare, text, category)
+
+        from common.services.tts_cache import TTSCacheService
+
+        audio_url = await TTSCacheService.aurl_for(text, self.provider, self.language, self.gender)
+        return PreparedQuestion(text, category, audio_url)
+
+    def _guess_next(self):
+        """Next question assuming the pending answer changes nothing (state untouched)"""
+        state = copy.copy(self.buffer.state)
+        state.context = copy.deepcopy(self.buffer.state.context)
+        state.completed_categories = list(self.buffer.state.completed_categories)
+        return self.plan.next_question(state)
+
+    async def run(self, capture_answer):
+        """
+        Ask every question; capture_answer(prepared) is a coroutine that
+        plays the question and returns (answer, duration_seconds).
+        Returns the stage timing summary.
+        """
+        state = self.buffer.state
+
+        started = time.monotonic()
+        text, category = self.plan.next_question(state, self.buffer.last_answer)
+        self._observe('select', started)
+        prepared = None
+        if text is not None:
+            started = time.monotonic()
+            prepared = await self._prepare(text, category)
+            self._observe('prepare', started)
+
+        while prepared is not None:
+            QuestionEngineService.advance_state(state)
+            guess_text, guess_category = self._guess_next()
+            speculative = asyncio.create_task(self._prepare(guess_text, guess_category)) if guess_text else None
+
+            started = time.monotonic()
+            answer, duration = await capture_answer(prepared)
+            self._observe('capture', started)
+            self._record(prepared, answer, duration)
+
+            # Critical path: answer in -> next question out
+            started = time.monotonic()
+            text, category = self.plan.next_question(state, answer)
+            self._observe('select', started)
+            if text is None:
+                if speculative:
+                    speculative.cancel()
+                break
+
+            started = time.monotonic()
+            if speculative and text == guess_text:
+                prepared = await speculative
+                self.speculation['hits'] += 1
+            else:
+                if speculative:
+                    speculative.cancel()
+                    self.speculation['misses'] += 1
+                prepared = await self._prepare(text, category)
+            self._observe('prepare', started)
+
+        if self._recording:
+            await self._recording
+        return self.summary()
+
+    def _record(self, prepared, answer, duration):
+        # The state as of this turn, before the next question is chosen
+        state_values = self.buffer.state_values()
+        self._recording = asyncio.create_task(
+            self._record_turn(self._recording, prepared, answer, duration, state_values)
+        )
+
+    async def _record_turn(self, previous, prepared, answer, duration, state_values):
+        from common.services.ai_conversation_service import AIConversationService
+
+        started = time.monotonic()
+        if self.provider is None:
+            scores = await asyncio.to_thread(AIConversationService.score_answer, prepared.text, answer, prepared.category)
+        else:
+            # Rule-based and quick; the async runner keeps its threads for the database
+            scores = AIConversationService.score_answer(prepared.text, answer, prepared.category)
+        self._observe('evaluate', started)
+
+        if previous:
+            await previous  # Keep turn numbers in capture order
+        self.buffer.add_turn(
+            prepared.text, answer, duration=duration, category=prepared.category,
+            scores=scores, auto_checkpoint=False
+        )
+        if self.buffer.checkpoint_due:
+            started = time.monotonic()
+            await self.db(self.buffer.flush)(self.buffer.snapshot(state_values))
+            self._observe('persist', started)
+
+    def summary(self):
+        stages = {
+            stage: {
+                'count': len(samples),
+                'avg_ms': round(sum(samples) / len(samples) * 1000, 2),
+                'max_ms': round(max(samples) * 1000, 2),
+            }
+            for stage, samples in self.timings.items()
+        }
+        return {'stages': stages, 'speculation': dict(self.speculation)}
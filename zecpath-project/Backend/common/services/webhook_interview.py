@@ -0,0 +1,269 @@
+"""
+Webhook Interview Service - Twilio question/answer webhooks served from the hot store
+"""
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import SimpleNamespace
+from django.db import transaction
+from django.db.models import Max
+from core.ai_call_models import AICallQueue, AIInterviewSession
+from core.question_models import InterviewState
+from common.utils.hot_store import get_hot_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookInterviewService:
+    """
+    Twilio webhooks have a hard response deadline, so they never touch the
+    ORM on the hot path. A call's session ids and live question state sit
+    in the hot store under its CallSid (one indexed AICallQueue.call_sid
+    lookup on a miss), questions come from the compiled QuestionPlan, TwiML
+    for plan questions is memoized per process, and answers are appended
+    to a write-behind list that flush() turns into InterviewBuffer writes.
+    While a question plays, the likely next one (the plan's next step if
+    the answer adds no follow-up or skip) is synthesized into the TTS
+    cache on a background thread, so it is served as <Play> rather than
+    the <Say> fallback.
+    """
+
+    CALL_TTL = 2 * 60 * 60  # seconds
+    DIRTY_SET = 'webhook_answers'
+    GOODBYE = "Thank you for your time. Goodbye!"
+
+    _speculation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tts-speculation')
+    _speculating = {}  # text -> future, so concurrent calls share one synthesis
+    _speculating_lock = threading.Lock()
+
+    @staticmethod
+    def _call_key(call_sid):
+        return f"call:{call_sid}"
+
+    @staticmethod
+    def _answers_key(call_sid):
+        return f"answers:{call_sid}"
+
+    @staticmethod
+    def register_call(call_sid, call_id, session_id, job_id, state_values):
+        """Prime the hot store when a call is placed, so the first webhook is a hit"""
+        get_hot_store().set(WebhookInterviewService._call_key(call_sid), {
+            'call_id': call_id,
+            'session_id': session_id,
+            'job_id': job_id,
+            'turn': 0,
+            'asked': None,
+            'state': state_values,
+        }, WebhookInterviewService.CALL_TTL)
+
+    @staticmethod
+    def resolve(call_sid):
+        """Hot record for a call; loaded with one indexed query on a miss, None for unknown calls"""
+        record = get_hot_store().get(WebhookInterviewService._call_key(call_sid))
+        if record is not None or not call_sid:
+            return record
+
+        row = AICallQueue.objects.filter(call_sid=call_sid).values(
+            'id', 'session__id', 'application__job_id'
+        ).first()
+        if row is None or row['session__id'] is None:
+            return None
+
+        state = InterviewState.objects.filter(session_id=row['session__id']).values(
+            'current_question_index', 'context', 'completed_categories'
+        ).first() or {'current_question_index': 0, 'context': {'answers': {}}, 'completed_categories': []}
+        WebhookInterviewService.register_call(
+            call_sid, row['id'], row['session__id'], row['application__job_id'], state
+        )
+        return get_hot_store().get(WebhookInterviewService._call_key(call_sid))
+
+    @staticmethod
+    def question_twiml(call_sid):
+        """TwiML for the call's current question (re-served as-is on Twilio retries)"""
+        record = WebhookInterviewService.resolve(call_sid)
+        if record is None:
+            return WebhookInterviewService.render_goodbye()
+
+        if record['asked'] is None:
+            state = SimpleNamespace(**record['state'])
+            text, category = WebhookInterviewService._plan(record).next_question(state)
+            if text is None:
+                return WebhookInterviewService.render_goodbye()
+            record.update(turn=1, asked={'text': text, 'category': category}, state=vars(state))
+            get_hot_store().set(WebhookInterviewService._call_key(call_sid), record, WebhookInterviewService.CALL_TTL)
+            WebhookInterviewService.speculate(record)
+
+        return WebhookInterviewService.render_question(record['asked']['text'], record['turn'])
+
+    @staticmethod
+    def answer(call_sid, turn, speech):
+        """Buffer the answer and return TwiML for the next question (no redirect round trip)"""
+        from common.services.question_engine_service import QuestionEngineService
+
+        store = get_hot_store()
+        record = WebhookInterviewService.resolve(call_sid)
+        if record is None or record['asked'] is None:
+            return WebhookInterviewService.render_goodbye()
+        if turn != record['turn']:
+            # Duplicate or stale webhook: the answer is already recorded
+            return WebhookInterviewService.render_question(record['asked']['text'], record['turn'])
+
+        state = SimpleNamespace(**record['state'])
+        QuestionEngineService.advance_state(state)
+        store.append(WebhookInterviewService._answers_key(call_sid), {
+            'question': record['asked']['text'],
+            'category': record['asked']['category'],
+            'answer': speech,
+            'state': dict(vars(state)),  # Persisted with this turn at the next flush
+        }, WebhookInterviewService.DIRTY_SET)
+
+        text, category = WebhookInterviewService._plan(record).next_question(state, speech)
+        record.update(
+            turn=record['turn'] + 1,
+            asked={'text': text, 'category': category} if text else None,
+            state=vars(state)
+        )
+        store.set(WebhookInterviewService._call_key(call_sid), record, WebhookInterviewService.CALL_TTL)
+
+        if text is None:
+            WebhookInterviewService.schedule_finish(call_sid)
+            return WebhookInterviewService.render_goodbye()
+        WebhookInterviewService.speculate(record)
+        return WebhookInterviewService.render_question(text, record['turn'])
+
+    @staticmethod
+    def speculate(record):
+        """Synthesize the likely next question's audio off the request thread; returns the future, if any"""
+        from common.services.question_engine_service import QuestionEngineService
+        from common.services.tts_cache import TTSCacheService
+
+        # A copy: the record's state is the asked question's until its answer arrives
+        state = SimpleNamespace(**copy.deepcopy(record['state']))
+        QuestionEngineService.advance_state(state)
+        text, _ = WebhookInterviewService._plan(record).next_question(state)
+        if text is None or TTSCacheService.url_for(text):
+            return None
+
+        with WebhookInterviewService._speculating_lock:
+            future = WebhookInterviewService._speculating.get(text)
+            if future is None:
+                future = WebhookInterviewService._speculation_pool.submit(TTSCacheService.get_or_synthesize, text)
+                WebhookInterviewService._speculating[text] = future
+                future.add_done_callback(lambda _: WebhookInterviewService._speculated(text))
+        return future
+
+    @staticmethod
+    def _speculated(text):
+        with WebhookInterviewService._speculating_lock:
+            WebhookInterviewService._speculating.pop(text, None)
+
+    @staticmethod
+    def schedule_finish(call_sid):
+        """Queue the final flush; if the broker is down, flush_pending finishes the call instead"""
+        from common.tasks_ai_calls import flush_webhook_answers_task
+        try:
+            flush_webhook_answers_task.delay(call_sid, finish=True)
+        except Exception as e:
+            logger.warning(f"Could not queue final flush for call {call_sid}: {str(e)}")
+
+    @staticmethod
+    def is_finished(record):
+        """The last question was answered (nothing asked after the first turn)"""
+        return record is not None and record['turn'] > 0 and record['asked'] is None
+
+    @staticmethod
+    def _plan(record):
+        from common.services.question_plan import QuestionPlanCache
+        return QuestionPlanCache.get(record['job_id'])
+
+    @staticmethod
+    def render_question(text, turn):
+        from common.services.tts_cache import TTSCacheService
+        # The audio URL is part of the key so newly cached audio replaces <Say>
+        return WebhookInterviewService._render_question(text, turn, TTSCacheService.url_for(text))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _render_question(text, turn, audio_url):
+        from twilio.twiml.voice_response import VoiceResponse, Gather
+
+        response = VoiceResponse()
+        gather = Gather(
+            input='speech',
+            action=f'/api/ai-calls/twilio-response/{turn}/',
+            method='POST',
+            speech_timeout='auto'
+        )
+        if audio_url:
+            gather.play(audio_url)
+        else:
+            gather.say(text, voice='Polly.Joanna')
+        response.append(gather)
+        # No speech: ask again
+        response.redirect(f'/api/ai-calls/twilio-question/{turn}/')
+        return str(response)
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def render_goodbye():
+        from twilio.twiml.voice_response import VoiceResponse
+
+        response = VoiceResponse()
+        response.say(WebhookInterviewService.GOODBYE, voice='Polly.Joanna')
+        response.hangup()
+        return str(response)
+
+    @staticmethod
+    def flush(call_sid, finish=False):
+        """
+        Write a call's buffered answers: one bulk_create of turns plus the
+        state of the last one. The session row lock orders concurrent
+        flushers; drained items go back to the store if the write fails.
+        """
+        from common.services.interview_buffer import InterviewBuffer
+
+        store = get_hot_store()
+        key = WebhookInterviewService._answers_key(call_sid)
+
+        with transaction.atomic():
+            session = AIInterviewSession.objects.select_for_update(of=('self',)).select_related(
+                'state', 'call_queue'
+            ).filter(call_queue__call_sid=call_sid).first()
+            if session is None:
+                return 0
+
+            items = store.drain(key)
+            try:
+                if items:
+                    last_turn = session.turns.aggregate(last=Max('turn_number'))['last'] or 0
+                    buffer = InterviewBuffer(session, session.state, last_turn_number=last_turn)
+                    for item in items:
+                        buffer.add_turn(item['question'], item['answer'], category=item['category'],
+                                        auto_checkpoint=False)
+                    buffer.flush(buffer.snapshot(items[-1]['state']))
+            except Exception:
+                store.requeue(key, items, WebhookInterviewService.DIRTY_SET)
+                raise
+
+        if finish:
+            from common.services.ai_call_runner import AICallRunner
+            AICallRunner.finish_dialed(session.call_queue_id)
+        return len(items)
+
+    @staticmethod
+    def flush_pending(limit=100):
+        """Flush every call with buffered answers (scheduled safety net); finishes calls whose interview ended"""
+        store = get_hot_store()
+        flushed = 0
+        for key in store.pop_dirty(WebhookInterviewService.DIRTY_SET, limit):
+            call_sid = key.split(':', 1)[1]  # Dirty set holds answer list keys
+            try:
+                record = store.get(WebhookInterviewService._call_key(call_sid))
+                flushed += WebhookInterviewService.flush(
+                    call_sid, finish=WebhookInterviewService.is_finished(record)
+                )
+            except Exception as e:
+                logger.error(f"Answer flush failed for call {call_sid}: {str(e)}")
+        return flushed
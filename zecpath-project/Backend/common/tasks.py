@@ -22,6 +22,21 @@ def send_email_task(subject, message, recipient_list, html_message=None):
         logger.error(f"Email failed: {str(e)}")
         raise
 
+@shared_task(name='retry_emails_task')
+def retry_emails_task(email_log_ids):
+    """Delayed retry for failed emails, sent over one SMTP connection"""
+    from core.models import EmailLog
+    from common.services.email_service import EmailService
+    
+    logs = list(EmailLog.objects.filter(id__in=email_log_ids, status='failed'))
+    for email_log in logs:
+        email_log.retry_count += 1
+    
+    results = EmailService.send_logged(logs)
+    sent = sum(1 for success, _ in results if success)
+    logger.info(f"Email retry: {sent}/{len(logs)} sent")
+    return {'retried': len(logs), 'sent': sent}
+
 @shared_task(name='parse_resume_task')
 def parse_resume_task(resume_path):
     """Async task for parsing resumes"""
@@ -57,12 +72,18 @@ def calculate_ats_score_task(application_id):
 
 @shared_task(name='cleanup_old_logs')
 def cleanup_old_logs():
-    """Periodic task for cleaning up old logs"""
-    from datetime import timedelta
-    from django.utils import timezone
-    from core.models import EmailLog
+    """Periodic task applying log retention policies in bounded chunks"""
+    from common.services.retention_service import RetentionService
+    
+    results = RetentionService.run_all()
+    logger.info(f"Log retention complete: {results}")
+    return results
+
+@shared_task(name='maintain_log_partitions')
+def maintain_log_partitions():
+    """Periodic task pre-creating and expiring monthly log partitions"""
+    from common.services.partition_service import PartitionService
     
-    cutoff_date = timezone.now() - timedelta(days=30)
-    deleted_count = EmailLog.objects.filter(created_at__lt=cutoff_date).delete()[0]
-    logger.info(f"Cleaned up {deleted_count} old email logs")
-    return {'deleted': deleted_count}
+    results = PartitionService.maintain()
+    logger.info(f"Log partition maintenance complete: {results}")
+    return results
@@ -1,5 +1,4 @@
 from celery import shared_task
-from django.utils import timezone
 from datetime import timedelta
 import logging
 
@@ -23,7 +22,7 @@ def schedule_ai_call_task(application_id, triggered_by_id=None, trigger_reason='
             return {'status': 'not_eligible', 'checks': checks}
         
         # Get next call slot
-        scheduled_at = AICallEligibility.get_next_call_slot()
+        scheduled_at = AICallEligibility.get_next_call_slot(application.candidate)
         
         # Get triggered_by user
         triggered_by = None
@@ -42,11 +41,7 @@ def schedule_ai_call_task(application_id, triggered_by_id=None, trigger_reason='
             trigger_reason=trigger_reason
         )
         
-        # Schedule execution
-        execute_ai_call_task.apply_async(
-            args=[call_queue.id],
-            eta=scheduled_at
-        )
+        # Executed by the dispatcher (process_pending_ai_calls) once due
         
         logger.info(f"AI call scheduled for application {application_id} at {scheduled_at} by {trigger_reason}")
         return {'status': 'scheduled', 'call_id': call_queue.id, 'scheduled_at': str(scheduled_at)}
@@ -56,155 +51,69 @@ def schedule_ai_call_task(application_id, triggered_by_id=None, trigger_reason='
         return {'status': 'error', 'message': str(e)}
 
 
-@shared_task(name='execute_ai_call', bind=True, max_retries=3)
-def execute_ai_call_task(self, call_queue_id):
+@shared_task(name='execute_ai_call')
+def execute_ai_call_task(call_queue_id, dispatch_key=None):
     """Execute AI call with dynamic question flow"""
-    from core.ai_call_models import AICallQueue
-    from common.services.ai_call_eligibility import AICallEligibility
-    from common.services.ai_conversation_service import AIConversationService
-    from common.services.question_engine_service import QuestionEngineService
-    from common.services.voice_call_service import VoiceCallService
+    from common.services.ai_call_runner import AICallRunner
     
-    try:
-        call_queue = AICallQueue.objects.get(id=call_queue_id)
-        application = call_queue.application
-        candidate = application.candidate
-        job = application.job
-        
-        # Update status
-        call_queue.status = 'in_progress'
-        call_queue.started_at = timezone.now()
-        call_queue.save()
-        
-        # Create session
-        session = AIConversationService.create_session(call_queue)
-        
-        # Initialize question flow
-        state = QuestionEngineService.initialize_flow(session, job)
-        
-        # Initiate voice call (if phone available)
-        phone = getattr(candidate, 'phone', None)
-        if phone:
-            call_result, call_error = VoiceCallService.start_interview_call(
-                candidate=candidate,
-                job=job,
-                language='en',
-                voice_gender='female'
-            )
-            
-            if call_error:
-                logger.error(f"Voice call failed: {call_error}")
-            else:
-                logger.info(f"Voice call initiated: {call_result['call_sid']}")
-                call_queue.error_message = f"Twilio SID: {call_result['call_sid']}"
-                call_queue.save()
-        
-        # Dynamic question flow
-        turn_number = 1
-        previous_answer = None
-        
-        while True:
-            question, category = QuestionEngineService.get_next_question(state, previous_answer)
-            
-            if question is None:
-                break  # Interview complete
-            
-            # Simulate answer (replace with real Twilio response in production)
-            simulated_answer = f"Simulated answer for {category} question"
-            
-            # Store turn
-            AIConversationService.add_conversation_turn(
-                session, turn_number,
-                question,
-                simulated_answer,
-                duration=15,
-                category=category,
-                follow_up=False
-            )
-            
-            # Advance state
-            QuestionEngineService.advance_state(state)
-            previous_answer = simulated_answer
-            turn_number += 1
-        
-        # Save transcript
-        all_turns = session.turns.all()
-        transcript_text = "\n".join([f"Q: {t.question_text}\nA: {t.answer_text}" for t in all_turns])
-        transcript_json = {
-            "turns": [{"q": t.question_text, "a": t.answer_text, "category": t.category} for t in all_turns]
-        }
-        AIConversationService.save_transcript(
-            session,
-            transcript_text,
-            transcript_json,
-            confidence=0.95
-        )
-        
-        # Calculate aggregate interview score
-        from common.services.interview_scorer import InterviewScorer
-        score_result, score_error = InterviewScorer.calculate_session_score(session.session_id)
-        if score_error:
-            logger.warning(f"Score calculation failed: {score_error}")
-        else:
-            logger.info(f"Interview score: {score_result['overall_score']}")
-        
-        # Finalize
-        AIConversationService.finalize_session(
-            call_queue,
-            outcome='interested',
-            summary='Dynamic AI interview completed successfully',
-            sentiment=0.8
-        )
-        
-        # Complete
-        call_queue.status = 'completed'
-        call_queue.completed_at = timezone.now()
-        call_queue.call_duration = turn_number * 20
-        call_queue.save()
-        
-        logger.info(f"AI call completed: {call_queue_id}")
-        return {'status': 'completed', 'call_id': call_queue_id, 'session_id': session.session_id}
-        
-    except AICallQueue.DoesNotExist:
-        logger.error(f"Call queue {call_queue_id} not found")
-        return {'status': 'error', 'message': 'Call queue not found'}
-        
-    except Exception as e:
-        logger.error(f"AI call failed: {str(e)}")
-        
-        call_queue = AICallQueue.objects.get(id=call_queue_id)
-        call_queue.status = 'failed'
-        call_queue.error_message = str(e)
-        call_queue.retry_count += 1
-        call_queue.save()
-        
-        if AICallEligibility.should_retry(call_queue):
-            retry_delay = 60 * (2 ** call_queue.retry_count)
-            logger.info(f"Retrying in {retry_delay}s (attempt {call_queue.retry_count})")
-            raise self.retry(exc=e, countdown=retry_delay)
-        
-        return {'status': 'failed', 'message': str(e)}
+    return AICallRunner.run(call_queue_id, dispatch_key)
+
+
+@shared_task(name='execute_ai_calls_async')
+def execute_ai_calls_async_task(calls):
+    """Run a dispatched batch of [call_id, dispatch_key] concurrently on one event loop"""
+    import asyncio
+    from common.services.ai_call_runner import AsyncAICallRunner
+    
+    return asyncio.run(AsyncAICallRunner().run_many([tuple(call) for call in calls]))
 
 
 @shared_task(name='process_pending_ai_calls')
-def process_pending_ai_calls_task():
-    """Process all pending AI calls (scheduled task)"""
-    from core.ai_call_models import AICallQueue
+def process_pending_ai_calls_task(max_batches=10):
+    """Claim due AI calls and dispatch each exactly once (scheduled task)"""
+    from common.services.ai_call_dispatcher import AICallDispatcher
+    
+    return AICallDispatcher.dispatch(max_batches=max_batches)
+
+
+@shared_task(name='generate_interview_questions')
+def generate_interview_questions_task(job_title, skills, num_questions=3):
+    """Fill the interview question cache for one prompt (single-flight)"""
+    from common.services.question_cache import QuestionCacheService
     
-    now = timezone.now()
-    pending_calls = AICallQueue.objects.filter(
-        status='queued',
-        scheduled_at__lte=now
-    )
+    questions = QuestionCacheService.generate(job_title, skills, num_questions)
+    return {'status': 'generated' if questions else 'skipped', 'job_title': job_title}
+
+
+@shared_task(name='analyze_interview_sessions')
+def analyze_interview_sessions_task(session_pks):
+    """Batch LLM analysis of interview answers (AIInterviewSession primary keys)"""
+    from common.services.ai_conversation_service import AIConversationService
+    
+    return AIConversationService.analyze_sessions(session_pks)
+
+
+@shared_task(name='prewarm_tts_audio')
+def prewarm_tts_audio_task(texts, language='en', gender='female'):
+    """Synthesize question audio into the TTS cache"""
+    from common.services.tts_cache import TTSCacheService
     
-    results = {'processed': 0, 'failed': 0}
+    return {'cached': TTSCacheService.prewarm(texts, language, gender)}
+
+
+@shared_task(name='flush_webhook_answers')
+def flush_webhook_answers_task(call_sid=None, finish=False):
+    """Write buffered webhook answers for one call, or for every call with pending answers"""
+    from common.services.webhook_interview import WebhookInterviewService
     
-    for call in pending_calls:
-        try:
-            execute_ai_call_task.delay(call.id)
-            results['processed'] += 1
-        except Exception as e:
-            logger.error(f"Failed to trigger call {call.id}: {str(e)}")
-            results['failed'] += 1
+    if call_sid:
+        return {'flushed': WebhookInterviewService.flush(call_sid, finish=finish)}
+    return {'flushed': WebhookInterviewService.flush_pending()}
+
+
+@shared_task(name='flush_call_status_events')
+def flush_call_status_events_task():
+    """Apply buffered Twilio status callbacks in bulk (scheduled task)"""
+    from common.services.call_status import CallStatusService
     
-    return results
+    return {'events': CallStatusService.flush()}
@@ -0,0 +1,35 @@
+"""
+Celery tasks for the application notification outbox
+"""
+from celery import shared_task
+from common.services.notification_outbox import NotificationOutboxService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='dispatch_notification_outbox')
+def dispatch_notification_outbox(max_batches=10):
+    """Drain pending outbox rows in batches"""
+    results = {'claimed': 0, 'sent': 0, 'failed': 0, 'retrying': 0, 'digested': 0}
+
+    for _ in range(max_batches):
+        entry_ids = NotificationOutboxService.claim_batch()
+        if not entry_ids:
+            break
+
+        results['claimed'] += len(entry_ids)
+        batch_results = NotificationOutboxService.deliver(entry_ids)
+        for key, value in batch_results.items():
+            results[key] += value
+
+    if results['claimed']:
+        logger.info(f"Outbox dispatch complete: {results}")
+    return results
+
+
+@shared_task(name='send_employer_digests')
+def send_employer_digests(mode):
+    """Roll up pending new-application events into one email per employer"""
+    from common.services.digest_service import EmployerDigestService
+    return EmployerDigestService.send_digests(mode)
@@ -0,0 +1,256 @@
+"""
+Circuit breakers shared by every worker process (Redis or in-process)
+"""
+import importlib
+import threading
+import time
+from functools import lru_cache
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """The provider's breaker is open; callers fail fast to their fallback"""
+
+
+class LocalCircuitBreaker:
+    """In-process stand-in for RedisCircuitBreaker (tests and single-process development)"""
+
+    def __init__(self):
+        self._failures = {}  # name -> (count, window_ends)
+        self._open = {}      # name -> open_until
+        self._tripped = set()
+        self._probes = {}    # name -> probe_expires
+        self._lock = threading.Lock()
+
+    def allow(self, name, reset_timeout):
+        """0: fail fast, 1: closed, 2: this call is the single half-open probe"""
+        now = time.monotonic()
+        with self._lock:
+            if self._open.get(name, 0) > now:
+                return 0
+            if name not in self._tripped:
+                return 1
+            if self._probes.get(name, 0) > now:
+                return 0
+            self._probes[name] = now + reset_timeout
+            return 2
+
+    def record_success(self, name):
+        with self._lock:
+            self._failures.pop(name, None)
+            self._tripped.discard(name)
+            self._probes.pop(name, None)
+
+    def record_failure(self, name, threshold, window, reset_timeout):
+        """Count a failure; returns True if it opened the breaker"""
+        now = time.monotonic()
+        with self._lock:
+            if name in self._tripped:
+                # Half-open probe failed
+                self._open[name] = now + reset_timeout
+                self._probes.pop(name, None)
+                return True
+            count, window_ends = self._failures.get(name, (0, now + window))
+            if window_ends <= now:
+                count, window_ends = 0, now + window
+            count += 1
+            if count < threshold:
+                self._failures[name] = (count, window_ends)
+                return False
+            self._failures.pop(name, None)
+            self._open[name] = now + reset_timeout
+            self._tripped.add(name)
+            return True
+
+    def state(self, name):
+        now = time.monotonic()
+        with self._lock:
+            if self._open.get(name, 0) > now:
+                return 'open'
+            if name not in self._tripped:
+                return 'closed'
+            return 'probing' if self._probes.get(name, 0) > now else 'half_open'
+
+
+class RedisCircuitBreaker:
+    """
+    Per-breaker keys: a failure counter that expires with its window, an
+    'open' key that expires after reset_timeout, a 'tripped' marker kept
+    until a success (open expired + tripped = half-open) and a 'probe' key
+    that admits one trial call at a time.
+    """
+
+    ALLOW_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return 0
+    end
+    if redis.call('EXISTS', KEYS[2]) == 0 then
+        return 1
+    end
+    if redis.call('SET', KEYS[3], 1, 'NX', 'EX', ARGV[1]) then
+        return 2
+    end
+    return 0
+    """
+
+    FAILURE_SCRIPT = """
+    local threshold = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    local reset_timeout = tonumber(ARGV[3])
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        redis.call('SET', KEYS[1], 1, 'EX', reset_timeout)
+        redis.call('DEL', KEYS[3])
+        return 1
+    end
+    local count = redis.call('INCR', KEYS[4])
+    if count == 1 then
+        redis.call('EXPIRE', KEYS[4], window)
+    end
+    if count < threshold then
+        return 0
+    end
+    redis.call('DEL', KEYS[4])
+    redis.call('SET', KEYS[1], 1, 'EX', reset_timeout)
+    redis.call('SET', KEYS[2], 1, 'EX', reset_timeout * 20)
+    return 1
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._allow = client.register_script(self.ALLOW_SCRIPT)
+        self._failure = client.register_script(self.FAILURE_SCRIPT)
+
+    @staticmethod
+    def _keys(name):
+        return [f"breaker:{name}:{part}" for part in ('open', 'tripped', 'probe', 'failures')]
+
+    def allow(self, name, reset_timeout):
+        return int(self._allow(keys=self._keys(name)[:3], args=[int(reset_timeout)]))
+
+    def record_success(self, name):
+        self.client.delete(*self._keys(name)[1:])
+
+    def record_failure(self, name, threshold, window, reset_timeout):
+        return bool(self._failure(keys=self._keys(name), args=[threshold, int(window), int(reset_timeout)]))
+
+    def state(self, name):
+        open_key, tripped, probe, _ = self._keys(name)
+        if self.client.exists(open_key):
+            return 'open'
+        if not self.client.exists(tripped):
+            return 'closed'
+        return 'probing' if self.client.exists(probe) else 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold failures within window seconds;
+    open fails fast for reset_timeout seconds; then half-open lets one
+    probe through, whose success closes the breaker and whose failure
+    reopens it ('probing' while that probe is in flight). Failures are counted per window rather than in a row, so
+    successes in the closed state cost no extra write. Settings come from
+    CIRCUIT_BREAKERS[name] over CIRCUIT_BREAKER_DEFAULTS. If the shared
+    store is unreachable the breaker stays out of the way.
+    """
+
+    DEFAULTS = {'failure_threshold': 5, 'window': 60, 'reset_timeout': 30}
+
+    def __init__(self, name):
+        self.name = name
+        config = dict(self.DEFAULTS)
+        config.update(getattr(settings, 'CIRCUIT_BREAKER_DEFAULTS', {}))
+        config.update(getattr(settings, 'CIRCUIT_BREAKERS', {}).get(name, {}))
+        self.failure_threshold = config['failure_threshold']
+        self.window = config['window']
+        self.reset_timeout = config['reset_timeout']
+
+    def allow(self):
+        """0: fail fast, 1: closed, 2: half-open probe"""
+        try:
+            return get_breaker_store().allow(self.name, self.reset_timeout)
+        except Exception as e:
+            logger.warning(f"Circuit breaker store unavailable ({self.name}): {str(e)}")
+            return 1
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go out; True if the call is the half-open probe"""
+        allowed = self.allow()
+        if not allowed:
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        return allowed == 2
+
+    def record_success(self):
+        try:
+            get_breaker_store().record_success(self.name)
+        except Exception as e:
+            logger.warning(f"Circuit breaker store unavailable ({self.name}): {str(e)}")
+
+    def record_failure(self):
+        try:
+            opened = get_breaker_store().record_failure(
+                self.name, self.failure_threshold, self.window, self.reset_timeout
+            )
+        except Exception as e:
+            logger.warning(f"Circuit breaker store unavailable ({self.name}): {str(e)}")
+            return
+        if opened:
+            logger.error(f"Circuit {self.name} opened for {self.reset_timeout}s")
+
+    @property
+    def state(self):
+        try:
+            return get_breaker_store().state(self.name)
+        except Exception:
+            return 'unknown'
+
+
+@lru_cache(maxsize=1)
+def _transport_errors():
+    """Connection and timeout errors of the HTTP clients the providers use (whichever are installed)"""
+    errors = [ConnectionError, TimeoutError]
+    for module_name, names in (
+        ('httpx', ('TransportError',)),
+        ('openai', ('APIConnectionError', 'APITimeoutError')),
+        ('requests', ('ConnectionError', 'Timeout')),
+    ):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        errors.extend(getattr(module, name) for name in names)
+    return tuple(errors)
+
+
+def is_provider_failure(exc):
+    """
+    Errors that say the provider is unhealthy: transport errors (connection,
+    timeout), 429 or 5xx. Anything else, such as a bad reply or a bug on our
+    side, leaves the breaker alone.
+    """
+    status = getattr(exc, 'status_code', None) or getattr(exc, 'status', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(exc, _transport_errors())
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_breaker_store():
+    """Shared breaker state for the configured CIRCUIT_BREAKER_BACKEND"""
+    backend = getattr(settings, 'CIRCUIT_BREAKER_BACKEND', 'local')
+    with _stores_lock:
+        if backend not in _stores:
+            if backend == 'redis':
+                import redis
+                client = redis.Redis.from_url(
+                    settings.CIRCUIT_BREAKER_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+                )
+                _stores[backend] = RedisCircuitBreaker(client)
+            else:
+                _stores[backend] = LocalCircuitBreaker()
+        return _stores[backend]
@@ -0,0 +1,109 @@
+"""
+Delayed job queue - members become due at a timestamp (Redis sorted set or in-process heap)
+"""
+import heapq
+import threading
+import time
+from django.conf import settings
+
+
+class LocalDelayedQueue:
+    """In-process stand-in for RedisDelayedQueue (tests and single-process development)"""
+
+    def __init__(self, name):
+        self.name = name
+        self._heap = []
+        self._scores = {}
+        self._lock = threading.Lock()
+
+    def add(self, member, due_at):
+        """Schedule (or re-time) a member"""
+        score = due_at.timestamp()
+        with self._lock:
+            self._scores[str(member)] = score
+            heapq.heappush(self._heap, (score, str(member)))
+
+    def remove(self, members):
+        with self._lock:
+            for member in members:
+                self._scores.pop(str(member), None)
+
+    def pop_due(self, now=None, limit=100):
+        """Remove and return members due at or before now"""
+        now = now if now is not None else time.time()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and len(due) < limit:
+                score, member = heapq.heappop(self._heap)
+                # Entries left behind by remove() or re-timing are skipped
+                if self._scores.get(member) == score:
+                    del self._scores[member]
+                    due.append(member)
+        return due
+
+    def next_due(self):
+        """Timestamp of the earliest member, or None"""
+        with self._lock:
+            while self._heap and self._scores.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._scores)
+
+
+class RedisDelayedQueue:
+    """Sorted set keyed by due timestamp; pops are atomic so several dispatchers can share it"""
+
+    POP_SCRIPT = """
+    local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+    if #due > 0 then
+        redis.call('ZREM', KEYS[1], unpack(due))
+    end
+    return due
+    """
+
+    def __init__(self, name, client):
+        self.name = name
+        self.key = f"delayed:{name}"
+        self.client = client
+        self._pop = client.register_script(self.POP_SCRIPT)
+
+    def add(self, member, due_at):
+        self.client.zadd(self.key, {str(member): due_at.timestamp()})
+
+    def remove(self, members):
+        members = [str(member) for member in members]
+        if members:
+            self.client.zrem(self.key, *members)
+
+    def pop_due(self, now=None, limit=100):
+        now = now if now is not None else time.time()
+        return [member.decode() for member in self._pop(keys=[self.key], args=[now, limit])]
+
+    def next_due(self):
+        head = self.client.zrange(self.key, 0, 0, withscores=True)
+        return head[0][1] if head else None
+
+    def __len__(self):
+        return self.client.zcard(self.key)
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_delayed_queue(name):
+    """Shared queue instance for the configured DELAYED_QUEUE_BACKEND"""
+    backend = getattr(settings, 'DELAYED_QUEUE_BACKEND', 'local')
+    with _queues_lock:
+        if (backend, name) not in _queues:
+            if backend == 'redis':
+                import redis
+                client = redis.Redis.from_url(
+                    settings.DELAYED_QUEUE_URL, socket_timeout=2, socket_connect_timeout=2
+                )
+                _queues[(backend, name)] = RedisDelayedQueue(name, client)
+            else:
+                _queues[(backend, name)] = LocalDelayedQueue(name)
+        return _queues[(backend, name)]
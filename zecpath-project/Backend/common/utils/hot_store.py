@@ -0,0 +1,114 @@
+"""
+Hot call store - per-call JSON values and write-behind lists (Redis or in-process)
+"""
+import json
+import threading
+import time
+from django.conf import settings
+
+
+class LocalHotStore:
+    """In-process stand-in for RedisHotStore (tests and single-process development)"""
+
+    def __init__(self):
+        self._values = {}  # key -> (value, expires_at)
+        self._lists = {}   # key -> [items]
+        self._dirty = {}   # set name -> {keys}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value, expires_at = self._values.get(key, (None, 0))
+            return value if expires_at > time.monotonic() else None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = (json.loads(json.dumps(value)), time.monotonic() + ttl)
+
+    def append(self, key, item, dirty_set):
+        """Append to a write-behind list and mark it for the flusher"""
+        with self._lock:
+            self._lists.setdefault(key, []).append(json.loads(json.dumps(item)))
+            self._dirty.setdefault(dirty_set, set()).add(key)
+
+    def drain(self, key):
+        """Remove and return every item of a list, oldest first"""
+        with self._lock:
+            return self._lists.pop(key, [])
+
+    def requeue(self, key, items, dirty_set):
+        """Put drained items back in front (a flush failed)"""
+        if items:
+            with self._lock:
+                self._lists[key] = list(items) + self._lists.get(key, [])
+                self._dirty.setdefault(dirty_set, set()).add(key)
+
+    def pop_dirty(self, dirty_set, count=100):
+        with self._lock:
+            keys = self._dirty.get(dirty_set, set())
+            popped = [keys.pop() for _ in range(min(count, len(keys)))]
+            return popped
+
+
+class RedisHotStore:
+    """Values as JSON strings, write-behind lists as Redis lists, dirty keys in a set"""
+
+    DRAIN_SCRIPT = """
+    local items = redis.call('LRANGE', KEYS[1], 0, -1)
+    redis.call('DEL', KEYS[1])
+    return items
+    """
+
+    LIST_TTL = 24 * 60 * 60  # Unflushed items outlive any call by far
+
+    def __init__(self, client):
+        self.client = client
+        self._drain = client.register_script(self.DRAIN_SCRIPT)
+
+    def get(self, key):
+        value = self.client.get(f"hot:{key}")
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(f"hot:{key}", json.dumps(value), ex=int(ttl))
+
+    def append(self, key, item, dirty_set):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(f"hot:list:{key}", json.dumps(item))
+        pipe.expire(f"hot:list:{key}", self.LIST_TTL)
+        pipe.sadd(f"hot:dirty:{dirty_set}", key)
+        pipe.execute()
+
+    def drain(self, key):
+        return [json.loads(item) for item in self._drain(keys=[f"hot:list:{key}"])]
+
+    def requeue(self, key, items, dirty_set):
+        if items:
+            pipe = self.client.pipeline(transaction=True)
+            pipe.lpush(f"hot:list:{key}", *[json.dumps(item) for item in reversed(items)])
+            pipe.expire(f"hot:list:{key}", self.LIST_TTL)
+            pipe.sadd(f"hot:dirty:{dirty_set}", key)
+            pipe.execute()
+
+    def pop_dirty(self, dirty_set, count=100):
+        return [key.decode() for key in self.client.spop(f"hot:dirty:{dirty_set}", count) or []]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_hot_store():
+    """Shared store for the configured HOT_STORE_BACKEND"""
+    backend = getattr(settings, 'HOT_STORE_BACKEND', 'local')
+    with _stores_lock:
+        if backend not in _stores:
+            if backend == 'redis':
+                import redis
+                client = redis.Redis.from_url(
+                    settings.HOT_STORE_URL, socket_timeout=1, socket_connect_timeout=1
+                )
+                _stores[backend] = RedisHotStore(client)
+            else:
+                _stores[backend] = LocalHotStore()
+        return _stores[backend]
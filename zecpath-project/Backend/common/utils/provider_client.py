@@ -0,0 +1,493 @@
+"""
+Shared LLM/STT/TTS provider clients - one pooled client per process
+"""
+import asyncio
+import bisect
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import asynccontextmanager, contextmanager
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from common.utils.circuit_breaker import CircuitBreaker, is_provider_failure
+
+
+class ProviderBusyError(Exception):
+    """No concurrency slot for the endpoint freed up within AI_PROVIDER_QUEUE_TIMEOUT"""
+
+
+class LatencyHistogram:
+    """Cumulative latency counts per bucket (seconds), Prometheus style"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf'))
+
+    def __init__(self):
+        self._counts = [0] * len(self.BUCKETS)
+        self._sum = 0.0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, error=False):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            self._sum += seconds
+            if error:
+                self._errors += 1
+
+    def quantile(self, q, min_count=20):
+        """Upper bucket bound below which a q share of calls finished; None until min_count samples"""
+        with self._lock:
+            count = sum(self._counts)
+            if count < min_count:
+                return None
+            cumulative = 0
+            for bound, bucket_count in zip(self.BUCKETS, self._counts):
+                cumulative += bucket_count
+                if cumulative >= q * count:
+                    return bound if bound != float('inf') else None
+            return None
+
+    def snapshot(self):
+        with self._lock:
+            count = sum(self._counts)
+            cumulative, buckets = 0, {}
+            for bound, bucket_count in zip(self.BUCKETS, self._counts):
+                cumulative += bucket_count
+                buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+            return {
+                'count': count,
+                'errors': self._errors,
+                'avg_seconds': round(self._sum / count, 3) if count else 0,
+                'buckets': buckets,
+            }
+
+
+class BaseProviderClient:
+    """
+    Per-endpoint concurrency limits, latency histograms and circuit
+    breakers (shared by all workers, see common.utils.circuit_breaker)
+    around the backend calls. An open breaker raises CircuitOpenError
+    before any slot is taken. Endpoints: 'chat' (LLM), 'transcribe' (STT),
+    'speech' (TTS).
+    """
+
+    PROVIDER = 'openai'
+    ENDPOINTS = ('chat', 'transcribe', 'speech')
+
+    def __init__(self):
+        limits = getattr(settings, 'AI_PROVIDER_ENDPOINTS', {})
+        self.queue_timeout = getattr(settings, 'AI_PROVIDER_QUEUE_TIMEOUT', 5)
+        self._slots = {
+            endpoint: threading.BoundedSemaphore(limits.get(endpoint, {}).get('max_concurrent', 4))
+            for endpoint in self.ENDPOINTS
+        }
+        self._latency = {endpoint: LatencyHistogram() for endpoint in self.ENDPOINTS}
+        self._breakers = {endpoint: CircuitBreaker(f"{self.PROVIDER}.{endpoint}") for endpoint in self.ENDPOINTS}
+        self._hedges = {'sent': 0, 'won': 0, 'skipped': 0}
+        self._in_flight = {'requests': 0, 'hedges': 0}  # Hedgeable requests and their hedges still running
+        self._hedge_lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(
+            max_workers=2 * limits.get('chat', {}).get('max_concurrent', 4), thread_name_prefix='provider-hedge'
+        )
+
+    @staticmethod
+    def read_timeout(endpoint):
+        return getattr(settings, 'AI_PROVIDER_ENDPOINTS', {}).get(endpoint, {}).get('read_timeout', 30)
+
+    @contextmanager
+    def _call(self, endpoint):
+        breaker = self._breakers[endpoint]
+        probe = breaker.check()
+        if not self._slots[endpoint].acquire(timeout=self.queue_timeout):
+            raise ProviderBusyError(f"No free {endpoint} slot after {self.queue_timeout}s")
+        started, failed = time.monotonic(), False
+        try:
+            yield
+        except Exception as e:
+            failed = True
+            if is_provider_failure(e):
+                breaker.record_failure()
+            raise
+        else:
+            if probe:
+                breaker.record_success()
+        finally:
+            self._latency[endpoint].observe(time.monotonic() - started, error=failed)
+            self._slots[endpoint].release()
+
+    def chat(self, messages, max_tokens=None, temperature=None, model=None, hedge=False):
+        """
+        Chat completion text. hedge=True (idempotent prompts only) sends a
+        second identical request if the first is slower than the hedge
+        delay, and returns whichever answers first.
+        """
+        def call():
+            with self._call('chat'):
+                return self._chat(messages, max_tokens, temperature, model or settings.OPENAI_MODEL)
+
+        return self._hedged('chat', call) if hedge else call()
+
+    def hedge_delay(self, endpoint):
+        """Seconds before hedging: the endpoint's latency quantile once known, else AI_PROVIDER_HEDGE_DELAY"""
+        observed = self._latency[endpoint].quantile(getattr(settings, 'AI_PROVIDER_HEDGE_QUANTILE', 0.95))
+        return observed or getattr(settings, 'AI_PROVIDER_HEDGE_DELAY', 2)
+
+    def _hedged(self, endpoint, call):
+        primary = self._hedge_pool.submit(call)
+        self._track(primary, 'requests')
+        done, _ = wait([primary], timeout=self.hedge_delay(endpoint))
+        if done:
+            return primary.result()
+        if not self._reserve_hedge(endpoint):
+            return primary.result()
+
+        # The slower request is not cancelled; its answer is discarded
+        hedge = self._hedge_pool.submit(call)
+        hedge.add_done_callback(lambda _: self._count_in_flight('hedges', -1))
+        pending, error = {primary, hedge}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count_hedge('won')
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _reserve_hedge(self, endpoint):
+        """
+        Hedge budget: a hedge is only sent while an endpoint slot is free and
+        hedges in flight stay under AI_PROVIDER_HEDGE_BUDGET of the hedgeable
+        requests in flight (at least one), so a slow provider is not hit
+        with twice the load
+        """
+        slots = self._slots[endpoint]
+        free = slots.acquire(blocking=False)
+        if free:
+            slots.release()
+        share = getattr(settings, 'AI_PROVIDER_HEDGE_BUDGET', 0.1)
+        with self._hedge_lock:
+            if not free or self._in_flight['hedges'] >= max(1, int(share * self._in_flight['requests'])):
+                self._hedges['skipped'] += 1
+                return False
+            self._in_flight['hedges'] += 1
+            self._hedges['sent'] += 1
+            return True
+
+    def _track(self, future, kind):
+        """Count the request in flight until it finishes"""
+        self._count_in_flight(kind, 1)
+        future.add_done_callback(lambda _: self._count_in_flight(kind, -1))
+
+    def _count_in_flight(self, kind, delta):
+        with self._hedge_lock:
+            self._in_flight[kind] += delta
+
+    def _count_hedge(self, outcome):
+        with self._hedge_lock:
+            self._hedges[outcome] += 1
+
+    def transcribe(self, audio_file, language='en'):
+        """Transcript text for an open audio file"""
+        with self._call('transcribe'):
+            return self._transcribe(audio_file, language)
+
+    def speech(self, text, voice, model='tts-1'):
+        """Synthesized audio bytes"""
+        with self._call('speech'):
+            return self._speech(text, voice, model)
+
+    def stats(self):
+        stats = {
+            endpoint: dict(histogram.snapshot(), breaker=self._breakers[endpoint].state)
+            for endpoint, histogram in self._latency.items()
+        }
+        with self._hedge_lock:
+            stats['chat']['hedges'] = dict(self._hedges)
+        return stats
+
+
+class OpenAIProviderClient(BaseProviderClient):
+    """OpenAI SDK client over one keep-alive httpx pool with explicit timeouts"""
+
+    def __init__(self):
+        super().__init__()
+        import httpx
+        from openai import OpenAI
+
+        max_connections = sum(
+            getattr(settings, 'AI_PROVIDER_ENDPOINTS', {}).get(endpoint, {}).get('max_concurrent', 4)
+            for endpoint in self.ENDPOINTS
+        )
+        timeout = httpx.Timeout(30, connect=getattr(settings, 'AI_PROVIDER_CONNECT_TIMEOUT', 3))
+        self.client = OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=getattr(settings, 'OPENAI_BASE_URL', '') or None,  # e.g. the provider stub
+            timeout=timeout,
+            max_retries=0,  # Retries belong to the caller; the breaker counts every failure
+            http_client=httpx.Client(
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            )
+        )
+
+    def _timeout(self, endpoint):
+        import httpx
+        return httpx.Timeout(
+            self.read_timeout(endpoint), connect=getattr(settings, 'AI_PROVIDER_CONNECT_TIMEOUT', 3)
+        )
+
+    def _chat(self, messages, max_tokens, temperature, model):
+        kwargs = {'max_tokens': max_tokens} if max_tokens else {}
+        if temperature is not None:
+            kwargs['temperature'] = temperature
+        response = self.client.chat.completions.create(
+            model=model, messages=messages, timeout=self._timeout('chat'), **kwargs
+        )
+        return response.choices[0].message.content.strip()
+
+    def _transcribe(self, audio_file, language):
+        transcript = self.client.audio.transcriptions.create(
+            model="whisper-1", file=audio_file, language=language, timeout=self._timeout('transcribe')
+        )
+        return transcript.text
+
+    def _speech(self, text, voice, model):
+        response = self.client.audio.speech.create(
+            model=model, voice=voice, input=text, timeout=self._timeout('speech')
+        )
+        return response.content
+
+
+def fake_chat_reply(prompt):
+    """Canned completion for each prompt shape we send (also served by common.utils.provider_stub)"""
+    if 'interview questions' in prompt:
+        return "\n".join(f"{n}. Fake interview question {n}?" for n in range(1, 4))
+    if 'JSON array' in prompt:
+        return json.dumps([
+            {'turn': int(turn), 'rating': 7, 'explanation': 'Fake analysis of the answer.'}
+            for turn in re.findall(r'^Turn (\d+):', prompt, re.MULTILINE)
+        ])
+    return "7 - Fake analysis of the answer."
+
+
+class FakeProviderClient(BaseProviderClient):
+    """Deterministic offline backend for tests and local development; records every request"""
+
+    PROVIDER = 'fake'
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def _chat(self, messages, max_tokens, temperature, model):
+        self.requests.append(('chat', messages[-1]['content']))
+        return fake_chat_reply(messages[-1]['content'])
+
+    def _transcribe(self, audio_file, language):
+        self.requests.append(('transcribe', language))
+        return "Fake transcript of the candidate answer."
+
+    def _speech(self, text, voice, model):
+        self.requests.append(('speech', text))
+        return f"FAKEAUDIO:{voice}:{text}".encode()
+
+
+class BaseAsyncProviderClient:
+    """
+    Coroutine counterpart of BaseProviderClient for the async interview
+    runner: the same per-endpoint limits (asyncio semaphores, so waiting
+    costs no thread), histograms and shared circuit breakers. Bound to the
+    event loop it is created on; close with aclose().
+    """
+
+    PROVIDER = 'openai'
+    ENDPOINTS = BaseProviderClient.ENDPOINTS
+
+    def __init__(self):
+        limits = getattr(settings, 'AI_PROVIDER_ASYNC_ENDPOINTS', getattr(settings, 'AI_PROVIDER_ENDPOINTS', {}))
+        self.queue_timeout = getattr(settings, 'AI_PROVIDER_QUEUE_TIMEOUT', 5)
+        self._slots = {
+            endpoint: asyncio.Semaphore(limits.get(endpoint, {}).get('max_concurrent', 4))
+            for endpoint in self.ENDPOINTS
+        }
+        self._latency = {endpoint: LatencyHistogram() for endpoint in self.ENDPOINTS}
+        self._breakers = {endpoint: CircuitBreaker(f"{self.PROVIDER}.{endpoint}") for endpoint in self.ENDPOINTS}
+
+    @asynccontextmanager
+    async def _call(self, endpoint):
+        # Breaker state is a Redis round trip, so it runs off the event loop
+        breaker = self._breakers[endpoint]
+        probe = await asyncio.to_thread(breaker.check)
+        try:
+            await asyncio.wait_for(self._slots[endpoint].acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise ProviderBusyError(f"No free {endpoint} slot after {self.queue_timeout}s")
+        started, failed = time.monotonic(), False
+        try:
+            yield
+        except Exception as e:
+            failed = True
+            if is_provider_failure(e):
+                await asyncio.to_thread(breaker.record_failure)
+            raise
+        else:
+            if probe:
+                await asyncio.to_thread(breaker.record_success)
+        finally:
+            self._latency[endpoint].observe(time.monotonic() - started, error=failed)
+            self._slots[endpoint].release()
+
+    async def chat(self, messages, max_tokens=None, temperature=None, model=None):
+        async with self._call('chat'):
+            return await self._chat(messages, max_tokens, temperature, model or settings.OPENAI_MODEL)
+
+    async def transcribe(self, audio_file, language='en'):
+        async with self._call('transcribe'):
+            return await self._transcribe(audio_file, language)
+
+    async def speech(self, text, voice, model='tts-1'):
+        async with self._call('speech'):
+            return await self._speech(text, voice, model)
+
+    def stats(self):
+        return {
+            endpoint: dict(histogram.snapshot(), breaker=self._breakers[endpoint].state)
+            for endpoint, histogram in self._latency.items()
+        }
+
+    async def aclose(self):
+        pass
+
+
+class AsyncOpenAIProviderClient(BaseAsyncProviderClient):
+    """AsyncOpenAI over one httpx.AsyncClient pool"""
+
+    def __init__(self):
+        super().__init__()
+        import httpx
+        from openai import AsyncOpenAI
+
+        limits = getattr(settings, 'AI_PROVIDER_ASYNC_ENDPOINTS', getattr(settings, 'AI_PROVIDER_ENDPOINTS', {}))
+        max_connections = sum(limits.get(endpoint, {}).get('max_concurrent', 4) for endpoint in self.ENDPOINTS)
+        self.connect_timeout = getattr(settings, 'AI_PROVIDER_CONNECT_TIMEOUT', 3)
+        timeout = httpx.Timeout(30, connect=self.connect_timeout)
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=getattr(settings, 'OPENAI_BASE_URL', '') or None,
+            timeout=timeout,
+            max_retries=0,
+            http_client=self._http
+        )
+
+    def _timeout(self, endpoint):
+        import httpx
+        return httpx.Timeout(BaseProviderClient.read_timeout(endpoint), connect=self.connect_timeout)
+
+    async def _chat(self, messages, max_tokens, temperature, model):
+        kwargs = {'max_tokens': max_tokens} if max_tokens else {}
+        if temperature is not None:
+            kwargs['temperature'] = temperature
+        response = await self.client.chat.completions.create(
+            model=model, messages=messages, timeout=self._timeout('chat'), **kwargs
+        )
+        return response.choices[0].message.content.strip()
+
+    async def _transcribe(self, audio_file, language):
+        transcript = await self.client.audio.transcriptions.create(
+            model="whisper-1", file=audio_file, language=language, timeout=self._timeout('transcribe')
+        )
+        return transcript.text
+
+    async def _speech(self, text, voice, model):
+        response = await self.client.audio.speech.create(
+            model=model, voice=voice, input=text, timeout=self._timeout('speech')
+        )
+        return response.content
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+class AsyncFakeProviderClient(BaseAsyncProviderClient):
+    """Async FakeProviderClient; records every request"""
+
+    PROVIDER = 'fake'
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def _chat(self, messages, max_tokens, temperature, model):
+        self.requests.append(('chat', messages[-1]['content']))
+        return fake_chat_reply(messages[-1]['content'])
+
+    async def _transcribe(self, audio_file, language):
+        self.requests.append(('transcribe', language))
+        return "Fake transcript of the candidate answer."
+
+    async def _speech(self, text, voice, model):
+        self.requests.append(('speech', text))
+        return f"FAKEAUDIO:{voice}:{text}".encode()
+
+
+def create_async_provider_client():
+    """New async client for the configured AI_PROVIDER_BACKEND, bound to the running event loop"""
+    if getattr(settings, 'AI_PROVIDER_BACKEND', 'openai') == 'fake':
+        return AsyncFakeProviderClient()
+    return AsyncOpenAIProviderClient()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_provider_client():
+    """Shared client for the configured AI_PROVIDER_BACKEND ('openai' or 'fake'), created on first use"""
+    backend = getattr(settings, 'AI_PROVIDER_BACKEND', 'openai')
+    with _clients_lock:
+        if backend not in _clients:
+            _clients[backend] = FakeProviderClient() if backend == 'fake' else OpenAIProviderClient()
+        return _clients[backend]
+
+
+def reset_provider_clients():
+    """Drop the shared clients so the next get_provider_client() reads current settings"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client._hedge_pool.shutdown(wait=False)
+
+
+@receiver(setting_changed)
+def _reset_on_setting_changed(setting, **kwargs):
+    # override_settings in tests: limits and timeouts are read when a client is built
+    if setting.startswith(('AI_PROVIDER_', 'OPENAI_')):
+        reset_provider_clients()
+
+
+_http_session = None
+
+
+def get_http_session():
+    """Process-wide requests session with a keep-alive pool (recording downloads)"""
+    global _http_session
+    with _clients_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=getattr(settings, 'HTTP_POOL_MAXSIZE', 16))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
@@ -0,0 +1,214 @@
+"""
+Local OpenAI/Twilio stand-in for load tests - the REST subset the AI call pipeline uses
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Per-endpoint latency (lognormal, seconds), error rate (share of 500s) and
+# rate limit (requests per second, then 429s; None = unlimited)
+DEFAULT_PROFILE = {
+    'chat': {'median': 0.8, 'p99': 3.0, 'error_rate': 0.0, 'rate_per_second': None},
+    'transcribe': {'median': 1.2, 'p99': 4.0, 'error_rate': 0.0, 'rate_per_second': None},
+    'speech': {'median': 0.4, 'p99': 1.5, 'error_rate': 0.0, 'rate_per_second': None},
+    'calls': {'median': 0.15, 'p99': 0.6, 'error_rate': 0.0, 'rate_per_second': None},
+    'recording': {'median': 0.05, 'p99': 0.2, 'error_rate': 0.0, 'rate_per_second': None},
+}
+
+RECORDING_BYTES = 32 * 1024
+
+
+def make_profile(error_rate=None, rate_per_second=None, overrides=None):
+    """Profile overrides: one error rate / rate limit for every endpoint, then per-endpoint values"""
+    profile = {}
+    for endpoint in DEFAULT_PROFILE:
+        values = profile.setdefault(endpoint, {})
+        if error_rate is not None:
+            values['error_rate'] = error_rate
+        if rate_per_second is not None:
+            values['rate_per_second'] = rate_per_second or None
+        values.update((overrides or {}).get(endpoint, {}))
+    return profile
+
+
+ROUTES = [
+    ('POST', re.compile(r'^/v1/chat/completions$'), 'chat'),
+    ('POST', re.compile(r'^/v1/audio/transcriptions$'), 'transcribe'),
+    ('POST', re.compile(r'^/v1/audio/speech$'), 'speech'),
+    ('POST', re.compile(r'^/2010-04-01/Accounts/(?P<account>\w+)/Calls\.json$'), 'calls'),
+    ('GET', re.compile(r'^/2010-04-01/Accounts/(?P<account>\w+)/Calls/(?P<sid>\w+)\.json$'), 'calls'),
+    ('GET', re.compile(r'^/recordings/(?P<name>[\w-]+)\.mp3$'), 'recording'),
+]
+
+
+class _ProviderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        path = self.path.split('?', 1)[0]
+        for route_method, pattern, endpoint in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            return self._send(404, {'error': {'message': f'No stub for {method} {path}'}}, 'none')
+
+        server = self.server
+        allowed, retry_after = server.take(endpoint)
+        if not allowed:
+            return self._send(429, {'error': {
+                'message': 'Rate limit reached', 'type': 'requests', 'code': 'rate_limit_exceeded'
+            }}, endpoint, headers={'Retry-After': str(max(1, math.ceil(retry_after)))})
+
+        time.sleep(server.sample_latency(endpoint))
+        if server.rng_random() < server.profile[endpoint]['error_rate']:
+            return self._send(500, {'error': {'message': 'Stub server error', 'type': 'server_error'}}, endpoint)
+
+        handler = getattr(self, f'_{endpoint}')
+        handler(body, **match.groupdict())
+
+    def _send(self, status, payload, endpoint, content_type='application/json', headers=None):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(endpoint, status)
+
+    def _chat(self, body):
+        from common.utils.provider_client import fake_chat_reply
+
+        request = json.loads(body or b'{}')
+        content = fake_chat_reply(request.get('messages', [{}])[-1].get('content', ''))
+        self._send(200, {
+            'id': f'chatcmpl-{uuid.uuid4().hex}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': len(body) // 4, 'completion_tokens': len(content) // 4,
+                      'total_tokens': (len(body) + len(content)) // 4},
+        }, 'chat')
+
+    def _transcribe(self, body):
+        self._send(200, {'text': 'Stub transcript of the candidate answer.'}, 'transcribe')
+
+    def _speech(self, body):
+        request = json.loads(body or b'{}')
+        audio = f"FAKEAUDIO:{request.get('voice')}:{request.get('input', '')}".encode()
+        self._send(200, audio, 'speech', content_type='audio/mpeg')
+
+    def _calls(self, body, account, sid=None):
+        now = formatdate(usegmt=True)
+        self._send(201 if sid is None else 200, {
+            'sid': sid or f'CA{uuid.uuid4().hex}',
+            'account_sid': account,
+            'status': 'queued' if sid is None else 'completed',
+            'direction': 'outbound-api',
+            'date_created': now,
+            'date_updated': now,
+        }, 'calls')
+
+    def _recording(self, body, name):
+        # Distinct bytes per recording, so content-hash caches miss like real audio
+        prefix = f"FAKEAUDIO:recording:{name}:".encode()
+        self._send(200, prefix + b'\0' * (RECORDING_BYTES - len(prefix)), 'recording', content_type='audio/mpeg')
+
+
+class LocalProviderServer(ThreadingHTTPServer):
+    """
+    In-process HTTP stand-in for the OpenAI and Twilio APIs
+    profile: per-endpoint overrides of DEFAULT_PROFILE
+    latency_scale: multiplier for every sampled latency (0 = no delay)
+    Point the backend at it with OPENAI_BASE_URL=<url>/v1 and TWILIO_API_BASE_URL=<url>.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, host='127.0.0.1', port=0, profile=None, latency_scale=1.0, seed=None):
+        super().__init__((host, port), _ProviderHandler)
+        self.profile = {endpoint: dict(values) for endpoint, values in DEFAULT_PROFILE.items()}
+        for endpoint, values in (profile or {}).items():
+            self.profile[endpoint].update(values)
+        self.latency_scale = latency_scale
+        self.counts = {}  # endpoint -> {status: requests}
+        self._buckets = {}  # endpoint -> (tokens, updated_at)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.port}"
+
+    def rng_random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def sample_latency(self, endpoint):
+        """Lognormal with the endpoint's median and 99th percentile"""
+        config = self.profile[endpoint]
+        if not self.latency_scale or config['median'] <= 0:
+            return 0
+        sigma = math.log(max(config['p99'], config['median']) / config['median']) / 2.326
+        with self._lock:
+            sample = self._rng.lognormvariate(math.log(config['median']), sigma)
+        return sample * self.latency_scale
+
+    def take(self, endpoint):
+        """Token bucket per endpoint; returns (allowed, seconds until the next token)"""
+        rate = self.profile[endpoint]['rate_per_second']
+        if not rate:
+            return True, 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(endpoint, (rate, now))
+            tokens = min(rate, tokens + (now - updated_at) * rate)
+            if tokens >= 1:
+                self._buckets[endpoint] = (tokens - 1, now)
+                return True, 0
+            self._buckets[endpoint] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+    def count(self, endpoint, status):
+        with self._lock:
+            statuses = self.counts.setdefault(endpoint, {})
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {endpoint: dict(statuses) for endpoint, statuses in self.counts.items()}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
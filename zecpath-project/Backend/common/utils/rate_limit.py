@@ -0,0 +1,148 @@
+"""
+Distributed token buckets and counting semaphores (Redis or in-process)
+"""
+import threading
+import time
+from django.conf import settings
+
+
+class LocalRateLimiter:
+    """In-process stand-in for RedisRateLimiter (tests and single-process development)"""
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._slots = {}    # key -> {holder: expires_at}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate_per_minute, tokens=1, burst=None):
+        """Take tokens if available; returns (allowed, seconds until they would be)"""
+        capacity = burst or rate_per_minute
+        rate = rate_per_minute / 60.0
+        now = time.monotonic()
+        with self._lock:
+            available, updated_at = self._buckets.get(key, (capacity, now))
+            available = min(capacity, available + (now - updated_at) * rate)
+            if available >= tokens:
+                self._buckets[key] = (available - tokens, now)
+                return True, 0.0
+            self._buckets[key] = (available, now)
+            return False, (tokens - available) / rate
+
+    def available(self, key, rate_per_minute, burst=None):
+        """Tokens currently in the bucket"""
+        capacity = burst or rate_per_minute
+        now = time.monotonic()
+        with self._lock:
+            available, updated_at = self._buckets.get(key, (capacity, now))
+            return min(capacity, available + (now - updated_at) * rate_per_minute / 60.0)
+
+    def acquire_slot(self, key, limit, holder, ttl):
+        """Hold one of `limit` slots until release or ttl seconds; re-acquiring refreshes"""
+        holder = str(holder)
+        now = time.monotonic()
+        with self._lock:
+            slots = {h: exp for h, exp in self._slots.get(key, {}).items() if exp > now}
+            if holder in slots or len(slots) < limit:
+                slots[holder] = now + ttl
+                self._slots[key] = slots
+                return True
+            self._slots[key] = slots
+            return False
+
+    def release_slot(self, key, holder):
+        with self._lock:
+            self._slots.get(key, {}).pop(str(holder), None)
+
+    def slots_in_use(self, key):
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for exp in self._slots.get(key, {}).values() if exp > now)
+
+
+class RedisRateLimiter:
+    """Token buckets as hashes and semaphores as sorted sets, updated atomically in Lua"""
+
+    TAKE_SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local requested = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local allowed = 0
+    local wait = 0
+    if tokens >= requested then
+        tokens = tokens - requested
+        allowed = 1
+    else
+        wait = (requested - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    return {allowed, tostring(wait), tostring(tokens)}
+    """
+
+    ACQUIRE_SCRIPT = """
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local limit = tonumber(ARGV[1])
+    local ttl = tonumber(ARGV[3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+    if redis.call('ZSCORE', KEYS[1], ARGV[2]) or redis.call('ZCARD', KEYS[1]) < limit then
+        redis.call('ZADD', KEYS[1], now + ttl, ARGV[2])
+        redis.call('EXPIRE', KEYS[1], math.ceil(ttl) + 60)
+        return 1
+    end
+    return 0
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._take = client.register_script(self.TAKE_SCRIPT)
+        self._acquire = client.register_script(self.ACQUIRE_SCRIPT)
+
+    def take(self, key, rate_per_minute, tokens=1, burst=None):
+        allowed, wait, _ = self._take(
+            keys=[f"ratelimit:bucket:{key}"],
+            args=[rate_per_minute / 60.0, burst or rate_per_minute, tokens]
+        )
+        return bool(allowed), float(wait)
+
+    def available(self, key, rate_per_minute, burst=None):
+        _, _, tokens = self._take(
+            keys=[f"ratelimit:bucket:{key}"],
+            args=[rate_per_minute / 60.0, burst or rate_per_minute, 0]
+        )
+        return float(tokens)
+
+    def acquire_slot(self, key, limit, holder, ttl):
+        return bool(self._acquire(keys=[f"ratelimit:slots:{key}"], args=[limit, str(holder), ttl]))
+
+    def release_slot(self, key, holder):
+        self.client.zrem(f"ratelimit:slots:{key}", str(holder))
+
+    def slots_in_use(self, key):
+        return self.client.zcount(f"ratelimit:slots:{key}", time.time(), '+inf')
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Shared limiter for the configured RATE_LIMIT_BACKEND"""
+    backend = getattr(settings, 'RATE_LIMIT_BACKEND', 'local')
+    with _limiters_lock:
+        if backend not in _limiters:
+            if backend == 'redis':
+                import redis
+                client = redis.Redis.from_url(
+                    settings.RATE_LIMIT_URL, socket_timeout=2, socket_connect_timeout=2
+                )
+                _limiters[backend] = RedisRateLimiter(client)
+            else:
+                _limiters[backend] = LocalRateLimiter()
+        return _limiters[backend]
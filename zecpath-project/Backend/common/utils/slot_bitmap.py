@@ -0,0 +1,106 @@
+"""
+Per-day occupancy bitmaps - one bit per fixed-length slot (Redis or in-process)
+"""
+import threading
+from django.conf import settings
+
+
+class LocalSlotBitmap:
+    """In-process stand-in for RedisSlotBitmap (tests and single-process development)"""
+
+    def __init__(self):
+        self._days = {}  # day key -> (bytearray, {set bit: next candidate bit})
+        self._lock = threading.Lock()
+
+    def claim(self, day, start, end, expires_at):
+        """Set and return the first clear bit in [start, end), or None; the day is kept until expires_at"""
+        with self._lock:
+            bits, skip = self._days.setdefault(day, (bytearray(), {}))
+
+            # Follow skip pointers over runs of set bits, compressing the path
+            # so repeated claims cost amortized O(1)
+            index, path = start, []
+            while index in skip:
+                path.append(index)
+                index = skip[index]
+            for visited in path:
+                skip[visited] = index
+            if index >= end:
+                return None
+
+            byte = index >> 3
+            if byte >= len(bits):
+                bits.extend(bytes(byte - len(bits) + 1))
+            bits[byte] |= 0x80 >> (index & 7)
+            skip[index] = index + 1
+            return index
+
+    def count(self, day):
+        with self._lock:
+            bits = self._days.get(day, (bytearray(), {}))[0]
+            return sum(bin(byte).count('1') for byte in bits)
+
+
+class RedisSlotBitmap:
+    """Redis string bitmaps; BITPOS finds the first free slot, claims are atomic in Lua"""
+
+    CLAIM_SCRIPT = """
+    local start = tonumber(ARGV[1])
+    local stop = tonumber(ARGV[2])
+    local index = start
+    -- Bits before the first whole byte are checked one by one
+    while index < stop and index % 8 ~= 0 do
+        if redis.call('GETBIT', KEYS[1], index) == 0 then
+            redis.call('SETBIT', KEYS[1], index, 1)
+            redis.call('EXPIREAT', KEYS[1], ARGV[3])
+            return index
+        end
+        index = index + 1
+    end
+    if index >= stop then
+        return -1
+    end
+    local pos = index
+    -- Bits past the end of the string are clear; BITPOS only searches inside it
+    if math.floor(index / 8) < redis.call('STRLEN', KEYS[1]) then
+        pos = redis.call('BITPOS', KEYS[1], 0, math.floor(index / 8))
+    end
+    if pos < 0 or pos >= stop then
+        return -1
+    end
+    redis.call('SETBIT', KEYS[1], pos, 1)
+    redis.call('EXPIREAT', KEYS[1], ARGV[3])
+    return pos
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._claim = client.register_script(self.CLAIM_SCRIPT)
+
+    def claim(self, day, start, end, expires_at):
+        # An absolute expiry: a bitmap for a day weeks ahead must outlive that day
+        index = self._claim(keys=[f"slots:{day}"], args=[start, end, int(expires_at.timestamp())])
+        return None if index < 0 else index
+
+    def count(self, day):
+        return self.client.bitcount(f"slots:{day}")
+
+
+_bitmaps = {}
+_bitmaps_lock = threading.Lock()
+
+
+def get_slot_bitmap():
+    """Shared bitmap store for the configured RATE_LIMIT_BACKEND"""
+    backend = getattr(settings, 'RATE_LIMIT_BACKEND', 'local')
+    with _bitmaps_lock:
+        if backend not in _bitmaps:
+            if backend == 'redis':
+                import redis
+                client = redis.Redis.from_url(
+                    settings.RATE_LIMIT_URL, socket_timeout=2, socket_connect_timeout=2
+                )
+                _bitmaps[backend] = RedisSlotBitmap(client)
+            else:
+                _bitmaps[backend] = LocalSlotBitmap()
+        return _bitmaps[backend]
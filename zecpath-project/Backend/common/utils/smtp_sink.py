@@ -0,0 +1,74 @@
+"""
+Local SMTP stand-in for benchmarks - accepts and discards mail
+"""
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for Django's smtp backend"""
+
+    def _reply(self, line):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connection_count += 1
+        self._reply("220 localhost ESMTP sink")
+
+        in_data = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    self.server.message_count += 1
+                    self._reply("250 OK queued")
+                continue
+
+            command = line.decode(errors='ignore').strip().upper()
+            if command.startswith('EHLO'):
+                self._reply("250-localhost\r\n250 8BITMIME")
+            elif command.startswith('DATA'):
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command.startswith('QUIT'):
+                self._reply("221 Bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET, NOOP
+                self._reply("250 OK")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    In-process SMTP sink
+    latency: seconds added to every reply to simulate a remote relay
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0):
+        super().__init__((host, port), _SMTPHandler)
+        self.latency = latency
+        self.connection_count = 0
+        self.message_count = 0
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import CustomUser, Application, ApplicationStatusHistory, AuditLog, EmailLog
-from .ai_call_models import AICallQueue, AIInterviewSession, AIConversationTurn, AICallTranscript
+from .ai_call_models import AICallQueue, AICallEvent, AIInterviewSession, AIConversationTurn, AICallTranscript
 from .question_models import QuestionTemplate, QuestionFlow, InterviewState
 from .interview_models import AvailabilitySlot, InterviewSchedule
 from .reminder_models import InterviewReminder
+from .notification_models import NotificationOutbox, EmployerDigestEvent
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
@@ -58,9 +59,16 @@ class EmailLogAdmin(admin.ModelAdmin):
 class AICallQueueAdmin(admin.ModelAdmin):
     list_display = ['id', 'application', 'status', 'trigger_reason', 'call_outcome', 'scheduled_at', 'completed_at']
     list_filter = ['status', 'trigger_reason', 'call_outcome', 'scheduled_at']
-    search_fields = ['application__candidate__user__email', 'application__job__title']
+    search_fields = ['application__candidate__user__email', 'application__job__title', 'call_sid']
     readonly_fields = ['created_at', 'started_at', 'completed_at']
 
+@admin.register(AICallEvent)
+class AICallEventAdmin(admin.ModelAdmin):
+    list_display = ['call_sid', 'call_queue', 'status', 'sequence_number', 'received_at']
+    list_filter = ['status']
+    search_fields = ['call_sid']
+    readonly_fields = ['created_at']
+
 @admin.register(AIInterviewSession)
 class AIInterviewSessionAdmin(admin.ModelAdmin):
     list_display = ['session_id', 'call_queue', 'total_questions', 'total_answers', 'created_at']
@@ -114,4 +122,17 @@ class InterviewReminderAdmin(admin.ModelAdmin):
     list_display = ['schedule', 'reminder_type', 'status', 'scheduled_at', 'sent_at', 'retry_count']
     list_filter = ['reminder_type', 'status', 'scheduled_at']
     search_fields = ['schedule__application__candidate__user__email']
-    readonly_fields = ['created_at', 'sent_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'sent_at']
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['application', 'event', 'status', 'attempts', 'created_at', 'processed_at']
+    list_filter = ['event', 'status', 'created_at']
+    search_fields = ['application__candidate__user__email', 'application__job__title']
+    readonly_fields = ['created_at', 'claimed_at', 'processed_at']
+
+@admin.register(EmployerDigestEvent)
+class EmployerDigestEventAdmin(admin.ModelAdmin):
+    list_display = ['employer', 'job', 'application', 'match_score', 'created_at']
+    search_fields = ['employer__company_name', 'job__title']
+    readonly_fields = ['created_at']
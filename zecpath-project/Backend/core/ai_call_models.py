@@ -4,6 +4,7 @@ from core.models import Application, CustomUser
 class AICallQueue(models.Model):
     STATUS_CHOICES = [
         ('queued', 'Queued'),
+        ('dispatching', 'Dispatching'),
         ('in_progress', 'In Progress'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
@@ -25,6 +26,9 @@ class AICallQueue(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='ai_calls')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
     scheduled_at = models.DateTimeField(db_index=True)
+    dispatch_key = models.CharField(max_length=64, unique=True, null=True, blank=True)  # Idempotency key of the current dispatch
+    call_sid = models.CharField(max_length=64, unique=True, null=True, blank=True)  # Twilio CallSid
+    claimed_at = models.DateTimeField(null=True, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     retry_count = models.IntegerField(default=0)
@@ -51,6 +55,24 @@ class AICallQueue(models.Model):
         return f"AI Call - {self.application} - {self.status}"
 
 
+class AICallEvent(models.Model):
+    """Twilio status callback log, written in bulk by CallStatusService.flush"""
+    call_queue = models.ForeignKey(AICallQueue, on_delete=models.CASCADE, null=True, blank=True, related_name='events')
+    call_sid = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20)
+    sequence_number = models.IntegerField(null=True, blank=True)  # Twilio SequenceNumber
+    call_duration = models.IntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    received_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['received_at']
+    
+    def __str__(self):
+        return f"{self.call_sid} - {self.status}"
+
+
 class AIInterviewSession(models.Model):
     call_queue = models.OneToOneField(AICallQueue, on_delete=models.CASCADE, related_name='session')
     session_id = models.CharField(max_length=100, unique=True, db_index=True)
@@ -60,6 +82,7 @@ class AIInterviewSession(models.Model):
     total_answers = models.IntegerField(default=0)
     overall_score = models.FloatField(null=True, blank=True)  # Day 37
     category_scores = models.JSONField(default=dict, blank=True)  # Day 37
+    stage_timings = models.JSONField(default=dict, blank=True)  # Voice turn pipeline latencies
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
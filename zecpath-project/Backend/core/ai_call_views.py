@@ -94,6 +94,7 @@ class AICallStatsAPI(APIView):
         stats = {
             'total': calls.count(),
             'queued': calls.filter(status='queued').count(),
+            'dispatching': calls.filter(status='dispatching').count(),
             'in_progress': calls.filter(status='in_progress').count(),
             'completed': calls.filter(status='completed').count(),
             'failed': calls.filter(status='failed').count(),
@@ -103,6 +104,12 @@ class AICallStatsAPI(APIView):
             ).aggregate(avg=models.Avg('call_duration'))['avg'] or 0
         }
         
+        if request.user.role == 'admin':
+            from common.services.ai_call_dispatcher import AICallDispatcher
+            stats['dispatcher'] = AICallDispatcher.stats()
+            from common.utils.provider_client import get_provider_client
+            stats['providers'] = get_provider_client().stats()
+        
         return Response(stats)
 
 
@@ -72,13 +72,9 @@ class InterviewScheduleAPI(APIView):
             if error:
                 return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Send notifications
+            # Send notifications (reminders are created by the scheduler)
             EmailService.send_interview_scheduled(schedule)
             
-            # Create reminders
-            from common.tasks_reminders import create_reminders_for_new_interview
-            create_reminders_for_new_interview.delay(schedule.id)
-            
             return Response({
                 'message': 'Interview scheduled',
                 'schedule_id': schedule.id,
@@ -200,15 +196,9 @@ class InterviewRescheduleAPI(APIView):
             if error:
                 return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Send notification
+            # Send notification (the scheduler moved the reminders)
             EmailService.send_interview_rescheduled(new_schedule)
             
-            # Cancel old reminders and create new ones
-            from common.services.reminder_service import ReminderService
-            from common.tasks_reminders import create_reminders_for_new_interview
-            ReminderService.cancel_reminders(schedule)
-            create_reminders_for_new_interview.delay(new_schedule.id)
-            
             return Response({
                 'message': 'Interview rescheduled',
                 'new_schedule_id': new_schedule.id,
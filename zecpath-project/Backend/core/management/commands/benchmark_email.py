@@ -0,0 +1,64 @@
+import time
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from core.models import EmailLog
+from common.services.email_service import EmailService
+from common.services.email_templates import EmailTemplateRegistry
+from common.utils.smtp_sink import LocalSMTPServer
+
+
+class Command(BaseCommand):
+    help = 'Compare per-message and batched email sending against a local SMTP sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Messages per run')
+        parser.add_argument('--latency', type=float, default=0.005, help='Simulated SMTP reply latency (seconds)')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        server = LocalSMTPServer(latency=options['latency']).start()
+
+        messages = [{
+            'recipient': f'candidate{i}@bench.local',
+            'subject': 'Benchmark - Application Submitted',
+            'template_name': 'application_submitted',
+            'context': {
+                'candidate_name': f'Candidate {i}',
+                'job_title': 'Benchmark Engineer',
+                'company_name': 'ZecPath',
+                'applied_date': 'January 01, 2026',
+            },
+        } for i in range(count)]
+
+        smtp_settings = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': '127.0.0.1',
+            'EMAIL_PORT': server.port,
+            'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+
+        try:
+            with override_settings(**smtp_settings):
+                self.stdout.write(f'Sending {count} emails per run (latency {options["latency"]}s)...')
+
+                start = time.perf_counter()
+                for message in messages:
+                    EmailService.send_batch([message], retry=False)
+                single_time = time.perf_counter() - start
+                single_connections = server.connection_count
+
+                start = time.perf_counter()
+                EmailService.send_batch(messages, retry=False)
+                batch_time = time.perf_counter() - start
+                batch_connections = server.connection_count - single_connections
+        finally:
+            server.stop()
+            EmailLog.objects.filter(recipient__endswith='@bench.local').delete()
+
+        self.stdout.write(f'Per-message: {single_time:.2f}s, {single_connections} SMTP connections')
+        self.stdout.write(f'Batched:     {batch_time:.2f}s, {batch_connections} SMTP connections')
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {single_time / max(batch_time, 1e-9):.1f}x'))
+        for name, stats in EmailTemplateRegistry.metrics().items():
+            self.stdout.write(f"Render {name}: {stats['renders']} renders, avg {stats['avg_ms']}ms, max {stats['max_ms']}ms")
@@ -0,0 +1,222 @@
+import copy
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from core.models import CustomUser, Application
+from core.ai_call_models import AICallQueue, AIInterviewSession
+from candidates.models import Candidate
+from employers.models import Job
+from common.utils.provider_stub import LocalProviderServer, make_profile
+
+
+class Command(BaseCommand):
+    help = 'Drive simulated AI interviews end to end against the local OpenAI/Twilio stand-in'
+
+    EMAIL_DOMAIN = 'loadtest.local'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interviews', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=50, help='Concurrent interviews (stand-in for Celery slots)')
+        parser.add_argument('--provider-url', default='', help='Use a running stub (run_provider_stub) instead of an in-process one')
+        parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiplier for stub latencies (0 = none)')
+        parser.add_argument('--error-rate', type=float, default=None, help='Share of stub requests answered with 500')
+        parser.add_argument('--rate-limit', type=float, default=None, help='Stub requests per second per endpoint before 429s')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated candidates, calls and sessions')
+
+    def handle(self, *args, **options):
+        from Backend.celery import app
+
+        server = None
+        if options['provider_url']:
+            provider_url = options['provider_url'].rstrip('/')
+        else:
+            server = LocalProviderServer(
+                profile=make_profile(options['error_rate'], options['rate_limit']),
+                latency_scale=options['latency_scale'],
+            ).start()
+            provider_url = server.url
+
+        tts_dir = tempfile.mkdtemp(prefix='loadtest-tts-')
+        # Breakers, limiter slots, hot call records and shared cache entries stay in this
+        # process: stub errors must not trip the production breakers or hold real dispatch
+        caches = copy.deepcopy(settings.CACHES)
+        caches['shared'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'loadtest-shared'}
+        stub_settings = {
+            'CIRCUIT_BREAKER_BACKEND': 'local',
+            'RATE_LIMIT_BACKEND': 'local',
+            'HOT_STORE_BACKEND': 'local',
+            'CACHES': caches,
+            'AI_PROVIDER_BACKEND': 'openai',
+            'OPENAI_API_KEY': 'stub-key',
+            'OPENAI_BASE_URL': f'{provider_url}/v1',
+            'TWILIO_API_BASE_URL': provider_url,
+            'TTS_CACHE_DIR': tts_dir,  # Cold audio cache, like a fresh deploy
+        }
+        stub_env = {
+            'TWILIO_ACCOUNT_SID': 'AC' + '0' * 32,
+            'TWILIO_AUTH_TOKEN': 'stub-token',
+            'TWILIO_PHONE_NUMBER': '+15550000000',
+        }
+        saved_env = {name: os.environ.get(name) for name in stub_env}
+        os.environ.update(stub_env)
+        # Signals queue Celery work (question cache warm-up); run it inline
+        always_eager, app.conf.task_always_eager = app.conf.task_always_eager, True
+
+        try:
+            with override_settings(**stub_settings):
+                self.stdout.write(f"Provider stub: {provider_url}")
+                calls = self._create_calls(options['interviews'])
+                report = self._run(calls, options['workers'], provider_url)
+                self._report(report, [call_id for call_id, _ in calls], server)
+        finally:
+            app.conf.task_always_eager = always_eager
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            shutil.rmtree(tts_dir, ignore_errors=True)
+            if server:
+                server.stop()
+            if not options['keep']:
+                CustomUser.objects.filter(email__endswith=f'@{self.EMAIL_DOMAIN}').delete()
+
+    def _create_calls(self, count):
+        """
+        One job and `count` candidates, applications and calls (bulk, no
+        signals). Calls are created already claimed, with their own dispatch
+        keys, so the dispatcher never hands out real queued calls here.
+        """
+        employer_user = CustomUser.objects.create_user(
+            email=f'employer-{int(time.time())}@{self.EMAIL_DOMAIN}', password=None, role='employer'
+        )
+        job = Job.objects.create(
+            employer=employer_user.employer, title='Load Test Engineer', description='Load test',
+            location='Remote', skills=['python', 'django']
+        )
+
+        stamp, password = int(time.time()), make_password(None)
+        users = CustomUser.objects.bulk_create([
+            CustomUser(email=f'candidate-{stamp}-{n}@{self.EMAIL_DOMAIN}', role='candidate', password=password)
+            for n in range(count)
+        ])
+        candidates = Candidate.objects.bulk_create([Candidate(user=user) for user in users])
+        applications = Application.objects.bulk_create([
+            Application(candidate=candidate, job=job) for candidate in candidates
+        ])
+        now = timezone.now()
+        calls = AICallQueue.objects.bulk_create([
+            AICallQueue(
+                application=application, scheduled_at=now, status='dispatching',
+                claimed_at=now, dispatch_key=f'loadtest-{stamp}-{n}'
+            )
+            for n, application in enumerate(applications)
+        ])
+        self.stdout.write(f"Created {len(calls)} dispatched calls")
+        return [(call.id, call.dispatch_key) for call in calls]
+
+    def _run(self, calls, workers, provider_url):
+        from common.services.ai_bridge_service import STTService
+        from common.services.voice_call_service import TwilioCallService
+        from common.tasks_ai_calls import execute_ai_call_task
+
+        samples = {'queue_wait': [], 'dial': [], 'interview': [], 'transcribe': []}
+        outcomes = {}
+        lock = threading.Lock()
+
+        def run_interview(call_id, dispatch_key, queued_at):
+            timings = {'queue_wait': time.monotonic() - queued_at}
+            try:
+                # Candidates carry no phone number yet, so the task places no
+                # call; dial and one answer recording per interview here
+                started = time.monotonic()
+                _, error = TwilioCallService.initiate_call('+15551230000', f'{provider_url}/twiml')
+                timings['dial'] = time.monotonic() - started
+
+                started = time.monotonic()
+                result = execute_ai_call_task(call_id, dispatch_key)
+                timings['interview'] = time.monotonic() - started
+
+                started = time.monotonic()
+                _, stt_error = STTService.transcribe_audio(f'{provider_url}/recordings/call-{call_id}.mp3')
+                timings['transcribe'] = time.monotonic() - started
+
+                status = result['status'] if not (error or stt_error) else f"{result['status']} (provider errors)"
+            except Exception as e:
+                status = f'error: {type(e).__name__}'
+            finally:
+                connection.close()
+
+            with lock:
+                outcomes[status] = outcomes.get(status, 0) + 1
+                for stage, seconds in timings.items():
+                    samples[stage].append(seconds)
+
+        self.stdout.write(f"Running {len(calls)} interviews on {workers} workers...")
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Everything is dispatched at once; queue wait is dispatch -> worker start
+            for call_id, dispatch_key in calls:
+                pool.submit(run_interview, call_id, dispatch_key, started)
+        elapsed = time.monotonic() - started
+
+        return {'elapsed': elapsed, 'samples': samples, 'outcomes': outcomes}
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def _report(self, report, call_ids, server):
+        from common.utils.provider_client import get_provider_client
+
+        elapsed, completed = report['elapsed'], report['outcomes'].get('completed', 0)
+        self.stdout.write(self.style.SUCCESS(
+            f"\n{completed}/{len(call_ids)} interviews completed in {elapsed:.1f}s: "
+            f"{completed / max(elapsed, 1e-9):.2f}/s ({completed * 60 / max(elapsed, 1e-9):.0f}/min)"
+        ))
+        self.stdout.write(f"Outcomes: {report['outcomes']}")
+
+        self.stdout.write('\nHarness stages (ms):        p50      p95      p99      max')
+        for stage, values in report['samples'].items():
+            self.stdout.write(
+                f"  {stage:<22}" + ''.join(
+                    f"{self._percentile(values, q) * 1000:>9.0f}" for q in (0.5, 0.95, 0.99, 1.0)
+                )
+            )
+
+        # Interview pipeline stages, from AIInterviewSession.stage_timings
+        stages = {}
+        for timings in AIInterviewSession.objects.filter(call_queue_id__in=call_ids).values_list('stage_timings', flat=True):
+            for stage, summary in (timings or {}).get('stages', {}).items():
+                totals = stages.setdefault(stage, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                totals['count'] += summary['count']
+                totals['total_ms'] += summary['avg_ms'] * summary['count']
+                totals['max_ms'] = max(totals['max_ms'], summary['max_ms'])
+        self.stdout.write('\nPipeline stages (ms):      count      avg      max')
+        for stage, totals in stages.items():
+            self.stdout.write(
+                f"  {stage:<22}{totals['count']:>9}{totals['total_ms'] / max(totals['count'], 1):>9.0f}{totals['max_ms']:>9.0f}"
+            )
+
+        self.stdout.write('\nProvider client:')
+        for endpoint, stats in get_provider_client().stats().items():
+            self.stdout.write(
+                f"  {endpoint:<12} {stats['count']} calls, {stats['errors']} errors, "
+                f"avg {stats['avg_seconds']}s, breaker {stats['breaker']}"
+            )
+        if server:
+            self.stdout.write('\nStub responses:')
+            for endpoint, statuses in server.stats().items():
+                self.stdout.write(f"  {endpoint:<12} {statuses}")
@@ -0,0 +1,26 @@
+import asyncio
+import signal
+from django.core.management.base import BaseCommand
+from common.services.ai_call_runner import AsyncAICallRunner
+
+
+class Command(BaseCommand):
+    help = 'Claim and run AI calls concurrently on one event loop: dials for live calls, whole interviews for simulated ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-interviews', type=int, default=None, help='Concurrent calls (default AI_ASYNC_MAX_INTERVIEWS)')
+        parser.add_argument('--db-threads', type=int, default=None, help='Database threads (default AI_ASYNC_DB_THREADS)')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds between claims while idle')
+
+    def handle(self, *args, **options):
+        runner = AsyncAICallRunner(options['max_interviews'], options['db_threads'])
+        self.stdout.write(f'Running up to {runner.max_concurrent} interviews at once (Ctrl+C to drain and stop)')
+        asyncio.run(self._serve(runner, options['poll_interval']))
+        self.stdout.write(self.style.SUCCESS('Runner stopped'))
+
+    async def _serve(self, runner, poll_interval):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await runner.serve(poll_interval=poll_interval, stop=stop)
@@ -0,0 +1,34 @@
+import json
+from django.core.management.base import BaseCommand
+from common.utils.provider_stub import LocalProviderServer, make_profile
+
+
+class Command(BaseCommand):
+    help = 'Serve the OpenAI/Twilio stand-in used for offline AI call load tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8900)
+        parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiplier for sampled latencies (0 = none)')
+        parser.add_argument('--error-rate', type=float, default=None, help='Share of requests answered with 500')
+        parser.add_argument('--rate-limit', type=float, default=None, help='Requests per second per endpoint before 429s')
+        parser.add_argument('--profile', default='{}', help='JSON per-endpoint overrides, e.g. {"chat": {"median": 2}}')
+
+    def handle(self, *args, **options):
+        server = LocalProviderServer(
+            host=options['host'],
+            port=options['port'],
+            profile=make_profile(options['error_rate'], options['rate_limit'], json.loads(options['profile'])),
+            latency_scale=options['latency_scale'],
+        )
+        self.stdout.write(f'Provider stub on {server.url}')
+        self.stdout.write(f'  OPENAI_BASE_URL={server.url}/v1')
+        self.stdout.write(f'  TWILIO_API_BASE_URL={server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            for endpoint, statuses in server.stats().items():
+                self.stdout.write(f'{endpoint}: {statuses}')
@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from common.services.reminder_service import ReminderService
+from common.tasks_reminders import send_reminder_batch_task
+
+
+class Command(BaseCommand):
+    help = 'Fire interview reminders from the delayed queue at their scheduled time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-wait', type=float, default=1.0,
+                            help='Longest sleep between queue checks (seconds)')
+
+    def handle(self, *args, **options):
+        max_wait = options['max_wait']
+        queue = ReminderService.queue()
+        self.stdout.write(f'Reminder dispatcher started ({type(queue).__name__})')
+
+        while True:
+            try:
+                reminder_ids = ReminderService.claim_queued()
+                if reminder_ids:
+                    try:
+                        send_reminder_batch_task.delay(reminder_ids)
+                    except Exception:
+                        ReminderService.release_claims(reminder_ids)
+                        raise
+                    self.stdout.write(f'Dispatched {len(reminder_ids)} reminders')
+                    continue
+
+                # Sleep until the next reminder is due, but wake up for newly added ones
+                next_due = queue.next_due()
+                wait = max_wait if next_due is None else min(max_wait, max(next_due - time.time(), 0))
+                time.sleep(wait)
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                self.stderr.write(f'Reminder dispatch failed: {str(e)}')
+                time.sleep(max_wait)
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-02-10 11:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_notificationoutbox'),
+        ('employers', '0003_employer_notification_mode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('sent', 'Sent'), ('digested', 'Digested'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='EmployerDigestEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('match_score', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.application')),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='digest_events', to='employers.employer')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='employers.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['employer', 'job'], name='core_employ_employe_a8811f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 6.0.1 on 2026-02-10 16:05
+
+from datetime import date
+
+from django.db import migrations
+from django.utils import timezone
+
+# The DDL is frozen here rather than imported from common.services.partition_service,
+# so later changes to the service cannot change what this migration does.
+MONTHS_AHEAD = 3
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def convert_table(schema_editor, table, field):
+    """
+    Rebuild a plain table as a table range-partitioned by month on `field`,
+    keeping its columns, indexes and foreign keys. PostgreSQL only; other
+    backends keep the plain table.
+    """
+    conn = schema_editor.connection
+    if conn.vendor != 'postgresql':
+        return
+
+    qn = conn.ops.quote_name
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_pk_seq"
+
+    with conn.cursor() as cursor:
+        if is_partitioned(cursor, table):
+            return
+
+        # Index and FK definitions are captured before the rename so they still name `table`
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname NOT IN "
+            "(SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u'))",
+            [table, table]
+        )
+        index_defs = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT MIN({qn(field)}), COALESCE(MAX(id), 0) FROM {qn(table)}")
+        oldest, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({qn(field)})"
+        )
+        # Identity columns are not inherited by LIKE; ids keep coming from one sequence
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {qn(sequence)}")
+        cursor.execute("SELECT setval(%s, %s, false)", [sequence, max_id + 1])
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(f"ALTER SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+        # The partition key must be part of the primary key
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {qn(field)})")
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+        # Monthly partitions from the oldest row through MONTHS_AHEAD, named <table>_pYYYY_MM
+        current = month_start(timezone.now())
+        month = month_start(oldest) if oldest else current
+        while month <= add_months(current, MONTHS_AHEAD):
+            upper = add_months(month, 1)
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {qn(f'{table}_p{month.year}_{month.month:02d}')} "
+                f"PARTITION OF {qn(table)} FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+            month = upper
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+        for index_def in index_defs:
+            cursor.execute(index_def)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+
+
+def partition_log_tables(apps, schema_editor):
+    convert_table(schema_editor, 'core_emaillog', 'created_at')
+    convert_table(schema_editor, 'core_auditlog', 'timestamp')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_employerdigestevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_log_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-02-10 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_partition_email_and_audit_logs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewreminder',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='interviewreminder',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+    ]
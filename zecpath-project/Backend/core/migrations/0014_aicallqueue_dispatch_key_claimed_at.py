@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-02-10 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_interviewreminder_claimed_at_alter_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicallqueue',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='aicallqueue',
+            name='dispatch_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='aicallqueue',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('dispatching', 'Dispatching'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-02-10 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_aicallqueue_dispatch_key_claimed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedQuestionSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prompt_key', models.CharField(max_length=64, unique=True)),
+                ('model', models.CharField(max_length=100)),
+                ('job_title', models.CharField(max_length=200)),
+                ('skills', models.JSONField(default=list)),
+                ('num_questions', models.IntegerField(default=3)),
+                ('questions', models.JSONField(default=list)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
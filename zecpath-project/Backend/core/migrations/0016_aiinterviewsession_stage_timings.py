@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-02-10 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_generatedquestionset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiinterviewsession',
+            name='stage_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
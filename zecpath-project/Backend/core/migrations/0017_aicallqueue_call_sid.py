@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-02-10 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_aiinterviewsession_stage_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicallqueue',
+            name='call_sid',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-02-10 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_aicallqueue_call_sid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICallEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('call_sid', models.CharField(db_index=True, max_length=64)),
+                ('status', models.CharField(max_length=20)),
+                ('sequence_number', models.IntegerField(blank=True, null=True)),
+                ('call_duration', models.IntegerField(blank=True, null=True)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('call_queue', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='core.aicallqueue')),
+            ],
+            options={
+                'ordering': ['received_at'],
+            },
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.contrib.auth.hashers import make_password
-from django.db import models
+from django.db import models, transaction
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -85,16 +85,19 @@ class Application(models.Model):
         unique_together = ['candidate', 'job']
     
     def save(self, *args, **kwargs):
-        # Track status changes
-        if self.pk:
-            try:
-                old_instance = Application.objects.get(pk=self.pk)
-                if old_instance.status != self.status:
-                    self._status_changed = True
-                    self._old_status = old_instance.status
-            except Application.DoesNotExist:
-                pass
-        super().save(*args, **kwargs)
+        # post_save receivers (status history, notification outbox) run
+        # inside this block, so they commit or roll back with the change
+        with transaction.atomic():
+            # Track status changes
+            if self.pk:
+                try:
+                    old_instance = Application.objects.get(pk=self.pk)
+                    if old_instance.status != self.status:
+                        self._status_changed = True
+                        self._old_status = old_instance.status
+                except Application.DoesNotExist:
+                    pass
+            super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.candidate.user.email} - {self.job.title}"
@@ -0,0 +1,63 @@
+"""
+Notification Outbox Models
+"""
+from django.db import models
+from django.utils import timezone
+from core.models import Application
+from employers.models import Employer, Job
+
+
+class NotificationOutbox(models.Model):
+    """Application email events written in the same transaction as the change"""
+    EVENT_CHOICES = [
+        ('application_submitted', 'Application Submitted'),
+        ('employer_new_application', 'Employer New Application'),
+        ('application_shortlisted', 'Application Shortlisted'),
+        ('application_rejected', 'Application Rejected'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('sent', 'Sent'),
+        ('digested', 'Digested'),
+        ('failed', 'Failed'),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='notifications')
+    event = models.CharField(max_length=30, choices=EVENT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    error_message = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        unique_together = ['application', 'event']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event} - {self.application_id} - {self.status}"
+
+
+class EmployerDigestEvent(models.Model):
+    """New-application event waiting for the employer's next digest"""
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='digest_events')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    application = models.ForeignKey(Application, on_delete=models.CASCADE)
+    match_score = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employer', 'job']),
+        ]
+
+    def __str__(self):
+        return f"Digest event - {self.employer_id} - {self.application_id}"
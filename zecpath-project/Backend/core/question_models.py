@@ -49,3 +49,18 @@ class InterviewState(models.Model):
     
     def __str__(self):
         return f"State - {self.session.session_id}"
+
+
+class GeneratedQuestionSet(models.Model):
+    """LLM-generated interview questions, keyed by normalized prompt hash and model"""
+    prompt_key = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=100)
+    job_title = models.CharField(max_length=200)
+    skills = models.JSONField(default=list)
+    num_questions = models.IntegerField(default=3)
+    questions = models.JSONField(default=list)
+    generated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    def __str__(self):
+        return f"{self.job_title} ({self.model})"
@@ -14,6 +14,7 @@ class InterviewReminder(models.Model):
     
     STATUS_CHOICES = [
         ('pending', 'Pending'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('failed', 'Failed'),
     ]
@@ -22,6 +23,7 @@ class InterviewReminder(models.Model):
     reminder_type = models.CharField(max_length=10, choices=REMINDER_TYPES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
     scheduled_at = models.DateTimeField(db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
     sent_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(blank=True)
     retry_count = models.IntegerField(default=0)
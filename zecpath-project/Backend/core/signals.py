@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import CustomUser, Application, ApplicationStatusHistory
+from .question_models import QuestionTemplate, QuestionFlow
+from employers.models import Job
 
 @receiver(post_save, sender=CustomUser)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -31,20 +33,23 @@ def log_status_change(sender, instance, **kwargs):
 
 @receiver(post_save, sender=Application)
 def send_notification_emails(sender, instance, created, **kwargs):
-    """Send emails on application events"""
-    from common.services.email_service import EmailService
+    """Queue application emails in the outbox; delivery happens after commit"""
+    from common.services.notification_outbox import NotificationOutboxService
     
+    events = []
     if created:
         # New application submitted
-        EmailService.send_application_submitted(instance)
-        EmailService.send_new_application_to_employer(instance)
+        events = ['application_submitted', 'employer_new_application']
     
     elif hasattr(instance, '_status_changed') and instance._status_changed:
         # Status changed
         if instance.status == 'shortlisted':
-            EmailService.send_application_shortlisted(instance)
+            events = ['application_shortlisted']
         elif instance.status == 'rejected':
-            EmailService.send_application_rejected(instance)
+            events = ['application_rejected']
+    
+    if events:
+        NotificationOutboxService.enqueue(instance, events)
 
 @receiver(post_save, sender=Application)
 def trigger_ai_call(sender, instance, created, **kwargs):
@@ -52,4 +57,51 @@ def trigger_ai_call(sender, instance, created, **kwargs):
     if hasattr(instance, '_status_changed') and instance._status_changed:
         if instance.status == 'shortlisted':
             from common.tasks_ai_calls import schedule_ai_call_task
-            schedule_ai_call_task.delay(instance.id)
\ No newline at end of file
+            schedule_ai_call_task.delay(instance.id)
+
+@receiver(post_save, sender=QuestionFlow)
+@receiver(post_delete, sender=QuestionFlow)
+def invalidate_job_question_plan(sender, instance, **kwargs):
+    """Recompile the job's question plan after its flow changes"""
+    from common.services.question_plan import QuestionPlanCache
+    QuestionPlanCache.invalidate(instance.job_id)
+
+@receiver(post_save, sender=Job)
+def warm_interview_questions(sender, instance, **kwargs):
+    """Generate a published job's interview questions ahead of its first call"""
+    if instance.status == 'published':
+        from django.db import transaction
+        from common.services.question_cache import QuestionCacheService
+        # Misses only; the cache lookup keeps repeated saves from re-queuing
+        transaction.on_commit(
+            lambda: QuestionCacheService.get(instance.title, instance.skills) or QuestionCacheService.warm_job(instance)
+        )
+
+@receiver(post_save, sender=Job)
+def invalidate_default_question_plan(sender, instance, created, **kwargs):
+    """The default flow is picked by job title"""
+    if not created:
+        from common.services.question_plan import QuestionPlanCache
+        QuestionPlanCache.invalidate(instance.id)
+
+@receiver(post_save, sender=QuestionTemplate)
+@receiver(post_delete, sender=QuestionTemplate)
+def invalidate_question_plans(sender, instance, **kwargs):
+    """Templates are shared across jobs, so every plan is recompiled"""
+    from common.services.question_plan import QuestionPlanCache
+    QuestionPlanCache.invalidate()
+
+@receiver(post_save, sender=QuestionTemplate)
+def prewarm_template_audio(sender, instance, **kwargs):
+    """Synthesize question audio ahead of the first call that plays it"""
+    if instance.is_active:
+        from django.db import transaction
+        from common.services.tts_cache import TTSCacheService
+        transaction.on_commit(lambda: TTSCacheService.schedule_prewarm([instance.question_text]))
+
+@receiver(post_save, sender=QuestionFlow)
+def prewarm_flow_audio(sender, instance, created, **kwargs):
+    if created:
+        from django.db import transaction
+        from common.services.tts_cache import TTSCacheService
+        transaction.on_commit(lambda: TTSCacheService.schedule_prewarm([instance.template.question_text]))
@@ -1,11 +1,60 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
+from django.core import mail
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from .models import CustomUser, Application, AuditLog
+from .notification_models import NotificationOutbox
 from candidates.models import Candidate
 from employers.models import Employer, Job
 
+# In-process stand-ins for the caches; 'shared' is Redis in production
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-shared'},
+}
+
+
+def clear_question_plans():
+    """Compiled plans and their version tokens outlive a test's transaction"""
+    from django.core.cache import caches
+    from common.services.question_plan import QuestionPlanCache
+    QuestionPlanCache.clear()
+    caches['shared'].clear()
+
+
+def post_from_twilio(client, path, data):
+    """POST a webhook signed the way Twilio signs it (settings.TWILIO_AUTH_TOKEN, BASE_URL)"""
+    from django.conf import settings
+    from twilio.request_validator import RequestValidator
+    signature = RequestValidator(settings.TWILIO_AUTH_TOKEN).compute_signature(
+        f"{settings.BASE_URL}{path}", {name: str(value) for name, value in data.items()}
+    )
+    return client.post(path, data, HTTP_X_TWILIO_SIGNATURE=signature)
+
+
+def create_candidate(email='c@test.com'):
+    user = CustomUser.objects.create_user(email=email, password='pass', role='candidate')
+    return Candidate.objects.get(user=user)
+
+
+def create_job(questions=(), employer_email='e@test.com'):
+    """A new employer's job, with one skills question in its flow per text in `questions`"""
+    from core.question_models import QuestionTemplate, QuestionFlow
+    user = CustomUser.objects.create_user(email=employer_email, password='pass', role='employer')
+    job = Job.objects.create(employer=Employer.objects.get(user=user), title='Test', description='Test', location='Test')
+    for order, text in enumerate(questions, 1):
+        QuestionFlow.objects.create(job=job, template=QuestionTemplate.objects.create(category='skills', question_text=text), order=order)
+    return job
+
+
+def create_call(job=None, candidate_email='c@test.com', **call_fields):
+    """AI call queued now for a new candidate's application (to a new job unless `job` is given)"""
+    from django.utils import timezone
+    from core.ai_call_models import AICallQueue
+    application = Application.objects.create(candidate=create_candidate(candidate_email), job=job or create_job())
+    return AICallQueue.objects.create(application=application, scheduled_at=timezone.now(), **call_fields)
+
 
 class AuthenticationTests(APITestCase):
     def setUp(self):
@@ -180,3 +229,1047 @@ class ModelTests(TestCase):
         from django.db import IntegrityError
         with self.assertRaises(IntegrityError):
             Application.objects.create(candidate=candidate, job=job)
+
+
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.candidate = create_candidate()
+        self.job = create_job()
+        self.employer = self.job.employer
+    
+    def test_application_queues_outbox_events(self):
+        app = Application.objects.create(candidate=self.candidate, job=self.job)
+        events = set(NotificationOutbox.objects.filter(application=app).values_list('event', flat=True))
+        self.assertEqual(events, {'application_submitted', 'employer_new_application'})
+        self.assertEqual(len(mail.outbox), 0)
+    
+    def test_duplicate_events_ignored(self):
+        from common.services.notification_outbox import NotificationOutboxService
+        app = Application.objects.create(candidate=self.candidate, job=self.job)
+        NotificationOutboxService.enqueue(app, ['application_submitted'])
+        self.assertEqual(NotificationOutbox.objects.filter(application=app).count(), 2)
+    
+    def test_dispatch_sends_and_marks_rows(self):
+        from common.tasks_notifications import dispatch_notification_outbox
+        app = Application.objects.create(candidate=self.candidate, job=self.job)
+        results = dispatch_notification_outbox()
+        self.assertEqual(results['sent'], 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(NotificationOutbox.objects.filter(application=app).exclude(status='sent').exists())
+
+    
+    def test_application_rows_single_query(self):
+        from common.services.email_service import EmailService
+        ids = []
+        for i in range(3):
+            user = CustomUser.objects.create_user(email=f'c{i}@rows.com', password='pass', role='candidate')
+            ids.append(Application.objects.create(candidate=user.candidate, job=self.job).id)
+        
+        with self.assertNumQueries(1):
+            rows = EmailService.application_rows(ids)
+        self.assertEqual(rows[ids[0]]['candidate_email'], 'c0@rows.com')
+    
+    def test_digest_employer_gets_one_rollup_email(self):
+        from common.tasks_notifications import dispatch_notification_outbox, send_employer_digests
+        from .notification_models import EmployerDigestEvent
+        self.employer.notification_mode = 'hourly'
+        self.employer.save()
+        other = CustomUser.objects.create_user(email='c2@test.com', password='pass', role='candidate')
+        Application.objects.create(candidate=self.candidate, job=self.job)
+        Application.objects.create(candidate=other.candidate, job=self.job)
+        
+        results = dispatch_notification_outbox()
+        self.assertEqual(results['digested'], 2)
+        self.assertEqual(len(mail.outbox), 2)  # candidate confirmations only
+        
+        summary = send_employer_digests('hourly')
+        self.assertEqual(summary['employers'], 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[-1].to, ['e@test.com'])
+        self.assertFalse(EmployerDigestEvent.objects.exists())
+    
+    def test_digest_events_kept_on_failure_and_flushed_after_mode_switch(self):
+        from unittest import mock
+        from common.tasks_notifications import send_employer_digests
+        from .notification_models import EmployerDigestEvent
+        app = Application.objects.create(candidate=self.candidate, job=self.job)
+        EmployerDigestEvent.objects.create(employer=self.employer, job=self.job, application=app, match_score=80)
+        self.employer.notification_mode = 'daily'
+        self.employer.save()
+        
+        with mock.patch('common.services.email_service.EmailService._send_log', return_value=(False, 'SMTP down')):
+            self.assertEqual(send_employer_digests('daily')['sent'], 0)
+        self.assertEqual(EmployerDigestEvent.objects.count(), 1)
+        
+        # Switched to immediate: the hourly run still sends what was pending
+        self.employer.notification_mode = 'immediate'
+        self.employer.save()
+        self.assertEqual(send_employer_digests('hourly')['sent'], 1)
+        self.assertFalse(EmployerDigestEvent.objects.exists())
+
+class EmailBatchTests(TestCase):
+    def test_send_batch_sends_and_logs_each_message(self):
+        from core.models import EmailLog
+        from common.services.email_service import EmailService
+        messages = [{
+            'recipient': f'user{i}@test.com',
+            'subject': 'Application Submitted',
+            'template_name': 'application_submitted',
+            'context': {'candidate_name': 'User', 'job_title': 'Dev', 'company_name': 'Co', 'applied_date': 'Jan 01'},
+        } for i in range(3)]
+        
+        results = EmailService.send_batch(messages)
+        
+        self.assertEqual(results, [(True, None)] * 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(EmailLog.objects.filter(status='sent').count(), 3)
+
+
+@override_settings(LOG_RETENTION_CHUNK_SIZE=2, LOG_RETENTION_CHUNK_SLEEP=0)
+class RetentionTests(TestCase):
+    def test_old_email_logs_purged_in_chunks(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from core.models import EmailLog
+        from common.services.retention_service import RetentionService
+        
+        logs = [EmailLog.objects.create(recipient=f'u{i}@test.com', subject='S', template_name='t') for i in range(7)]
+        EmailLog.objects.filter(id__in=[log.id for log in logs[:5]]).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+        
+        result = RetentionService.apply_policy('core.EmailLog', {'days': 30, 'field': 'created_at'})
+        
+        self.assertEqual(result['processed'], 5)
+        self.assertGreater(result['chunks'], 1)
+        self.assertEqual(set(EmailLog.objects.values_list('id', flat=True)), {logs[5].id, logs[6].id})
+
+
+class PartitionTests(TestCase):
+    def test_month_arithmetic(self):
+        from datetime import date
+        from common.services.partition_service import PartitionService
+        
+        self.assertEqual(PartitionService.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(PartitionService.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(PartitionService.partition_name('core_emaillog', date(2026, 2, 1)), 'core_emaillog_p2026_02')
+    
+    def test_expired_email_log_partition_dropped(self):
+        from datetime import date, datetime, timezone as dt_timezone
+        from django.db import connection
+        from core.models import EmailLog
+        from common.services.partition_service import PartitionService
+        
+        if not PartitionService.is_partitioned('core_emaillog'):
+            self.skipTest('EmailLog is not partitioned on this database')
+        
+        old_month = date(2020, 1, 1)
+        PartitionService.create_partition('core_emaillog', old_month)
+        old_log = EmailLog.objects.create(recipient='old@test.com', subject='S', template_name='t')
+        EmailLog.objects.filter(id=old_log.id).update(created_at=datetime(2020, 1, 15, tzinfo=dt_timezone.utc))
+        recent_log = EmailLog.objects.create(recipient='new@test.com', subject='S', template_name='t')
+        
+        self.assertEqual(PartitionService.ensure_partitions('core_emaillog'), [])
+        expired = PartitionService.expire_partitions('core_emaillog', retain_months=12)
+        
+        self.assertIn('core_emaillog_p2020_01', expired)
+        self.assertNotIn(old_month, PartitionService.list_partitions('core_emaillog', connection))
+        self.assertEqual(list(EmailLog.objects.values_list('id', flat=True)), [recent_log.id])
+    
+    def test_log_apis_reject_invalid_days(self):
+        admin = CustomUser.objects.create_user(email='admin@test.com', password='pass', role='admin')
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        for name in ('email_logs', 'audit_logs'):
+            self.assertEqual(client.get(reverse(name), {'days': 'abc'}).status_code, 400)
+            self.assertEqual(client.get(reverse(name), {'days': '-1'}).status_code, 400)
+            self.assertEqual(client.get(reverse(name), {'days': '0'}).status_code, 200)
+
+
+class ReminderDispatchTests(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from core.interview_models import InterviewSchedule
+        from core.reminder_models import InterviewReminder
+        
+        app = Application.objects.create(candidate=create_candidate(), job=create_job())
+        schedule = InterviewSchedule.objects.create(application=app, interview_date=timezone.now() + timedelta(hours=1))
+        self.reminder = InterviewReminder.objects.create(
+            schedule=schedule, reminder_type='2h', scheduled_at=timezone.now() - timedelta(minutes=1)
+        )
+    
+    def test_due_reminder_claimed_once(self):
+        from common.services.reminder_service import ReminderService
+        
+        self.assertEqual(ReminderService.claim_due_reminders(), [self.reminder.id])
+        self.assertEqual(ReminderService.claim_due_reminders(), [])
+        self.reminder.refresh_from_db()
+        self.assertEqual(self.reminder.status, 'sending')
+    
+    def test_claimed_batch_sent_once(self):
+        from common.services.reminder_service import ReminderService
+        
+        reminder_ids = ReminderService.claim_due_reminders()
+        results = ReminderService.send_claimed(reminder_ids)
+        ReminderService.send_claimed(reminder_ids)
+        
+        self.assertEqual(results['sent'], 1)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['c@test.com', 'e@test.com'])
+        self.reminder.refresh_from_db()
+        self.assertEqual(self.reminder.status, 'sent')
+    
+    @override_settings(DELAYED_QUEUE_BACKEND='local')
+    def test_queued_reminder_claimed_at_due_time(self):
+        from common.services.reminder_service import ReminderService
+        
+        ReminderService.enqueue_reminders([self.reminder])
+        self.assertEqual(ReminderService.claim_queued(), [self.reminder.id])
+        self.assertEqual(ReminderService.claim_queued(), [])
+    
+    @override_settings(DELAYED_QUEUE_BACKEND='local')
+    def test_cancelled_reminder_removed_from_queue(self):
+        from common.services.reminder_service import ReminderService
+        
+        ReminderService.enqueue_reminders([self.reminder])
+        ReminderService.cancel_reminders(self.reminder.schedule)
+        self.assertEqual(ReminderService.claim_queued(), [])
+    
+    @override_settings(DELAYED_QUEUE_BACKEND='local')
+    def test_stale_entry_for_retimed_reminder_not_fired_early(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from common.services.reminder_service import ReminderService
+        
+        ReminderService.enqueue_reminders([self.reminder])
+        self.reminder.scheduled_at = timezone.now() + timedelta(minutes=30)
+        self.reminder.save(update_fields=['scheduled_at'])
+        
+        self.assertEqual(ReminderService.claim_queued(), [])
+        self.assertEqual(ReminderService.queue().next_due(), self.reminder.scheduled_at.timestamp())
+        self.reminder.refresh_from_db()
+        self.assertEqual(self.reminder.status, 'pending')
+
+    
+    def test_bulk_create_and_cancel_reminders(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from core.interview_models import InterviewSchedule
+        from common.services.reminder_service import ReminderService
+        
+        application = self.reminder.schedule.application
+        schedules = [
+            InterviewSchedule.objects.create(application=application, interview_date=timezone.now() + timedelta(days=days))
+            for days in (2, 3)
+        ]
+        with self.assertNumQueries(2):
+            created = ReminderService.create_reminders_for_schedules(schedules)
+        self.assertEqual({len(types) for types in created.values()}, {3})
+        
+        self.assertEqual(ReminderService.cancel_reminders_for_schedules([s.id for s in schedules]), 6)
+
+class DelayedQueueTests(TestCase):
+    def test_local_queue_pops_in_due_order(self):
+        from datetime import datetime, timezone as dt_timezone
+        from common.utils.delayed_queue import LocalDelayedQueue
+        
+        queue = LocalDelayedQueue('test')
+        queue.add(1, datetime(2026, 1, 1, 10, tzinfo=dt_timezone.utc))
+        queue.add(2, datetime(2026, 1, 1, 9, tzinfo=dt_timezone.utc))
+        queue.add(3, datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc))
+        queue.add(1, datetime(2026, 1, 1, 11, tzinfo=dt_timezone.utc))  # re-timed
+        
+        now = datetime(2026, 1, 1, 11, 30, tzinfo=dt_timezone.utc).timestamp()
+        self.assertEqual(queue.pop_due(now), ['2', '1'])
+        self.assertEqual(queue.next_due(), datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc).timestamp())
+
+
+class AICallDispatchTests(TestCase):
+    def setUp(self):
+        self.call = create_call()
+    
+    def test_due_call_claimed_once(self):
+        from common.services.ai_call_dispatcher import AICallDispatcher
+        
+        claimed = AICallDispatcher.claim_batch()
+        self.assertEqual(claimed, [(self.call.id, claimed[0][1])])
+        self.assertEqual(AICallDispatcher.claim_batch(), [])
+        self.call.refresh_from_db()
+        self.assertEqual((self.call.status, self.call.dispatch_key), ('dispatching', claimed[0][1]))
+    
+    def test_call_starts_once_per_dispatch_key(self):
+        from common.services.ai_call_dispatcher import AICallDispatcher
+        
+        [(call_id, dispatch_key)] = AICallDispatcher.claim_batch()
+        self.assertFalse(AICallDispatcher.begin(call_id, 'stale-key'))
+        self.assertTrue(AICallDispatcher.begin(call_id, dispatch_key))
+        self.assertFalse(AICallDispatcher.begin(call_id, dispatch_key))
+        self.assertFalse(AICallDispatcher.begin(call_id))
+    
+    def test_mass_shortlist_does_not_crowd_out_other_employers(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from core.ai_call_models import AICallQueue
+        from common.services.ai_call_dispatcher import AICallDispatcher
+        
+        earlier = timezone.now() - timedelta(hours=1)
+        AICallQueue.objects.bulk_create(
+            AICallQueue(application=self.call.application, scheduled_at=earlier) for _ in range(12)
+        )
+        other_call = create_call(create_job(employer_email='e2@test.com'), candidate_email='c2@test.com')
+        
+        claimed = [call_id for call_id, _ in AICallDispatcher.claim_batch(batch_size=2)]
+        self.assertEqual(len(claimed), 2)
+        self.assertIn(other_call.id, claimed)
+    
+    def test_employers_interleaved_by_weight(self):
+        from common.services.ai_call_dispatcher import AICallDispatcher
+        
+        rows = [(1, 'a'), (2, 'a'), (3, 'a'), (4, 'b'), (5, 'c'), (6, 'b')]
+        self.assertEqual(AICallDispatcher.weighted_round_robin(rows), [1, 4, 5, 2, 6, 3])
+        with self.settings(AI_CALL_EMPLOYER_WEIGHTS={'a': 2}):
+            self.assertEqual(AICallDispatcher.weighted_round_robin(rows), [1, 2, 4, 5, 3, 6])
+    
+    @override_settings(
+        RATE_LIMIT_BACKEND='local',
+        AI_CALL_LIMITS={'probe_provider': {'rate_per_minute': 60, 'max_concurrent': 10, 'cost_per_call': 1}}
+    )
+    def test_half_open_twilio_circuit_gets_one_probe_call(self):
+        from unittest import mock
+        from django.utils import timezone
+        from core.ai_call_models import AICallQueue
+        from common.services.ai_call_dispatcher import AICallDispatcher
+        from common.services.ai_call_limiter import AICallLimiter
+        from common.utils.circuit_breaker import CircuitBreaker
+        
+        for _ in range(2):
+            AICallQueue.objects.create(application=self.call.application, scheduled_at=timezone.now())
+        state = mock.PropertyMock(return_value='probing')
+        with mock.patch.object(CircuitBreaker, 'state', state):
+            self.assertEqual(AICallDispatcher.claim_startable(), [])
+            state.return_value = 'half_open'
+            with mock.patch('common.tasks_ai_calls.execute_ai_call_task.apply_async') as apply_async:
+                results = AICallDispatcher.dispatch()
+        self.assertEqual((results['claimed'], apply_async.call_count), (1, 1))
+        self.assertNotIn('held', results)
+        self.assertEqual(AICallQueue.objects.filter(status='queued').count(), 2)
+        AICallLimiter.release(apply_async.call_args.kwargs['args'][0])
+    
+    @override_settings(
+        RATE_LIMIT_BACKEND='local',
+        AI_CALL_LIMITS={'test_provider': {'rate_per_minute': 60, 'max_concurrent': 1, 'cost_per_call': 1}}
+    )
+    def test_limiter_caps_live_calls(self):
+        from common.services.ai_call_limiter import AICallLimiter
+        
+        self.assertTrue(AICallLimiter.acquire(101))
+        self.assertFalse(AICallLimiter.acquire(102))
+        self.assertEqual(AICallLimiter.capacity(), 0)
+        AICallLimiter.release(101)
+        self.assertTrue(AICallLimiter.acquire(102))
+        AICallLimiter.release(102)
+    
+    @override_settings(
+        RATE_LIMIT_BACKEND='local',
+        AI_CALL_LIMITS={'race_provider': {'rate_per_minute': 1, 'max_concurrent': 5, 'cost_per_call': 1}}
+    )
+    def test_limiter_refuses_when_tokens_spent_after_check(self):
+        from unittest import mock
+        from common.services.ai_call_limiter import AICallLimiter
+        from common.utils.rate_limit import LocalRateLimiter
+        
+        # Both dispatchers pass the availability check; only one may spend the token
+        with mock.patch.object(LocalRateLimiter, 'available', return_value=1.0):
+            self.assertTrue(AICallLimiter.acquire(201))
+            self.assertFalse(AICallLimiter.acquire(202))
+        self.assertEqual(AICallLimiter.snapshot()['race_provider']['live_calls'], 1)
+        AICallLimiter.release(201)
+
+
+@override_settings(RATE_LIMIT_BACKEND='local', AI_CALL_SLOTS_PER_MINUTE=2)
+class CallSlotAllocatorTests(TestCase):
+    def test_slots_fill_window_at_capacity(self):
+        from datetime import datetime, timezone as dt_timezone
+        from common.services.call_slot_allocator import CallSlotAllocator
+        
+        earliest = datetime(2026, 3, 2, 8, 0, 10, tzinfo=dt_timezone.utc)
+        slots = [CallSlotAllocator.allocate('Asia/Kolkata', earliest) for _ in range(3)]
+        self.assertEqual([slot.strftime('%H:%M:%S') for slot in slots], ['08:00:30', '08:01:00', '08:01:30'])
+    
+    def test_slot_deferred_to_local_business_hours(self):
+        from datetime import datetime, timezone as dt_timezone
+        from common.services.call_slot_allocator import CallSlotAllocator
+        
+        # 03:00 in New York; the window opens at 09:00 EST (14:00 UTC)
+        earliest = datetime(2026, 3, 3, 8, 0, tzinfo=dt_timezone.utc)
+        first = CallSlotAllocator.allocate('America/New_York', earliest)
+        second = CallSlotAllocator.allocate('America/New_York', earliest)
+        self.assertEqual(first, datetime(2026, 3, 3, 14, 0, tzinfo=dt_timezone.utc))
+        self.assertEqual(second, datetime(2026, 3, 3, 14, 0, 30, tzinfo=dt_timezone.utc))
+    
+    def test_day_bitmap_expires_after_its_day(self):
+        from datetime import datetime, timezone as dt_timezone
+        from unittest import mock
+        from common.services.call_slot_allocator import CallSlotAllocator
+        from common.utils.slot_bitmap import LocalSlotBitmap
+        
+        bitmap = mock.Mock(wraps=LocalSlotBitmap())
+        with mock.patch('common.services.call_slot_allocator.get_slot_bitmap', return_value=bitmap):
+            CallSlotAllocator.allocate('UTC', datetime(2026, 3, 9, 10, 0, tzinfo=dt_timezone.utc))
+        self.assertEqual(bitmap.claim.call_args.args[3], datetime(2026, 3, 11, tzinfo=dt_timezone.utc))
+
+
+class InterviewBufferTests(TestCase):
+    def setUp(self):
+        self.job = create_job()
+        self.call = create_call(self.job)
+    
+    def test_turns_flushed_at_checkpoint_and_resumed(self):
+        from common.services.interview_buffer import InterviewBuffer
+        
+        buffer = InterviewBuffer.open(self.call, self.job)
+        buffer.state.current_question_index = 1
+        with self.assertNumQueries(0):
+            buffer.add_turn('Tell me about yourself.', 'I have 5 years of Python experience.', category='introduction')
+        self.assertFalse(buffer.session.turns.exists())
+        
+        buffer.checkpoint()
+        buffer.add_turn('Unsaved question?', 'Lost in the crash', category='skills')
+        
+        resumed = InterviewBuffer.open(self.call, self.job)
+        self.assertEqual(resumed.session.pk, buffer.session.pk)
+        self.assertEqual((resumed.next_turn_number, resumed.state.current_question_index), (2, 1))
+        self.assertEqual(resumed.session.total_answers, 1)
+        
+        result = resumed.finish()
+        resumed.session.refresh_from_db()
+        self.assertEqual(result['turns'], 1)
+        self.assertEqual(resumed.session.category_scores, result['category_scores'])
+        self.assertTrue(resumed.session.full_transcript_text.startswith('Q: Tell me about yourself.'))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class QuestionPlanTests(TestCase):
+    def setUp(self):
+        from core.question_models import QuestionTemplate, QuestionFlow
+        
+        clear_question_plans()
+        employer_user = CustomUser.objects.create_user(email='e@test.com', password='pass', role='employer')
+        employer = Employer.objects.get(user=employer_user)
+        self.job = Job.objects.create(employer=employer, title='Test', description='Test', location='Test')
+        intro = QuestionTemplate.objects.create(category='introduction', question_text='Intro?')
+        senior = QuestionTemplate.objects.create(
+            category='skills', question_text='Senior?', condition={'min_experience': 5},
+            follow_up_trigger={'keywords': ['Django']}
+        )
+        self.last = QuestionTemplate.objects.create(category='salary', question_text='Salary?')
+        for order, template in enumerate([intro, senior, self.last], 1):
+            QuestionFlow.objects.create(job=self.job, template=template, order=order)
+    
+    def test_plan_steps_in_memory_and_skips_unmet_conditions(self):
+        from core.question_models import InterviewState
+        from common.services.question_plan import QuestionPlanCache
+        
+        plan = QuestionPlanCache.get(self.job.id)
+        state = InterviewState(context={'job_id': self.job.id, 'answers': {}}, completed_categories=[])
+        with self.assertNumQueries(0):
+            self.assertEqual(plan.next_question(state), ('Intro?', 'introduction'))
+            state.current_question_index += 1
+            self.assertEqual(plan.next_question(state, 'I know Django, 2 years'), ('Salary?', 'salary'))
+        self.assertEqual(state.current_question_index, 2)
+    
+    def test_flow_edit_invalidates_cached_plan(self):
+        from core.question_models import QuestionFlow
+        from common.services.question_plan import QuestionPlanCache
+        
+        plan = QuestionPlanCache.get(self.job.id)
+        self.assertIs(QuestionPlanCache.get(self.job.id), plan)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            QuestionFlow.objects.filter(job=self.job, template=self.last).delete()
+        self.assertEqual(len(QuestionPlanCache.get(self.job.id)), 2)
+
+
+@override_settings(
+    AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', AI_PROVIDER_QUEUE_TIMEOUT=0.01,
+    AI_PROVIDER_ENDPOINTS={'chat': {'max_concurrent': 1}}
+)
+class ProviderClientTests(TestCase):
+    def test_fake_backend_serves_llm_and_tts(self):
+        from common.services.ai_bridge_service import LLMService, TTSService
+        from common.utils.provider_client import get_provider_client
+        
+        questions, error = LLMService.generate_interview_questions('Developer', ['python'])
+        self.assertIsNone(error)
+        self.assertEqual(len(questions), 3)
+        audio, error = TTSService.synthesize_speech('Hello')
+        self.assertEqual(audio, b'FAKEAUDIO:nova:Hello')
+        self.assertIs(get_provider_client(), get_provider_client())
+    
+    def test_endpoint_concurrency_limit_and_latency(self):
+        from common.utils.provider_client import FakeProviderClient, ProviderBusyError
+        
+        client = FakeProviderClient()
+        with client._call('chat'):
+            with self.assertRaises(ProviderBusyError):
+                client.chat([{'role': 'user', 'content': 'hi'}])
+        client.chat([{'role': 'user', 'content': 'hi'}])
+        # The held slot and the later call; the refused call never took a slot
+        self.assertEqual(client.stats()['chat']['count'], 2)
+    
+    def test_settings_override_rebuilds_shared_client(self):
+        from common.utils.provider_client import get_provider_client
+        
+        client = get_provider_client()
+        with self.settings(AI_PROVIDER_ENDPOINTS={'chat': {'max_concurrent': 3}}):
+            self.assertIsNot(get_provider_client(), client)
+            self.assertEqual(get_provider_client()._slots['chat']._value, 3)
+
+
+class ProviderStubTests(TestCase):
+    def test_stub_serves_openai_shapes_and_rate_limits(self):
+        import requests
+        from common.utils.provider_stub import LocalProviderServer, make_profile
+        
+        server = LocalProviderServer(latency_scale=0, profile=make_profile(rate_per_second=1)).start()
+        try:
+            prompt = {'model': 'gpt', 'messages': [{'role': 'user', 'content': 'Generate 3 interview questions'}]}
+            first = requests.post(f'{server.url}/v1/chat/completions', json=prompt, timeout=5)
+            second = requests.post(f'{server.url}/v1/chat/completions', json=prompt, timeout=5)
+            call = requests.post(f'{server.url}/2010-04-01/Accounts/AC1/Calls.json', data={'To': '+1'}, timeout=5)
+        finally:
+            server.stop()
+        
+        self.assertIn('Fake interview question 1?', first.json()['choices'][0]['message']['content'])
+        self.assertEqual(second.status_code, 429)
+        self.assertTrue(call.json()['sid'].startswith('CA'))
+        self.assertEqual(server.stats()['chat'], {200: 1, 429: 1})
+
+
+@override_settings(
+    CIRCUIT_BREAKER_BACKEND='local', AI_PROVIDER_HEDGE_DELAY=0.05,
+    CIRCUIT_BREAKERS={
+        'flaky.chat': {'failure_threshold': 2, 'reset_timeout': 60},
+        'flaky-async.chat': {'failure_threshold': 2, 'reset_timeout': 60},
+    }
+)
+class ProviderResilienceTests(TestCase):
+    def test_breaker_opens_and_questions_fall_back_fast(self):
+        from unittest import mock
+        from common.services.ai_bridge_service import LLMService
+        from common.utils.circuit_breaker import CircuitOpenError
+        from common.utils.provider_client import FakeProviderClient
+        
+        class FlakyClient(FakeProviderClient):
+            PROVIDER = 'flaky'
+            
+            def _chat(self, messages, max_tokens, temperature, model):
+                self.requests.append(('chat', messages[-1]['content']))
+                raise ConnectionError("provider down")
+        
+        client = FlakyClient()
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                client.chat([{'role': 'user', 'content': 'hi'}])
+        with self.assertRaises(CircuitOpenError):
+            client.chat([{'role': 'user', 'content': 'hi'}])
+        self.assertEqual(len(client.requests), 2)
+        self.assertEqual(client.stats()['chat']['breaker'], 'open')
+        
+        with mock.patch('common.services.ai_bridge_service.get_provider_client', return_value=client):
+            questions, error = LLMService.generate_interview_questions('Developer', ['python'])
+        self.assertEqual(questions, LLMService._fallback_questions('Developer'))
+        self.assertIn('circuit is open', error)
+        self.assertEqual(len(client.requests), 2)
+    
+    def test_only_outages_count_as_provider_failures(self):
+        import httpx
+        import openai
+        import requests
+        from common.utils.circuit_breaker import is_provider_failure
+        
+        request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+        self.assertTrue(is_provider_failure(openai.APITimeoutError(request=request)))
+        self.assertTrue(is_provider_failure(httpx.ConnectError('refused')))
+        self.assertTrue(is_provider_failure(requests.ConnectionError()))
+        self.assertTrue(is_provider_failure(ConnectionError('reset')))
+        self.assertTrue(is_provider_failure(openai.RateLimitError('slow down', response=httpx.Response(429, request=request), body=None)))
+        self.assertFalse(is_provider_failure(openai.BadRequestError('bad', response=httpx.Response(400, request=request), body=None)))
+        self.assertFalse(is_provider_failure(AttributeError("'NoneType' object has no attribute 'strip'")))
+        self.assertFalse(is_provider_failure(ValueError('Expecting value')))
+    
+    def test_async_breaker_opens_off_the_event_loop(self):
+        import threading
+        from unittest import mock
+        from asgiref.sync import async_to_sync
+        from common.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+        from common.utils.provider_client import AsyncFakeProviderClient
+        
+        class FlakyClient(AsyncFakeProviderClient):
+            PROVIDER = 'flaky-async'
+            
+            async def _chat(self, messages, max_tokens, temperature, model):
+                self.requests.append(('chat', threading.get_ident()))
+                raise ConnectionError("provider down")
+        
+        breaker_threads = set()
+        check = CircuitBreaker.check
+        
+        def recording_check(breaker):
+            breaker_threads.add(threading.get_ident())
+            return check(breaker)
+        
+        async def run(client):
+            for _ in range(3):
+                try:
+                    await client.chat([{'role': 'user', 'content': 'hi'}])
+                except (ConnectionError, CircuitOpenError) as e:
+                    errors.append(type(e))
+        
+        client, errors = FlakyClient(), []
+        with mock.patch.object(CircuitBreaker, 'check', recording_check):
+            async_to_sync(run)(client)
+        self.assertEqual(errors, [ConnectionError, ConnectionError, CircuitOpenError])
+        loop_threads = {thread for _, thread in client.requests}
+        self.assertTrue(breaker_threads.isdisjoint(loop_threads))
+    
+    def test_slow_request_is_hedged(self):
+        import threading
+        from common.utils.provider_client import FakeProviderClient
+        
+        class SlowFirstClient(FakeProviderClient):
+            PROVIDER = 'slow-first'
+            
+            def __init__(self):
+                super().__init__()
+                self.release = threading.Event()
+            
+            def _chat(self, messages, max_tokens, temperature, model):
+                self.requests.append(('chat', messages[-1]['content']))
+                if len(self.requests) == 1:
+                    self.release.wait(5)
+                    return 'slow'
+                return 'fast'
+        
+        client = SlowFirstClient()
+        self.assertEqual(client.chat([{'role': 'user', 'content': 'hi'}], hedge=True), 'fast')
+        client.release.set()
+        self.assertEqual(client.stats()['chat']['hedges'], {'sent': 1, 'won': 1, 'skipped': 0})
+    
+    def test_no_hedge_without_free_chat_slot(self):
+        import threading
+        from common.utils.provider_client import FakeProviderClient
+        
+        class SlowClient(FakeProviderClient):
+            PROVIDER = 'slow'
+            
+            def _chat(self, messages, max_tokens, temperature, model):
+                self.requests.append(('chat', messages[-1]['content']))
+                threading.Event().wait(0.2)
+                return 'slow'
+        
+        with self.settings(AI_PROVIDER_ENDPOINTS={'chat': {'read_timeout': 5, 'max_concurrent': 1}}):
+            client = SlowClient()
+        self.assertEqual(client.chat([{'role': 'user', 'content': 'hi'}], hedge=True), 'slow')
+        self.assertEqual(len(client.requests), 1)
+        self.assertEqual(client.stats()['chat']['hedges'], {'sent': 0, 'won': 0, 'skipped': 1})
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', CACHES=LOCAL_CACHES)
+class QuestionCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+    
+    def test_prompt_key_normalized(self):
+        from common.services.question_cache import QuestionCacheService
+        
+        self.assertEqual(
+            QuestionCacheService.prompt_key(' Backend  Developer', ['Python', 'django', 'python']),
+            QuestionCacheService.prompt_key('backend developer', 'Django, Python')
+        )
+    
+    def test_generated_once_then_served_from_cache(self):
+        from django.core.cache import caches
+        from common.services.question_cache import QuestionCacheService
+        from common.services.ai_bridge_service import AIBridgeService
+        
+        # Another worker holds the lock: no second LLM request
+        lock_key = f"question_cache:lock:{QuestionCacheService.prompt_key('Developer', ['python'])}"
+        caches['shared'].add(lock_key, 1)
+        self.assertIsNone(QuestionCacheService.generate('Developer', ['python']))
+        caches['shared'].delete(lock_key)
+        
+        questions = QuestionCacheService.generate('Developer', ['python'])
+        self.assertEqual(len(questions), 3)
+        result = AIBridgeService.conduct_interview('developer', ['Python'])
+        self.assertEqual((result['questions'], result['status']), (questions, 'ready'))
+    
+    def test_miss_returns_fallback_when_broker_is_down(self):
+        from unittest import mock
+        from django.core.cache import caches
+        from common.services.question_cache import QuestionCacheService
+        from common.services.ai_bridge_service import AIBridgeService
+        
+        with mock.patch('common.tasks_ai_calls.generate_interview_questions_task.delay', side_effect=ConnectionError('broker down')):
+            result = AIBridgeService.conduct_interview('Designer', ['figma'])
+        self.assertEqual(result['status'], 'fallback')
+        self.assertTrue(result['questions'])
+        # The marker is released, so the next miss schedules again
+        self.assertIsNone(caches['shared'].get(f"question_cache:scheduled:{QuestionCacheService.prompt_key('Designer', ['figma'])}"))
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local')
+class BatchAnalysisTests(TestCase):
+    def test_turns_packed_into_token_budgeted_chunks(self):
+        from common.services.ai_bridge_service import LLMService
+        
+        turns = [(n, 'Question?', 'x' * 400) for n in range(1, 6)]
+        chunks = list(LLMService._chunk_turns(turns, token_budget=400))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(LLMService._parse_ratings('```json\n[{"turn": 2, "rating": 12}, {"turn": 9, "rating": 5}]\n```', {1, 2}),
+                         {2: {'rating': 10, 'explanation': ''}})
+    
+    def test_session_rated_in_one_request(self):
+        from common.services.interview_buffer import InterviewBuffer
+        from common.services.ai_conversation_service import AIConversationService
+        from common.utils.provider_client import get_provider_client
+        
+        job = create_job()
+        buffer = InterviewBuffer.open(create_call(job), job)
+        for n in range(3):
+            buffer.add_turn(f'Question {n}?', f'Answer {n}', category='skills')
+        buffer.checkpoint()
+        
+        requests_before = len(get_provider_client().requests)
+        result = AIConversationService.analyze_sessions([buffer.session.pk])
+        self.assertEqual(result, {'sessions': 1, 'rated': 3, 'errors': 0})
+        self.assertEqual(len(get_provider_client().requests), requests_before + 1)
+        self.assertEqual(buffer.session.turns.first().ai_annotations['llm_rating'], 7)
+        import re
+        prompt = get_provider_client().requests[-1][1]
+        # Turns are numbered within the request, not by database id
+        self.assertEqual(re.findall(r'^Turn (\d+):', prompt, re.MULTILINE), ['1', '2', '3'])
+
+
+class FakeRecordingResponse:
+    def __init__(self, body):
+        self.body, self.headers = body, {'Content-Length': str(len(body))}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_content(self, chunk_size):
+        return (self.body[i:i + chunk_size] for i in range(0, len(self.body), chunk_size))
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', STT_MAX_AUDIO_BYTES=1024, CACHES=LOCAL_CACHES)
+class TranscriptionTests(TestCase):
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+    
+    def test_recording_streamed_capped_and_transcribed_once(self):
+        from unittest import mock
+        from common.services.ai_bridge_service import STTService
+        from common.utils.provider_client import get_provider_client
+        
+        session = mock.Mock()
+        session.get.side_effect = lambda url, **kwargs: FakeRecordingResponse(b'x' * (2048 if 'big' in url else 512))
+        with mock.patch('common.services.ai_bridge_service.get_http_session', return_value=session):
+            requests_before = len(get_provider_client().requests)
+            first = STTService.transcribe_audio('https://example.com/rec-1.wav')
+            again = STTService.transcribe_audio('https://example.com/rec-1.wav')
+            same_audio = STTService.transcribe_audio('https://example.com/rec-1-copy.wav')
+            transcript, error = STTService.transcribe_audio('https://example.com/big.wav')
+        
+        self.assertEqual(first, again)
+        self.assertEqual(first, same_audio)
+        self.assertEqual(len(get_provider_client().requests), requests_before + 1)
+        self.assertIsNone(transcript)
+        self.assertIn('1024', error)
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', BASE_URL='https://zecpath.test')
+class TTSCacheTests(TestCase):
+    def setUp(self):
+        import tempfile
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+    
+    def test_audio_synthesized_once_and_served_by_url(self):
+        from common.services.tts_cache import TTSCacheService
+        from common.utils.provider_client import get_provider_client
+        
+        with self.settings(TTS_CACHE_DIR=self.cache_dir.name):
+            self.assertIsNone(TTSCacheService.url_for('When can you start?'))
+            requests_before = len(get_provider_client().requests)
+            self.assertEqual(TTSCacheService.prewarm(['When can you start?', 'When can you  start?']), 1)
+            url = TTSCacheService.url_for('When can you start?')
+        
+        self.assertEqual(len(get_provider_client().requests), requests_before + 1)
+        self.assertTrue(url.startswith('https://zecpath.test/media/tts/') and url.endswith('.mp3'))
+    
+    def test_least_recently_used_audio_evicted(self):
+        import os
+        from common.services.tts_cache import TTSCacheService
+        
+        with self.settings(TTS_CACHE_DIR=self.cache_dir.name):
+            old = TTSCacheService.get_or_synthesize('First question?')
+            os.utime(old, (0, 0))
+            new = TTSCacheService.get_or_synthesize('Second question?')
+            self.assertEqual(TTSCacheService.evict(max_bytes=os.path.getsize(new)), 1)
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+    
+    def test_audio_handed_to_a_call_not_evicted_and_resynthesized_if_gone(self):
+        import os
+        import time
+        from common.services.tts_cache import TTSCacheService
+        from common.services.webhook_interview import WebhookInterviewService
+        
+        with self.settings(TTS_CACHE_DIR=self.cache_dir.name):
+            path = TTSCacheService.get_or_synthesize('First question?')
+            stale = time.time() - WebhookInterviewService.CALL_TTL - 60
+            os.utime(path, (stale, stale))
+            self.assertTrue(TTSCacheService.url_for('First question?'))  # Twilio may fetch it now
+            self.assertEqual(TTSCacheService.evict(max_bytes=1), 0)
+            
+            os.remove(path)  # Evicted by another worker after the existence check
+            self.assertEqual(TTSCacheService.get_or_synthesize('First question?'), path)
+        self.assertTrue(os.path.exists(path))
+    
+    def test_template_save_survives_broker_outage(self):
+        from unittest import mock
+        from core.question_models import QuestionTemplate
+        
+        with mock.patch('common.tasks_ai_calls.prewarm_tts_audio_task.delay', side_effect=ConnectionError('broker down')) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                QuestionTemplate.objects.create(category='skills', question_text='Why us?')
+        delay.assert_called_once_with(['Why us?'])
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', CACHES=LOCAL_CACHES)
+class VoiceTurnPipelineTests(TestCase):
+    def setUp(self):
+        clear_question_plans()
+    
+    def test_next_question_prepared_during_capture_and_turns_recorded_in_order(self):
+        import tempfile
+        from asgiref.sync import async_to_sync
+        from common.services.interview_buffer import InterviewBuffer
+        from common.services.question_plan import QuestionPlanCache
+        from common.services.voice_turn_pipeline import VoiceTurnPipeline
+        
+        job = create_job(['One?', 'Two?', 'Three?'])
+        buffer = InterviewBuffer.open(create_call(job), job)
+        buffer.CHECKPOINT_EVERY = 2
+        
+        asked = []
+        
+        async def capture_answer(prepared):
+            asked.append(prepared.text)
+            return f'Answer to {prepared.text}', 5
+        
+        with tempfile.TemporaryDirectory() as cache_dir, self.settings(TTS_CACHE_DIR=cache_dir):
+            pipeline = VoiceTurnPipeline(buffer, QuestionPlanCache.get(job.id))
+            summary = async_to_sync(pipeline.run)(capture_answer)
+        
+        self.assertEqual(asked, ['One?', 'Two?', 'Three?'])
+        self.assertEqual(summary['speculation'], {'hits': 2, 'misses': 0})
+        self.assertEqual(summary['stages']['capture']['count'], 3)
+        self.assertEqual(list(buffer.session.turns.values_list('question_text', flat=True)), ['One?', 'Two?'])
+        self.assertEqual(buffer.finish(stage_timings=summary)['turns'], 3)
+
+
+@override_settings(HOT_STORE_BACKEND='local', CACHES=LOCAL_CACHES, AI_PROVIDER_BACKEND='fake',
+                   CIRCUIT_BREAKER_BACKEND='local', BASE_URL='https://zecpath.test')
+class WebhookFastPathTests(TestCase):
+    def setUp(self):
+        import tempfile
+        from common.services.interview_buffer import InterviewBuffer
+        from common.services.webhook_interview import WebhookInterviewService
+        
+        clear_question_plans()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        tts_settings = self.settings(TTS_CACHE_DIR=cache_dir.name)
+        tts_settings.enable()
+        self.addCleanup(tts_settings.disable)
+        
+        job = create_job(['First?', 'Second?'])
+        call = create_call(job, call_sid='CA123')
+        self.buffer = InterviewBuffer.open(call, job)
+        WebhookInterviewService.register_call('CA123', call.id, self.buffer.session.pk, job.id, self.buffer.state_values())
+    
+    @staticmethod
+    def wait_for_speculation():
+        from common.services.webhook_interview import WebhookInterviewService
+        for future in list(WebhookInterviewService._speculating.values()):
+            future.result(timeout=5)
+    
+    def test_answer_buffered_and_next_question_served_without_queries(self):
+        from common.services.tts_cache import TTSCacheService
+        from common.services.webhook_interview import WebhookInterviewService
+        
+        first = self.client.post(reverse('twilio_question', args=[1]), {'CallSid': 'CA123'})
+        self.assertIn('First?', first.content.decode())
+        self.wait_for_speculation()
+        
+        with self.assertNumQueries(0):
+            second = self.client.post(reverse('twilio_response', args=[1]), {'CallSid': 'CA123', 'SpeechResult': 'Five years'})
+            retry = self.client.post(reverse('twilio_response', args=[1]), {'CallSid': 'CA123', 'SpeechResult': 'Five years'})
+        self.assertIn(TTSCacheService.url_for('Second?'), second.content.decode())  # Synthesized while 'First?' played
+        self.assertEqual(second.content, retry.content)
+        self.assertFalse(self.buffer.session.turns.exists())
+        
+        self.assertEqual(WebhookInterviewService.flush_pending(), 1)
+        self.assertEqual(list(self.buffer.session.turns.values_list('answer_text', flat=True)), ['Five years'])
+        self.buffer.state.refresh_from_db()
+        self.assertEqual(self.buffer.state.current_question_index, 1)
+    
+    def test_next_question_audio_synthesized_while_current_one_plays(self):
+        from common.services.tts_cache import TTSCacheService
+        
+        first = self.client.post(reverse('twilio_question', args=[1]), {'CallSid': 'CA123'})
+        self.assertIn('<Say', first.content.decode())  # Not prewarmed
+        self.wait_for_speculation()
+        
+        second = self.client.post(reverse('twilio_response', args=[1]), {'CallSid': 'CA123', 'SpeechResult': 'Five years'})
+        self.assertIn(f'<Play>{TTSCacheService.url_for("Second?")}</Play>', second.content.decode())
+    
+    def test_last_answer_survives_broker_outage_and_is_finished_by_sweep(self):
+        from unittest import mock
+        from common.services.webhook_interview import WebhookInterviewService
+        
+        call = self.buffer.session.call_queue
+        self.client.post(reverse('twilio_question', args=[1]), {'CallSid': 'CA123'})
+        self.client.post(reverse('twilio_response', args=[1]), {'CallSid': 'CA123', 'SpeechResult': 'Five years'})
+        with mock.patch('common.tasks_ai_calls.flush_webhook_answers_task.delay', side_effect=ConnectionError("broker down")):
+            last = self.client.post(reverse('twilio_response', args=[2]), {'CallSid': 'CA123', 'SpeechResult': 'Python'})
+        self.assertEqual(last.status_code, 200)
+        self.assertIn(WebhookInterviewService.GOODBYE, last.content.decode())
+        
+        with self.settings(RATE_LIMIT_BACKEND='local'):
+            self.assertEqual(WebhookInterviewService.flush_pending(), 2)
+            self.assertEqual(WebhookInterviewService.flush('CA123', finish=True), 0)  # Late final flush task
+        
+        call.refresh_from_db()
+        self.buffer.session.refresh_from_db()
+        self.assertEqual(call.status, 'completed')
+        self.assertIsNotNone(self.buffer.session.overall_score)
+        self.assertEqual(self.buffer.session.transcript_json['turns'][-1]['a'], 'Python')
+    
+    def test_failed_dial_is_retried_not_simulated(self):
+        from unittest import mock
+        from common.services.ai_call_limiter import AICallLimiter
+        from common.services.ai_call_runner import AICallRunner
+        from common.services.voice_call_service import VoiceCallService
+        
+        call = self.buffer.session.call_queue
+        with mock.patch.object(Candidate, 'phone', '+15550100', create=True), \
+                mock.patch.object(VoiceCallService, 'start_interview_call', return_value=(None, 'twilio.calls circuit is open')), \
+                mock.patch.object(AICallLimiter, 'release') as release, \
+                mock.patch('common.services.ai_call_runner.AICallDispatcher.begin', return_value=True):
+            self.assertEqual(AICallRunner.run(call.id)['status'], 'retrying')
+        release.assert_called_once_with(call.id)
+        
+        call.refresh_from_db()
+        self.assertEqual(call.status, 'queued')
+        self.assertEqual(call.retry_count, 1)
+        self.assertFalse(self.buffer.session.turns.exists())
+    
+    def test_dialed_call_completed_by_last_answer_flush(self):
+        from unittest import mock
+        from common.services.ai_call_limiter import AICallLimiter
+        from common.services.ai_call_runner import AICallRunner
+        from common.services.webhook_interview import WebhookInterviewService
+        
+        call = self.buffer.session.call_queue
+        with mock.patch.object(AICallRunner, 'dial', return_value=True), \
+                mock.patch.object(AICallLimiter, 'release') as release, \
+                mock.patch('common.services.ai_call_runner.AICallDispatcher.begin', return_value=True):
+            self.assertEqual(AICallRunner.run(call.id)['status'], 'dialed')
+        release.assert_not_called()  # The live call keeps its slots
+        self.assertFalse(self.buffer.session.turns.exists())
+        
+        self.client.post(reverse('twilio_question', args=[1]), {'CallSid': 'CA123'})
+        self.client.post(reverse('twilio_response', args=[1]), {'CallSid': 'CA123', 'SpeechResult': 'Five years'})
+        with mock.patch('common.tasks_ai_calls.flush_webhook_answers_task.delay') as delay:
+            self.client.post(reverse('twilio_response', args=[2]), {'CallSid': 'CA123', 'SpeechResult': 'Python'})
+        delay.assert_called_once_with('CA123', finish=True)
+        
+        with mock.patch.object(AICallLimiter, 'release') as release:
+            self.assertEqual(WebhookInterviewService.flush('CA123', finish=True), 2)
+        release.assert_called_once_with(call.id)
+        
+        call.refresh_from_db()
+        self.assertEqual(call.status, 'completed')
+        self.assertEqual(list(self.buffer.session.turns.values_list('answer_text', flat=True)), ['Five years', 'Python'])
+
+
+@override_settings(HOT_STORE_BACKEND='local', RATE_LIMIT_BACKEND='local', TWILIO_AUTH_TOKEN='test-token',
+                   BASE_URL='http://testserver')
+class CallStatusTests(TestCase):
+    def setUp(self):
+        self.call = create_call(status='dispatching', call_sid='CA456')
+    
+    def test_events_logged_in_bulk_and_last_state_wins(self):
+        from common.services.call_status import CallStatusService
+        
+        with self.assertNumQueries(0):
+            for sequence, call_status in [(0, 'ringing'), (2, 'completed'), (1, 'in-progress')]:
+                response = post_from_twilio(self.client, reverse('twilio_status'), {
+                    'CallSid': 'CA456', 'CallStatus': call_status, 'SequenceNumber': sequence, 'CallDuration': 42,
+                })
+                self.assertEqual(response.status_code, 204)
+        
+        self.assertEqual(CallStatusService.flush(), 3)
+        
+        self.call.refresh_from_db()
+        self.assertEqual(self.call.status, 'completed')
+        self.assertEqual(self.call.call_duration, 42)
+        self.assertEqual(self.call.events.count(), 3)
+    
+    def test_only_signed_webhooks_skip_rate_limit(self):
+        from unittest import mock
+        from common.middleware.security import RateLimitMiddleware
+        
+        data = {'CallSid': 'CA456', 'CallStatus': 'ringing'}
+        with mock.patch.dict(RateLimitMiddleware.RATE_LIMITS, {'default': (0, 60)}):
+            self.assertEqual(post_from_twilio(self.client, reverse('twilio_status'), data).status_code, 204)
+            self.assertEqual(self.client.post(reverse('twilio_status'), data).status_code, 429)
+            forged = self.client.post(reverse('twilio_status'), data, HTTP_X_TWILIO_SIGNATURE='forged')
+            self.assertEqual(forged.status_code, 429)
+
+
+@override_settings(AI_PROVIDER_BACKEND='fake', CIRCUIT_BREAKER_BACKEND='local', RATE_LIMIT_BACKEND='local', CACHES=LOCAL_CACHES)
+class AsyncCallRunnerTests(TestCase):
+    def setUp(self):
+        clear_question_plans()
+    
+    def test_calls_run_concurrently_on_one_event_loop(self):
+        import tempfile
+        from asgiref.sync import async_to_sync, sync_to_async
+        from common.services.ai_call_runner import AsyncAICallRunner
+        
+        job = create_job(['One?', 'Two?'])
+        calls = [create_call(job, candidate_email=f'c{n}@test.com') for n in range(3)]
+        
+        runner = AsyncAICallRunner(max_concurrent=2)
+        runner.db = sync_to_async  # The test transaction is only visible on this thread
+        with tempfile.TemporaryDirectory() as cache_dir, self.settings(TTS_CACHE_DIR=cache_dir):
+            results = async_to_sync(runner.run_many)([(call.id, None) for call in calls])
+        
+        self.assertEqual([result['status'] for result in results], ['completed'] * 3)
+        for call in calls:
+            call.refresh_from_db()
+            self.assertEqual(call.status, 'completed')
+            self.assertEqual(call.session.turns.count(), 2)
+        self.assertIn(('speech', 'One?'), runner.provider.requests)
@@ -1,13 +1,14 @@
 """
 Twilio webhook handlers for voice call callbacks
 """
-from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from common.services.voice_call_service import TwilioCallService
+from common.services.webhook_interview import WebhookInterviewService
+from common.services.call_status import CallStatusService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,66 +34,32 @@ def twilio_callback(request):
     return HttpResponse(str(response), content_type='text/xml')
 
 
+# Question/answer/status webhooks are plain Django views: no DRF auth or parsing on the
+# hot path, and no ORM queries once the call is in the hot store
+
+
 @csrf_exempt
-@api_view(['POST'])
-@permission_classes([AllowAny])
+@require_POST
 def twilio_question(request, question_num):
-    """Ask interview question"""
-    from twilio.twiml.voice_response import VoiceResponse, Gather
-    
-    # Get questions from session (simplified)
-    questions = [
-        "Tell me about your experience?",
-        "What are your key strengths?",
-        "When can you start?"
-    ]
-    
-    response = VoiceResponse()
-    
-    if question_num <= len(questions):
-        gather = Gather(
-            input='speech',
-            action=f'/api/ai-calls/twilio-response/{question_num}/',
-            method='POST',
-            speech_timeout='auto'
-        )
-        gather.say(questions[question_num - 1], voice='Polly.Joanna')
-        response.append(gather)
-    else:
-        response.say("Thank you for your time. Goodbye!", voice='Polly.Joanna')
-        response.hangup()
-    
-    return HttpResponse(str(response), content_type='text/xml')
+    """Ask the call's current interview question"""
+    twiml = WebhookInterviewService.question_twiml(request.POST.get('CallSid', ''))
+    return HttpResponse(twiml, content_type='text/xml')
 
 
 @csrf_exempt
-@api_view(['POST'])
-@permission_classes([AllowAny])
+@require_POST
 def twilio_response(request, question_num):
-    """Process candidate response"""
-    from twilio.twiml.voice_response import VoiceResponse
-    
-    speech_result = request.POST.get('SpeechResult', '')
-    logger.info(f"Q{question_num} Answer: {speech_result}")
-    
-    # Store response (implement storage logic)
-    
-    response = VoiceResponse()
-    response.redirect(f'/api/ai-calls/twilio-question/{question_num + 1}/')
-    
-    return HttpResponse(str(response), content_type='text/xml')
+    """Buffer the candidate's answer and ask the next question in the same response"""
+    twiml = WebhookInterviewService.answer(
+        request.POST.get('CallSid', ''), question_num, request.POST.get('SpeechResult', '')
+    )
+    return HttpResponse(twiml, content_type='text/xml')
 
 
 @csrf_exempt
-@api_view(['POST'])
-@permission_classes([AllowAny])
+@require_POST
 def twilio_status_callback(request):
-    """Handle call status updates"""
-    call_sid = request.POST.get('CallSid')
-    call_status = request.POST.get('CallStatus')
-    
-    logger.info(f"Call {call_sid} status: {call_status}")
-    
-    # Update AICallQueue status based on call_sid
-    
-    return Response({'status': 'received'})
+    """Buffer a call status update; CallStatusService.flush applies it in bulk"""
+    if not CallStatusService.record(request.POST):
+        return HttpResponse(status=400)
+    return HttpResponse(status=204)
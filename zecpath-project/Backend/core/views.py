@@ -992,6 +992,16 @@ class AuditLogsAPI(APIView):
     def get(self, request):
         logs = AuditLog.objects.select_related('admin').order_by('-timestamp')
         
+        # Bounded time range lets PostgreSQL prune to the recent monthly partitions
+        try:
+            days = int(request.GET.get('days', 30))
+        except ValueError:
+            days = -1
+        if days < 0:
+            return Response({'error': 'days must be a non-negative integer (0 = no limit)'}, status=status.HTTP_400_BAD_REQUEST)
+        if days:
+            logs = logs.filter(timestamp__gte=timezone.now() - timedelta(days=days))
+        
         action = request.GET.get('action')
         if action:
             logs = logs.filter(action=action)
@@ -1014,6 +1024,15 @@ class EmailLogsAPI(APIView):
         from core.models import EmailLog
         logs = EmailLog.objects.all().order_by('-created_at')
         
+        try:
+            days = int(request.GET.get('days', 30))
+        except ValueError:
+            days = -1
+        if days < 0:
+            return Response({'error': 'days must be a non-negative integer (0 = no limit)'}, status=status.HTTP_400_BAD_REQUEST)
+        if days:
+            logs = logs.filter(created_at__gte=timezone.now() - timedelta(days=days))
+        
         status_filter = request.GET.get('status')
         if status_filter:
             logs = logs.filter(status=status_filter)
@@ -3,8 +3,8 @@ from .models import Employer, Job
 
 @admin.register(Employer)
 class EmployerAdmin(admin.ModelAdmin):
-    list_display = ['company_name', 'user', 'domain', 'verification', 'website']
-    list_filter = ['verification', 'company_size']
+    list_display = ['company_name', 'user', 'domain', 'verification', 'notification_mode', 'website']
+    list_filter = ['verification', 'company_size', 'notification_mode']
     search_fields = ['company_name', 'user__email', 'domain']
 
 @admin.register(Job)
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-02-10 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employers', '0002_job_automation_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employer',
+            name='notification_mode',
+            field=models.CharField(choices=[('immediate', 'Immediate'), ('hourly', 'Hourly Digest'), ('daily', 'Daily Digest')], default='immediate', max_length=20),
+        ),
+    ]
@@ -4,6 +4,12 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 class Employer(models.Model):
+    NOTIFICATION_MODE_CHOICES = [
+        ('immediate', 'Immediate'),
+        ('hourly', 'Hourly Digest'),
+        ('daily', 'Daily Digest'),
+    ]
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     company_name = models.CharField(max_length=200, blank=True, db_index=True)
     website = models.URLField(blank=True)
@@ -11,6 +17,7 @@ class Employer(models.Model):
     company_description = models.TextField(blank=True)
     company_size = models.CharField(max_length=50, blank=True)
     verification = models.BooleanField(default=False, db_index=True)
+    notification_mode = models.CharField(max_length=20, choices=NOTIFICATION_MODE_CHOICES, default='immediate')
     
     def __str__(self):
         return self.company_name or self.user.email
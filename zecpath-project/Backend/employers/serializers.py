@@ -11,7 +11,7 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Employer
-        fields = ['id', 'company_name', 'website', 'domain', 'company_description', 'company_size', 'verification', 'user_info']
+        fields = ['id', 'company_name', 'website', 'domain', 'company_description', 'company_size', 'verification', 'notification_mode', 'user_info']
     
     def get_user_info(self, obj):
         return {